@@ -1,8 +1,26 @@
 """Minimal aioredis stub."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Pipeline:
+    _commands: List[Any] = field(default_factory=list)
+
+    def publish(self, channel: str, message: Any) -> "Pipeline":
+        self._commands.append(("PUBLISH", channel, message))
+        return self
+
+    def xadd(self, name: str, fields: Dict[str, Any], **kwargs: Any) -> "Pipeline":
+        self._commands.append(("XADD", name, fields))
+        return self
+
+    async def execute(self) -> List[Any]:
+        results = [0] * len(self._commands)
+        self._commands.clear()
+        return results
 
 
 @dataclass
@@ -10,6 +28,32 @@ class Redis:
     async def publish(self, channel: str, message: str) -> None:
         return None
 
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        return Pipeline()
+
+    async def xadd(self, name: str, fields: Dict[str, Any], id: str = "*", maxlen: Optional[int] = None, approximate: bool = True) -> str:
+        return "0-0"
+
+    async def xgroup_create(self, name: str, groupname: str, id: str = "$", mkstream: bool = False) -> bool:
+        return True
+
+    async def xgroup_setid(self, name: str, groupname: str, id: str) -> bool:
+        return True
+
+    async def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+        noack: bool = False,
+    ) -> List[Any]:
+        return []
+
+    async def xack(self, name: str, groupname: str, *ids: Any) -> int:
+        return len(ids)
+
     async def close(self) -> None:
         return None
 
@@ -10,6 +10,11 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional
 
+from ..core.metrics import REGISTRY
+
+BROKER_LATENCY = REGISTRY.histogram("broker_request_seconds", "Broker call latency.", ("broker", "op"))
+BROKER_ERRORS = REGISTRY.counter("broker_errors_total", "Failed broker calls.", ("broker", "op"))
+
 
 class Broker(ABC):
     """실계좌/모의 어댑터가 공통으로 구현해야 하는 브로커 인터페이스."""
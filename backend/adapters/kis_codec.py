@@ -0,0 +1,280 @@
+"""KIS 실시간 WebSocket 프레임 디코더.
+
+KIS 실시간 프레임은 JSON이 아니라 ``|``와 ``^``로 구분한 텍스트다::
+
+    <암호화 여부 0|1>|<TR_ID>|<레코드 수>|<필드1>^<필드2>^...
+
+레코드가 여러 개면 필드가 TR_ID별 필드 수만큼 이어 붙는다. 체결 통보처럼
+암호화 여부가 ``1``인 프레임의 본문은 AES-256-CBC 암호문(Base64)이며, 키와
+IV는 구독 응답(JSON 제어 프레임)의 ``body.output``으로 전달된다.
+
+디코더는 본문을 한 번만 분할하고 필요한 열만 보폭 슬라이스로 꺼내 정규화된
+``{type, symbol, price, volume, ts}`` 이벤트를 만든다. 필드 순서는 TR_ID별
+:class:`FieldMap`으로 정의하며, 아래 기본 맵은 공식 명세로 확인해야 한다.
+"""
+from __future__ import annotations
+
+import base64
+import calendar
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PINGPONG = "PINGPONG"
+KST_OFFSET = 9 * 3600
+
+Frame = Union[str, bytes]
+
+
+@dataclass(frozen=True)
+class FieldMap:
+    """TR_ID 하나의 필드 순서와 정규화에 쓸 필드 이름."""
+
+    tr_id: str
+    kind: str
+    fields: Tuple[str, ...]
+    symbol: str
+    price: str
+    volume: str
+    time: str
+    date: Optional[str] = None
+    utc_offset: int = KST_OFFSET
+    extra: Tuple[str, ...] = ()
+    width: int = field(init=False)
+    columns: Tuple[int, int, int, int, int] = field(init=False, repr=False, compare=False)
+    _index: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        index = {name: i for i, name in enumerate(self.fields)}
+        for name in (self.symbol, self.price, self.volume, self.time, self.date, *self.extra):
+            if name is not None and name not in index:
+                raise ValueError(f"{self.tr_id}: unknown field {name}")
+        object.__setattr__(self, "width", len(self.fields))
+        object.__setattr__(self, "_index", index)
+        # 심볼·가격·수량·시각·날짜 열 위치. 날짜 필드가 없으면 -1.
+        date = index[self.date] if self.date is not None else -1
+        columns = (index[self.symbol], index[self.price], index[self.volume], index[self.time], date)
+        object.__setattr__(self, "columns", columns)
+
+    def index(self, name: str) -> int:
+        return self._index[name]
+
+
+# TODO: 필드 순서는 KIS 공식 명세로 확인한다.
+OVERSEAS_TRADE = FieldMap(
+    tr_id="HDFSCNT0",
+    kind="trade",
+    fields=(
+        "RSYM", "SYMB", "ZDIV", "TYMD", "XYMD", "XHMS", "KYMD", "KHMS", "OPEN", "HIGH", "LOW", "LAST", "SIGN",
+        "DIFF", "RATE", "PBID", "PASK", "VBID", "VASK", "EVOL", "TVOL", "TAMT", "BIVL", "ASVL", "STRN", "MTYP",
+    ),
+    symbol="SYMB",
+    price="LAST",
+    volume="EVOL",
+    date="KYMD",
+    time="KHMS",
+)
+
+OVERSEAS_EXECUTION = FieldMap(
+    tr_id="H0GSCNI0",
+    kind="execution",
+    fields=(
+        "CUST_ID", "ACNT_NO", "ODER_NO", "OODER_NO", "SELN_BYOV_CLS", "RCTF_CLS", "ODER_KIND2", "STCK_SHRN_ISCD",
+        "CNTG_QTY", "CNTG_UNPR", "STCK_CNTG_HOUR", "RFUS_YN", "CNTG_YN", "ACPT_YN", "BRNC_NO", "ODER_QTY",
+        "ACNT_NAME", "CNTG_ISNM", "ODER_COND", "DEBT_GB", "DEBT_DATE", "START_TM", "END_TM", "TM_DIV_TP",
+    ),
+    symbol="STCK_SHRN_ISCD",
+    price="CNTG_UNPR",
+    volume="CNTG_QTY",
+    time="STCK_CNTG_HOUR",
+    extra=("ODER_NO", "SELN_BYOV_CLS", "CNTG_YN", "ODER_QTY"),
+)
+
+DEFAULT_FIELD_MAPS: Tuple[FieldMap, ...] = (OVERSEAS_TRADE, OVERSEAS_EXECUTION)
+
+
+class AESCipher:
+    """구독 응답으로 받은 키/IV로 AES-256-CBC 본문을 복호화한다.
+
+    ``cryptography`` 패키지가 필요하며 암호화 프레임을 처음 받을 때 불러온다.
+    """
+
+    def __init__(self, key: str, iv: str) -> None:
+        try:
+            from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        except ImportError as exc:  # pragma: no cover - 환경 의존
+            raise RuntimeError("cryptography is required to decrypt KIS execution notices") from exc
+        self._cipher = Cipher(algorithms.AES(key.encode("utf-8")), modes.CBC(iv.encode("utf-8")))
+
+    def decrypt(self, body: str) -> str:
+        return self.decrypt_many([body])[0]
+
+    def decrypt_many(self, bodies: Sequence[str]) -> List[str]:
+        """같은 키의 본문 여러 개를 복호화한다. 키 스케줄은 한 번만 만든다."""
+
+        cipher = self._cipher
+        plain: List[str] = []
+        for body in bodies:
+            decryptor = cipher.decryptor()
+            raw = decryptor.update(base64.b64decode(body)) + decryptor.finalize()
+            plain.append(raw[: -raw[-1]].decode("utf-8"))
+        return plain
+
+
+class KISFrameDecoder:
+    """KIS 프레임을 정규화 이벤트 목록으로 바꾼다.
+
+    JSON 제어 프레임(구독 응답, ``PINGPONG``)은 ``{"type": "control", ...}``
+    이벤트가 되며, 구독 응답에 암호화 키가 있으면 해당 TR_ID에 등록한다.
+    필드 맵이 없는 TR_ID는 ``{"type": "raw", ...}``로 그대로 전달한다.
+    """
+
+    def __init__(self, field_maps: Iterable[FieldMap] = DEFAULT_FIELD_MAPS) -> None:
+        self._maps: Dict[str, FieldMap] = {}
+        self._ciphers: Dict[str, AESCipher] = {}
+        self._midnights: Dict[str, float] = {}
+        for field_map in field_maps:
+            self.register(field_map)
+
+    def register(self, field_map: FieldMap) -> None:
+        self._maps[field_map.tr_id] = field_map
+
+    def set_key(self, tr_id: str, key: str, iv: str) -> None:
+        self._ciphers[tr_id] = AESCipher(key, iv)
+
+    def decode(self, payload: Frame) -> List[Dict[str, Any]]:
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        if payload[:1] not in ("0", "1"):
+            return [self._control(payload)]
+        try:
+            flag, tr_id, count, body = payload.split("|", 3)
+            if flag == "1":
+                body = self._cipher(tr_id).decrypt(body)
+            return self._records(tr_id, int(count), body)
+        except (ValueError, KeyError, IndexError) as exc:
+            logger.warning("Failed to decode KIS frame: %s", exc)
+            return [{"type": "raw", "raw": payload}]
+
+    def decode_many(self, payloads: Sequence[Frame]) -> List[Dict[str, Any]]:
+        """프레임 여러 개를 순서대로 디코딩한다.
+
+        암호화 프레임은 TR_ID별로 모아 :meth:`AESCipher.decrypt_many`로 한 번에
+        복호화한다.
+        """
+
+        frames = [p.decode("utf-8") if isinstance(p, bytes) else p for p in payloads]
+        pending: Dict[str, List[int]] = {}
+        parts: List[Optional[List[str]]] = []
+        for position, frame in enumerate(frames):
+            if frame[:1] in ("0", "1"):
+                split = frame.split("|", 3)
+                if len(split) == 4:
+                    parts.append(split)
+                    if split[0] == "1":
+                        pending.setdefault(split[1], []).append(position)
+                    continue
+            parts.append(None)
+        for tr_id, positions in pending.items():
+            try:
+                plain = self._cipher(tr_id).decrypt_many([parts[i][3] for i in positions])  # type: ignore[index]
+            except (KeyError, ValueError) as exc:
+                logger.warning("Failed to decrypt KIS frames for %s: %s", tr_id, exc)
+                for i in positions:
+                    parts[i] = None
+                continue
+            for i, body in zip(positions, plain):
+                parts[i][3] = body  # type: ignore[index]
+
+        events: List[Dict[str, Any]] = []
+        for frame, split in zip(frames, parts):
+            if split is None:
+                events.extend(self.decode(frame) if frame[:1] not in ("0", "1") else [{"type": "raw", "raw": frame}])
+                continue
+            try:
+                events.extend(self._records(split[1], int(split[2]), split[3]))
+            except (ValueError, KeyError, IndexError) as exc:
+                logger.warning("Failed to decode KIS frame: %s", exc)
+                events.append({"type": "raw", "raw": frame})
+        return events
+
+    def _cipher(self, tr_id: str) -> AESCipher:
+        cipher = self._ciphers.get(tr_id)
+        if cipher is None:
+            raise KeyError(f"No AES key registered for {tr_id}")
+        return cipher
+
+    def _control(self, payload: str) -> Dict[str, Any]:
+        try:
+            message = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse payload, returning raw message")
+            return {"type": "raw", "raw": payload}
+        header = message.get("header") or {}
+        tr_id = header.get("tr_id", "")
+        output = (message.get("body") or {}).get("output") or {}
+        if output.get("key") and output.get("iv"):
+            self.set_key(tr_id, output["key"], output["iv"])
+        return {"type": "control", "tr_id": tr_id, "message": message}
+
+    def _records(self, tr_id: str, count: int, body: str) -> List[Dict[str, Any]]:
+        field_map = self._maps.get(tr_id)
+        if field_map is None:
+            return [{"type": "raw", "tr_id": tr_id, "raw": body}]
+        values = body.split("^")
+        width = field_map.width
+        if len(values) < width * count:
+            raise ValueError(f"{tr_id}: expected {width * count} fields, got {len(values)}")
+        i_symbol, i_price, i_volume, i_time, i_date = field_map.columns
+        offset = field_map.utc_offset
+        kind = field_map.kind
+        epoch = self._epoch
+        if i_date < 0:
+            today = time.strftime("%Y%m%d", time.gmtime(time.time() + offset))
+        if count == 1:
+            # 대부분의 프레임은 레코드 하나이므로 슬라이스 없이 바로 읽는다.
+            date = values[i_date] if i_date >= 0 else today
+            events = [
+                {
+                    "type": kind,
+                    "symbol": values[i_symbol],
+                    "price": float(values[i_price]),
+                    "volume": float(values[i_volume]),
+                    "ts": epoch(date, values[i_time], offset),
+                }
+            ]
+        else:
+            dates = values[i_date::width][:count] if i_date >= 0 else [today] * count
+            events = [
+                {
+                    "type": kind,
+                    "symbol": symbol,
+                    "price": float(price),
+                    "volume": float(volume),
+                    "ts": epoch(date, hhmmss, offset),
+                }
+                for symbol, price, volume, hhmmss, date in zip(
+                    values[i_symbol::width][:count],
+                    values[i_price::width][:count],
+                    values[i_volume::width][:count],
+                    values[i_time::width][:count],
+                    dates,
+                )
+            ]
+        for name in field_map.extra:
+            column = values[field_map.index(name) :: width][:count]
+            for event, value in zip(events, column):
+                event[name.lower()] = value
+        return events
+
+    def _epoch(self, date: str, hhmmss: str, offset: int) -> float:
+        midnight = self._midnights.get(date)
+        if midnight is None:
+            midnight = float(calendar.timegm(time.strptime(date, "%Y%m%d")))
+            self._midnights[date] = midnight
+        clock = int(hhmmss[:6])
+        return midnight - offset + clock // 10_000 * 3600 + clock // 100 % 100 * 60 + clock % 100
@@ -7,11 +7,12 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 import httpx
 
-from .broker_base import Broker
+from .broker_base import BROKER_ERRORS, BROKER_LATENCY, Broker
 from .kis_spec import REST_SPEC
 
 logger = logging.getLogger(__name__)
@@ -59,25 +60,38 @@ class KISOverseasBroker(Broker):
             "meta": meta or {},
         }
         logger.info("Submitting KIS order %s", payload)
-        response = await self._client.post(REST_SPEC.overseas_order_path, json=payload)
-        response.raise_for_status()
+        response = await self._request("place_order", "POST", REST_SPEC.overseas_order_path, json=payload)
         return response.json()
 
     async def cancel(self, order_id: str) -> None:
         logger.info("Cancelling KIS order %s", order_id)
-        response = await self._client.post(REST_SPEC.overseas_cancel_path, json={"order_id": order_id})
-        response.raise_for_status()
+        await self._request("cancel", "POST", REST_SPEC.overseas_cancel_path, json={"order_id": order_id})
 
     async def positions(self) -> List[Dict[str, Any]]:
-        response = await self._client.get(REST_SPEC.positions_path)
-        response.raise_for_status()
+        response = await self._request("positions", "GET", REST_SPEC.positions_path)
         return response.json().get("positions", [])
 
     async def cash(self) -> float:
-        response = await self._client.get(REST_SPEC.cash_path)
-        response.raise_for_status()
+        response = await self._request("cash", "GET", REST_SPEC.cash_path)
         data = response.json()
         return float(data.get("cash", 0.0))
 
+    async def _request(self, op: str, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """HTTP 호출 지연과 실패를 ``broker_*`` 지표에 기록한다."""
+
+        start = time.perf_counter()
+        try:
+            if method == "GET":
+                response = await self._client.get(path, **kwargs)
+            else:
+                response = await self._client.post(path, **kwargs)
+            response.raise_for_status()
+        except Exception:
+            BROKER_ERRORS.labels("kis", op).inc()
+            raise
+        finally:
+            BROKER_LATENCY.labels("kis", op).observe(time.perf_counter() - start)
+        return response
+
     async def stream_orders(self, on_event: Any) -> None:  # pragma: no cover - WS 필요
         raise NotImplementedError("KIS order streaming is not implemented in the scaffold")
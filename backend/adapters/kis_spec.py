@@ -26,6 +26,8 @@ class KISWebSocketSpec:
     base_url: str = ""  # TODO: KIS WebSocket 엔드포인트를 입력한다.
     approval_key_path: str = ""  # TODO: 승인 키 발급 엔드포인트를 입력한다.
     heartbeat_interval: float = 30.0
+    trade_tr_id: str = ""  # TODO: 해외 실시간 체결가 TR_ID를 입력한다.
+    max_subscriptions_per_session: int = 40  # TODO: 세션당 실시간 등록 한도를 확인한다.
 
 
 @dataclass(frozen=True)
@@ -1,27 +1,54 @@
 """KIS 해외 데이터 스트림용 WebSocket 클라이언트 스캐폴드.
 
-이 구현은 재연결 로직, 하트비트 관리, 체결 통보 채널에서 사용하는
-AES-256 복호화를 위한 자리표시자를 제공한다. 실제 암호화 파라미터는 공식
-명세에서 확인해야 하므로 TODO 주석으로 남겨 두었다.
+이 구현은 재연결 로직과 하트비트 관리를 제공하며, 프레임 디코딩(구분자
+텍스트와 체결 통보의 AES-256 복호화)은 :mod:`.kis_codec`에 맡긴다. 실제
+TR_ID와 필드 순서는 공식 명세에서 확인해야 하므로 TODO 주석으로 남겨 두었다.
+
+KIS는 세션당 실시간 등록 수를 제한하므로 종목 유니버스가 크면
+:class:`KISSubscriptionManager`로 여러 연결(샤드)에 나누어 구독한다.
 """
 from __future__ import annotations
 
 import asyncio
 import json
 import logging
-from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import math
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import httpx
 import websockets
 from websockets.client import WebSocketClientProtocol
 
+from .kis_codec import PINGPONG, KISFrameDecoder
 from .kis_spec import WS_SPEC
 
 logger = logging.getLogger(__name__)
 
 
+def subscription_message(approval_key: str, tr_id: str, tr_key: str, *, subscribe: bool = True) -> Dict[str, Any]:
+    """실시간 등록(``tr_type`` 1)/해제(``tr_type`` 2) 요청 메시지를 만든다."""
+
+    return {
+        "header": {
+            "approval_key": approval_key,
+            "custtype": "P",
+            "tr_type": "1" if subscribe else "2",
+            "content-type": "utf-8",
+        },
+        "body": {"input": {"tr_id": tr_id, "tr_key": tr_key}},
+    }
+
+
 class KISWebSocketClient:
-    """지수 백오프 재연결을 지원하는 관리형 WebSocket 연결."""
+    """지수 백오프 재연결을 지원하는 관리형 WebSocket 연결.
+
+    재연결 대기 시간에는 ``jitter`` 비율만큼 무작위 편차를 두어 여러 연결이
+    동시에 재접속하지 않도록 한다. 서버가 연결을 정상 종료한 경우에도
+    ``min_backoff``만큼(지터 포함) 기다린 뒤 재접속한다. 연결 중에도 :meth:`subscribe`/
+    :meth:`unsubscribe`로 구독을 바꿀 수 있으며, 재연결 시에는 현재 보유한
+    구독만 다시 등록한다.
+    """
 
     def __init__(
         self,
@@ -30,54 +57,253 @@ class KISWebSocketClient:
         *,
         on_message: Callable[[Dict[str, Any]], Awaitable[None]],
         on_error: Optional[Callable[[Exception], None]] = None,
+        url: Optional[str] = None,
+        connect: Optional[Callable[..., Any]] = None,
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        jitter: float = 0.5,
+        name: str = "kis-ws",
+        codec: Optional[KISFrameDecoder] = None,
     ) -> None:
-        if not WS_SPEC.base_url:
+        self._url = url or WS_SPEC.base_url
+        if not self._url:
             raise RuntimeError("KIS specification incomplete; use PaperAdapter instead.")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError("jitter must be between 0 and 1")
         self._approval_key = approval_key
         self._subscriptions = list(subscriptions)
         self._on_message = on_message
         self._on_error = on_error or (lambda exc: logger.error("KIS WS error: %s", exc))
+        self._connect = connect or websockets.connect
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._codec = codec or KISFrameDecoder()
+        self._ws: Optional[WebSocketClientProtocol] = None
         self._should_run = True
+        self.name = name
+        self.connects = 0
+
+    @property
+    def subscriptions(self) -> List[Dict[str, Any]]:
+        return list(self._subscriptions)
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
 
     async def run(self) -> None:
-        backoff = 1.0
+        backoff = self._min_backoff
         while self._should_run:
             try:
                 await self._run_once()
-                backoff = 1.0
+                backoff = self._min_backoff
+                # 서버가 모든 샤드를 한꺼번에 끊어도 동시에 재접속하지 않도록 정상 종료 후에도 지터를 둔다.
+                if self._should_run:
+                    await asyncio.sleep(self._backoff_delay(backoff))
             except Exception as exc:  # pragma: no cover - 네트워크 오류 재현 어려움
                 self._on_error(exc)
-                await asyncio.sleep(backoff)
-                backoff = min(backoff * 2, 60.0)
+                await asyncio.sleep(self._backoff_delay(backoff))
+                backoff = min(backoff * 2, self._max_backoff)
 
     async def stop(self) -> None:
         self._should_run = False
 
+    async def subscribe(self, message: Dict[str, Any]) -> None:
+        """구독을 추가하고, 연결돼 있으면 즉시 등록 요청을 보낸다."""
+
+        self._subscriptions.append(message)
+        ws = self._ws
+        if ws is not None:
+            await ws.send(json.dumps(message))
+
+    async def unsubscribe(self, message: Dict[str, Any], unsubscribe_message: Optional[Dict[str, Any]] = None) -> None:
+        """구독을 제거하고, 연결돼 있으면 ``unsubscribe_message``로 해제를 요청한다."""
+
+        self._subscriptions.remove(message)
+        ws = self._ws
+        if ws is not None and unsubscribe_message is not None:
+            await ws.send(json.dumps(unsubscribe_message))
+
+    def _backoff_delay(self, backoff: float) -> float:
+        return backoff * (1.0 - self._jitter * random.random())
+
     async def _run_once(self) -> None:
         headers = {"approval_key": self._approval_key}
-        async with websockets.connect(WS_SPEC.base_url, extra_headers=headers, ping_interval=WS_SPEC.heartbeat_interval) as ws:
-            await self._subscribe(ws)
-            async for message in ws:
-                data = self._decode_payload(message)
-                await self._on_message(data)
+        async with self._connect(self._url, extra_headers=headers, ping_interval=WS_SPEC.heartbeat_interval) as ws:
+            self._ws = ws
+            self.connects += 1
+            try:
+                await self._subscribe(ws)
+                async for message in ws:
+                    for event in self._decode_payload(message):
+                        if event["type"] == "control":
+                            if event["tr_id"] == PINGPONG:
+                                await ws.send(message)
+                            continue
+                        await self._on_message(event)
+            finally:
+                self._ws = None
 
     async def _subscribe(self, ws: WebSocketClientProtocol) -> None:
-        for sub in self._subscriptions:
+        for sub in list(self._subscriptions):
             await ws.send(json.dumps(sub))
 
-    def _decode_payload(self, payload: str) -> Dict[str, Any]:
-        """필요 시 AES256 복호화를 포함해 체결 통보를 디코딩한다.
+    def _decode_payload(self, payload: Any) -> List[Dict[str, Any]]:
+        """프레임을 :class:`~.kis_codec.KISFrameDecoder`로 정규화 이벤트 목록으로 바꾼다."""
+
+        return self._codec.decode(payload)
+
 
-        KIS 해외 WebSocket은 체결 이벤트를 AES-256-CBC로 암호화한다. 구현자는
-        공식 문서를 참고해 올바른 키 파생과 IV 처리 로직을 채워 넣어야 한다.
-        이 스캐폴드는 JSON 페이로드를 단순 파싱하며 평문이라고 가정한다.
-        """
+class KISSubscriptionManager:
+    """종목 유니버스를 여러 :class:`KISWebSocketClient` 연결에 나누어 구독한다.
 
+    연결(샤드)마다 ``max_per_connection``개까지만 등록하며, 처음에는 필요한
+    최소 샤드 수에 종목을 고르게 나눈다. :meth:`update`는 현재 유니버스와의
+    차이만 계산해 해당 샤드에 등록/해제 요청을 보내므로 연결을 끊지 않는다.
+    빈 자리가 없으면 ``max_connections`` 한도 안에서 새 샤드를 연다.
+    """
+
+    def __init__(
+        self,
+        approval_key: str,
+        symbols: Iterable[str],
+        *,
+        on_message: Callable[[Dict[str, Any]], Awaitable[None]],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        tr_id: Optional[str] = None,
+        max_per_connection: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        client_factory: Optional[Callable[..., KISWebSocketClient]] = None,
+        **client_kwargs: Any,
+    ) -> None:
+        self._approval_key = approval_key
+        self._tr_id = tr_id if tr_id is not None else WS_SPEC.trade_tr_id
+        self._limit = max_per_connection or WS_SPEC.max_subscriptions_per_session
+        if self._limit < 1:
+            raise ValueError("max_per_connection must be positive")
+        self._max_connections = max_connections
+        self._on_message = on_message
+        self._on_error = on_error
+        self._client_factory = client_factory or KISWebSocketClient
+        self._client_kwargs = client_kwargs
+        self._shards: List[KISWebSocketClient] = []
+        self._owned: List[Set[str]] = []
+        self._shard_of: Dict[str, int] = {}
+        self._tasks: Dict[int, "asyncio.Task[None]"] = {}
+        self._running = False
+
+        universe = list(dict.fromkeys(symbols))
+        n_shards = max(1, math.ceil(len(universe) / self._limit))
+        self._check_capacity(n_shards)
+        for index in range(n_shards):
+            chunk = universe[index::n_shards]
+            self._new_shard(chunk)
+
+    @property
+    def symbols(self) -> Set[str]:
+        return set(self._shard_of)
+
+    @property
+    def shards(self) -> List[KISWebSocketClient]:
+        return list(self._shards)
+
+    def assignments(self) -> List[List[str]]:
+        """샤드별 보유 종목 목록."""
+
+        return [sorted(owned) for owned in self._owned]
+
+    def shard_for(self, symbol: str) -> Optional[int]:
+        return self._shard_of.get(symbol)
+
+    async def run(self) -> None:
+        self._running = True
+        for index in range(len(self._shards)):
+            self._start_shard(index)
         try:
-            return json.loads(payload)
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse payload, returning raw message")
-            return {"raw": payload}
+            while self._running and self._tasks:
+                await asyncio.gather(*list(self._tasks.values()))
+                # gather 도중 새 샤드가 추가됐다면 다시 기다린다.
+                if all(task.done() for task in self._tasks.values()):
+                    break
+        finally:
+            self._running = False
+
+    async def stop(self) -> None:
+        self._running = False
+        for shard in self._shards:
+            await shard.stop()
+
+    async def update(self, symbols: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """유니버스를 ``symbols``로 맞추고 ``(추가, 제거)`` 종목을 반환한다."""
+
+        target = list(dict.fromkeys(symbols))
+        wanted = set(target)
+        removed = [symbol for symbol in self._shard_of if symbol not in wanted]
+        added = [symbol for symbol in target if symbol not in self._shard_of]
+        await self.remove(removed)
+        await self.add(added)
+        return added, removed
+
+    async def add(self, symbols: Sequence[str]) -> None:
+        for symbol in symbols:
+            if symbol in self._shard_of:
+                continue
+            index = self._least_loaded()
+            if index is None:
+                self._check_capacity(len(self._shards) + 1)
+                index = self._new_shard([])
+                if self._running:
+                    self._start_shard(index)
+            self._owned[index].add(symbol)
+            self._shard_of[symbol] = index
+            await self._shards[index].subscribe(self._message(symbol))
+
+    async def remove(self, symbols: Sequence[str]) -> None:
+        for symbol in symbols:
+            index = self._shard_of.pop(symbol, None)
+            if index is None:
+                continue
+            self._owned[index].discard(symbol)
+            await self._shards[index].unsubscribe(
+                self._message(symbol), self._message(symbol, subscribe=False)
+            )
+
+    def _message(self, symbol: str, *, subscribe: bool = True) -> Dict[str, Any]:
+        return subscription_message(self._approval_key, self._tr_id, symbol, subscribe=subscribe)
+
+    def _least_loaded(self) -> Optional[int]:
+        best: Optional[int] = None
+        for index, owned in enumerate(self._owned):
+            if len(owned) < self._limit and (best is None or len(owned) < len(self._owned[best])):
+                best = index
+        return best
+
+    def _check_capacity(self, n_shards: int) -> None:
+        if self._max_connections is not None and n_shards > self._max_connections:
+            raise ValueError(
+                f"{n_shards} connections needed but max_connections is {self._max_connections}"
+            )
+
+    def _new_shard(self, symbols: Sequence[str]) -> int:
+        index = len(self._shards)
+        client = self._client_factory(
+            self._approval_key,
+            [self._message(symbol) for symbol in symbols],
+            on_message=self._on_message,
+            on_error=self._on_error,
+            name=f"kis-ws-{index}",
+            **self._client_kwargs,
+        )
+        self._shards.append(client)
+        self._owned.append(set(symbols))
+        for symbol in symbols:
+            self._shard_of[symbol] = index
+        return index
+
+    def _start_shard(self, index: int) -> None:
+        if index not in self._tasks:
+            self._tasks[index] = asyncio.create_task(self._shards[index].run(), name=f"kis-ws-{index}")
 
 
 async def issue_ws_key(app_key: str, app_secret: str) -> str:
@@ -7,7 +7,13 @@ from typing import Any, Awaitable, Callable, Dict
 
 
 class MarketDataFeed(ABC):
-    """WebSocket 피드가 구현해야 하는 추상 인터페이스."""
+    """WebSocket 피드가 구현해야 하는 추상 인터페이스.
+
+    ``finite``가 참인 피드(예: 파일 재생)는 :meth:`run`이 정상 반환하면 소진된
+    것으로 보고 인제스터가 다시 실행하지 않는다.
+    """
+
+    finite = False
 
     @abstractmethod
     async def run(self) -> None:
@@ -15,7 +15,7 @@ import time
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
-from .broker_base import Broker
+from .broker_base import BROKER_LATENCY, Broker
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +65,7 @@ class PaperAdapter(Broker):
         self._callbacks: List[Callable[[Dict[str, Any]], None]] = []
         self._data_feed = data_feed or PaperMarketDataFeed()
         self._lock = asyncio.Lock()
+        self._m_place = BROKER_LATENCY.labels("paper", "place_order")
 
     async def place_order(
         self,
@@ -76,6 +77,7 @@ class PaperAdapter(Broker):
         tif: str = "DAY",
         meta: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        start = time.perf_counter()
         order_id = f"PAPER-{next(self._id_counter)}"
         order = PaperOrder(order_id, symbol, side, qty, qty, order_type, limit_price, tif)
         async with self._lock:
@@ -83,6 +85,7 @@ class PaperAdapter(Broker):
         asyncio.create_task(self._attempt_fill(order))
         payload = {"order_id": order_id, "status": "accepted", "meta": meta or {}}
         logger.debug("Paper order accepted %s", payload)
+        self._m_place.observe(time.perf_counter() - start)
         return payload
 
     async def _attempt_fill(self, order: PaperOrder) -> None:
@@ -0,0 +1,280 @@
+"""메모리 매핑 바이너리 틱 파일을 재생하는 시세 피드.
+
+틱 파일은 고정 길이 레코드 배열이며 ``numpy.memmap``으로 그대로 매핑해
+복사 없이 배치 단위로 읽는다. 하루치(수억 틱) 파일도 페이지 캐시만 쓰므로
+``IngestService``와 ``StrategyLoop``의 회귀·용량 테스트에 사용할 수 있다.
+
+파일 레이아웃 v1 (리틀 엔디언)::
+
+    header  : magic(8s) version(I) record_size(I) n_symbols(I) flags(I)
+              symtab_offset(Q) data_offset(Q) n_records(Q)      -- 48 bytes
+    symtab  : "\\n"으로 구분한 UTF-8 심볼 목록 (심볼 ID = 줄 번호)
+    records : TICK_DTYPE 배열, data_offset은 64바이트 정렬
+
+``flags``의 ``FLAG_SORTED_BY_SYMBOL`` 비트가 켜진 파일은 (심볼, 시각) 순으로
+정렬되어 있어 심볼 필터를 마스크 대신 연속 구간 슬라이스로 처리한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .marketdata_base import MarketDataFeed
+
+MAGIC = b"ATTICK01"
+VERSION = 1
+TICK_DTYPE = np.dtype([("ts", "<f8"), ("price", "<f8"), ("volume", "<f8"), ("symbol", "<u4"), ("flags", "<u4")])
+
+FLAG_SORTED_BY_SYMBOL = 0x1
+
+_HEADER = struct.Struct("<8sIIIIQQQ")
+_ALIGN = 64
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_tick_file(
+    path: PathLike, symbols: Sequence[str], records: np.ndarray, *, sorted_by_symbol: bool = False
+) -> None:
+    """심볼 테이블과 ``TICK_DTYPE`` 레코드로 틱 파일을 쓴다."""
+
+    with TickFileWriter(path, symbols, sorted_by_symbol=sorted_by_symbol) as writer:
+        writer.append(records)
+
+
+class TickFileWriter:
+    """레코드 배치를 이어 붙여 틱 파일을 쓴다. 행 수는 닫을 때 헤더에 기록한다.
+
+    전체 레코드를 메모리에 올리지 않고 큰 파일을 만들 때 쓴다.
+    """
+
+    def __init__(self, path: PathLike, symbols: Sequence[str], *, sorted_by_symbol: bool = False) -> None:
+        self._symtab = "\n".join(symbols).encode("utf-8")
+        self._n_symbols = len(symbols)
+        self._flags = FLAG_SORTED_BY_SYMBOL if sorted_by_symbol else 0
+        self._data_offset = _aligned(_HEADER.size + len(self._symtab))
+        self._fp = open(path, "wb")
+        self._fp.write(self._header(0))
+        self._fp.write(self._symtab)
+        self._fp.write(b"\x00" * (self._data_offset - _HEADER.size - len(self._symtab)))
+        self.rows = 0
+
+    def _header(self, n_records: int) -> bytes:
+        return _HEADER.pack(
+            MAGIC,
+            VERSION,
+            TICK_DTYPE.itemsize,
+            self._n_symbols,
+            self._flags,
+            _HEADER.size,
+            self._data_offset,
+            n_records,
+        )
+
+    def append(self, records: np.ndarray) -> None:
+        records = np.ascontiguousarray(records, dtype=TICK_DTYPE)
+        self._fp.write(records.tobytes())
+        self.rows += len(records)
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        self._fp.seek(0)
+        self._fp.write(self._header(self.rows))
+        self._fp.close()
+
+    def __enter__(self) -> "TickFileWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def make_records(ts: Any, symbol_ids: Any, prices: Any, volumes: Any) -> np.ndarray:
+    records = np.zeros(len(ts), dtype=TICK_DTYPE)
+    records["ts"] = ts
+    records["symbol"] = symbol_ids
+    records["price"] = prices
+    records["volume"] = volumes
+    return records
+
+
+class TickFile:
+    """틱 파일을 읽기 전용 ``numpy.memmap``으로 연다."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as fp:
+            raw_header = fp.read(_HEADER.size)
+            if len(raw_header) < _HEADER.size:
+                raise ValueError(f"Not a tick file: {self.path}")
+            magic, version, record_size, n_symbols, flags, symtab_offset, data_offset, n_records = _HEADER.unpack(
+                raw_header
+            )
+            if magic != MAGIC or version != VERSION or record_size != TICK_DTYPE.itemsize:
+                raise ValueError(f"Unsupported tick file: {self.path}")
+            fp.seek(symtab_offset)
+            symtab = fp.read(data_offset - symtab_offset).rstrip(b"\x00").decode("utf-8")
+        self.sorted_by_symbol = bool(flags & FLAG_SORTED_BY_SYMBOL)
+        self.symbols: List[str] = symtab.split("\n") if n_symbols else []
+        self._symbol_ids = {name: i for i, name in enumerate(self.symbols)}
+        if n_records:
+            self.records = np.memmap(self.path, dtype=TICK_DTYPE, mode="r", offset=data_offset, shape=(n_records,))
+        else:
+            self.records = np.zeros(0, dtype=TICK_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def symbol_ids(self, symbols: Sequence[str]) -> np.ndarray:
+        return np.array([self._symbol_ids[s] for s in symbols if s in self._symbol_ids], dtype=np.uint32)
+
+    def iter_batches(
+        self, batch_size: int = 65_536, symbols: Optional[Sequence[str]] = None, *, chronological: bool = False
+    ) -> Iterator[np.ndarray]:
+        """레코드를 ``batch_size`` 단위 구조화 배열로 내보낸다.
+
+        필터가 없으면 memmap 뷰를 그대로 반환하므로 복사가 없다. ``symbols``를
+        주면 배치마다 마스크로 걸러 낸 사본을 반환하고, 심볼 정렬 파일이면
+        심볼별 연속 구간의 뷰를 반환한다. ``chronological``이면 심볼 정렬 파일도
+        시각 순으로 병합해 내보낸다. 이때는 행마다 8바이트 인덱스를 만들고
+        배치가 사본이 된다.
+        """
+
+        records = self.records
+        wanted = self.symbol_ids(symbols) if symbols is not None else None
+        if chronological and self.sorted_by_symbol:
+            yield from self._iter_merged(batch_size, wanted)
+            return
+        if wanted is not None and self.sorted_by_symbol:
+            column = records["symbol"]
+            for symbol_id in np.sort(wanted).tolist():
+                lo = int(np.searchsorted(column, symbol_id, side="left"))
+                hi = int(np.searchsorted(column, symbol_id, side="right"))
+                for start in range(lo, hi, batch_size):
+                    yield records[start : min(start + batch_size, hi)]
+            return
+        for start in range(0, len(records), batch_size):
+            batch = records[start : start + batch_size]
+            if wanted is not None:
+                batch = batch[np.isin(batch["symbol"], wanted)]
+                if not len(batch):
+                    continue
+            yield batch
+
+    def _iter_merged(self, batch_size: int, wanted: Optional[np.ndarray]) -> Iterator[np.ndarray]:
+        records = self.records
+        if wanted is None:
+            rows = np.arange(len(records))
+        else:
+            column = records["symbol"]
+            rows = np.concatenate(
+                [
+                    np.arange(np.searchsorted(column, s, side="left"), np.searchsorted(column, s, side="right"))
+                    for s in np.sort(wanted).tolist()
+                ]
+                or [np.zeros(0, dtype=np.intp)]
+            )
+        # 심볼별 구간은 이미 시각 순이므로 안정 정렬이 곧 병합이다.
+        order = rows[np.argsort(records["ts"][rows], kind="stable")]
+        for start in range(0, len(order), batch_size):
+            yield records[order[start : start + batch_size]]
+
+
+class ReplayMarketDataFeed(MarketDataFeed):
+    """틱 파일을 콜백으로 재생하는 :class:`MarketDataFeed` 구현.
+
+    ``speed``가 ``None``이면 가능한 한 빠르게, ``1.0``이면 실시간, 그 밖의
+    값이면 배속으로 재생한다. 이벤트는 ``CallbackMarketDataFeed``와 같은
+    ``{type, symbol, price, volume, ts}`` 사전으로 ``callback``에 전달되며,
+    ``batch_callback``을 주면 대신 구조화 배열 배치와 심볼 테이블이 전달된다.
+    배속 재생에서는 ``pace_quantum``초(재생 시각 기준) 단위로 배치를 잘라
+    각 조각의 첫 틱 시각에 맞춰 내보낸다(심볼 정렬 파일도 시각 순으로 병합해
+    재생한다). 파일 끝에 닿으면 :meth:`run`이
+    반환되며 ``finite`` 피드이므로 인제스터가 처음부터 다시 재생하지 않는다.
+    """
+
+    finite = True
+
+    def __init__(
+        self,
+        path: PathLike,
+        callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        *,
+        batch_callback: Optional[Callable[[np.ndarray, Sequence[str]], Awaitable[None]]] = None,
+        speed: Optional[float] = None,
+        symbols: Optional[Sequence[str]] = None,
+        batch_size: int = 65_536,
+        pace_quantum: float = 0.01,
+    ) -> None:
+        if callback is None and batch_callback is None:
+            raise ValueError("callback or batch_callback is required")
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self._file = TickFile(path)
+        self._callback = callback
+        self._batch_callback = batch_callback
+        self._speed = speed
+        self._symbols = symbols
+        self._batch_size = batch_size
+        self._pace_quantum = pace_quantum
+        self._running = False
+        self.replayed = 0
+
+    async def run(self) -> None:
+        self._running = True
+        clock_start: Optional[float] = None
+        replay_start = 0.0
+        # 배속 재생은 배치 간 시각이 단조 증가한다고 가정하므로 심볼 정렬 파일은 시각 순으로 병합한다.
+        batches = self._file.iter_batches(self._batch_size, self._symbols, chronological=self._speed is not None)
+        for batch in batches:
+            if not self._running:
+                break
+            if self._speed is None:
+                await self._dispatch(batch)
+                await asyncio.sleep(0)
+                continue
+            ts = batch["ts"]
+            if clock_start is None:
+                clock_start = time.monotonic()
+                replay_start = float(ts[0])
+            slots = np.floor((ts - replay_start) / self._pace_quantum)
+            cuts = np.flatnonzero(np.diff(slots)) + 1
+            start = 0
+            for cut in (*cuts.tolist(), len(batch)):
+                chunk = batch[start:cut]
+                start = cut
+                due = clock_start + (float(chunk["ts"][0]) - replay_start) / self._speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if not self._running:
+                    return
+                await self._dispatch(chunk)
+        self._running = False
+
+    async def stop(self) -> None:
+        self._running = False
+
+    async def _dispatch(self, batch: np.ndarray) -> None:
+        self.replayed += len(batch)
+        if self._batch_callback is not None:
+            await self._batch_callback(batch, self._file.symbols)
+            return
+        assert self._callback is not None
+        names = self._file.symbols
+        callback = self._callback
+        for sym, price, volume, ts in zip(
+            batch["symbol"].tolist(), batch["price"].tolist(), batch["volume"].tolist(), batch["ts"].tolist()
+        ):
+            await callback({"type": "trade", "symbol": names[sym], "price": price, "volume": volume, "ts": ts})
@@ -13,6 +13,7 @@ from ..core.settings import (
     refresh_kis_credentials,
     settings,
 )
+from ..services.aiopt.registry import RegistryError, get_live_models
 
 router = APIRouter()
 
@@ -33,6 +34,15 @@ class KisCredentialsRequest(BaseModel):
     is_paper: bool = Field(default=True, description="모의/실전 여부")
 
 
+class ModelActivateRequest(BaseModel):
+    name: str = Field(..., description="모델 이름")
+    version: str = Field(..., description="활성화할 버전 (예: v0002)")
+
+
+class ModelRollbackRequest(BaseModel):
+    name: str = Field(..., description="모델 이름")
+
+
 def _credentials_path() -> Path:
     return Path(settings.KIS_CREDENTIALS_FILE).expanduser()
 
@@ -90,3 +100,30 @@ async def save_kis_credentials(payload: KisCredentialsRequest) -> Dict[str, Any]
     ensure_credentials_file_permissions(path)
     refresh_kis_credentials(settings)
     return _build_credentials_status()
+
+
+@router.get("/models")
+async def list_models() -> Dict[str, Any]:
+    return get_live_models().status()
+
+
+@router.post("/models/activate")
+async def activate_model(payload: ModelActivateRequest) -> Dict[str, Any]:
+    if isinstance(payload, dict):  # FastAPI 스텁 환경 호환
+        payload = ModelActivateRequest(**payload)
+    try:
+        loaded = await get_live_models().deploy(payload.name, payload.version)
+    except (RegistryError, ValueError) as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"name": loaded.name, "version": loaded.version}
+
+
+@router.post("/models/rollback")
+async def rollback_model(payload: ModelRollbackRequest) -> Dict[str, Any]:
+    if isinstance(payload, dict):  # FastAPI 스텁 환경 호환
+        payload = ModelRollbackRequest(**payload)
+    try:
+        loaded = await get_live_models().rollback(payload.name)
+    except (RegistryError, ValueError) as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return {"name": loaded.name, "version": loaded.version}
@@ -4,7 +4,10 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 
+from ..core.latency import TRACER
+from ..core.metrics import REGISTRY
 from ..core.settings import settings
 
 router = APIRouter()
@@ -42,3 +45,17 @@ async def orders() -> Dict[str, Any]:
 @router.get("/pnl/daily")
 async def pnl() -> Dict[str, Any]:
     return {"pnl": 0.0}
+
+
+@router.get("/latency")
+async def latency() -> Dict[str, Any]:
+    """단계별 틱→주문 지연 분포(마이크로초)."""
+
+    return {"enabled": TRACER.enabled, "stages": TRACER.snapshot()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus 텍스트 형식의 런타임 지표."""
+
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,158 @@
+"""틱에서 주문까지의 단계별 지연 추적.
+
+이벤트마다 ``trace`` 사전(단계 이름 → ``time.monotonic_ns()``)을 붙여 경로를
+따라 전달하고, 각 단계에서 :meth:`LatencyTracer.mark`로 직전 단계와의 차이를
+단계별 :class:`LatencyHistogram`에 기록한다. ``CLOCK_MONOTONIC``은 호스트
+전체에서 공유되므로 인제스트와 전략 루프가 같은 호스트의 다른 프로세스여도
+단계 간 차이는 유효하다. 다만 히스토그램은 각 프로세스의 :data:`TRACER`에
+따로 쌓인다.
+
+``exchange`` 단계만 예외로 벽시계(``time.time() - ts``) 기준이라 거래소와
+로컬 시계 동기화 오차를 포함한다.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional
+
+from .settings import settings
+
+STAGES = (
+    "exchange",
+    "feed_recv",
+    "features",
+    "publish",
+    "strategy_recv",
+    "score",
+    "risk",
+    "order",
+)
+TOTAL = "tick_to_order"
+
+Trace = Dict[str, int]
+
+
+class LatencyHistogram:
+    """HDR 방식의 로그-선형 나노초 히스토그램.
+
+    값의 상위 ``precision_bits``비트만 남겨 버킷을 고르므로 상대 오차는
+    ``2 ** -(precision_bits - 1)`` 이하이고, 기록은 정수 연산 몇 번이면 된다.
+    ``max_ns``를 넘는 값은 마지막 버킷에 넣는다.
+    """
+
+    def __init__(self, precision_bits: int = 7, max_ns: int = 60 * 10**9) -> None:
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2")
+        self._bits = precision_bits
+        self._half_shift = precision_bits - 1
+        self._max_ns = max_ns
+        self._counts: List[int] = [0] * (self._index(max_ns) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self._bits
+        if shift < 0:
+            shift = 0
+        return (shift << self._half_shift) + (value >> shift)
+
+    def _upper(self, index: int) -> int:
+        shift = (index >> self._half_shift) - 1
+        if shift < 0:
+            shift = 0
+        top = index - (shift << self._half_shift)
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        elif value > self._max_ns:
+            value = self._max_ns
+        shift = value.bit_length() - self._bits
+        if shift < 0:
+            shift = 0
+        self._counts[(shift << self._half_shift) + (value >> shift)] += 1
+        if value > self.max:
+            self.max = value
+        if value < self.min or not self.count:
+            self.min = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> int:
+        """``q``(0~100) 백분위 값. 해당 버킷에서 가장 큰 값을 반환한다."""
+
+        if not self.count:
+            return 0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = self.total = self.min = self.max = 0
+
+    def summary(self) -> Dict[str, float]:
+        """마이크로초 단위 요약."""
+
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0.0,
+            "min_us": self.min / 1e3,
+            "p50_us": self.percentile(50) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "p999_us": self.percentile(99.9) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+
+
+class LatencyTracer:
+    """단계 타임스탬프를 찍고 단계별 히스토그램을 관리한다.
+
+    ``enabled``가 꺼져 있으면 :meth:`start`가 ``None``을 반환하고, 이후
+    단계의 :meth:`mark` 호출은 ``trace is None`` 검사만 하고 돌아간다.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in (*STAGES, TOTAL)}
+
+    def start(self, exchange_ts: Optional[float] = None) -> Optional[Trace]:
+        """피드 수신 시점을 찍은 새 trace를 반환한다."""
+
+        if not self.enabled:
+            return None
+        if exchange_ts:
+            self.histograms["exchange"].record(int((time.time() - exchange_ts) * 1e9))
+        return {"feed_recv": time.monotonic_ns()}
+
+    def mark(self, trace: Optional[Trace], stage: str) -> None:
+        if trace is None:
+            return
+        now = time.monotonic_ns()
+        if trace:
+            self.histograms[stage].record(now - next(reversed(trace.values())))
+        trace[stage] = now
+
+    def complete(self, trace: Optional[Trace]) -> None:
+        """``order``까지 찍힌 trace의 전체 틱→주문 지연을 기록한다."""
+
+        if trace is None or "order" not in trace or "feed_recv" not in trace:
+            return
+        self.histograms[TOTAL].record(trace["order"] - trace["feed_recv"])
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items() if histogram.count}
+
+
+TRACER = LatencyTracer(enabled=settings.LATENCY_TRACING)
@@ -0,0 +1,324 @@
+"""프로세스 내 런타임 지표 레지스트리와 Prometheus 텍스트 출력.
+
+카운터와 히스토그램은 스레드별 샤드에 누적하고 수집 시점에 합산한다.
+각 스레드(이벤트 루프 하나 또는 기록 스레드)는 자기 샤드에만 쓰므로 핫
+경로에 잠금이 없다. 게이지는 마지막 값 하나만 두며, 큐 깊이처럼 이미 다른
+객체가 들고 있는 값은 :meth:`Gauge.set_function`으로 수집 시점에 읽는다.
+
+지표는 :data:`REGISTRY`에서 이름으로 가져오며 같은 이름으로 다시 요청하면
+기존 객체를 돌려준다. 레이블이 있는 지표는 :meth:`labels`로 얻은 자식을
+인스턴스에 보관해 두고 핫 경로에서 바로 쓴다.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import math
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Sharded:
+    """스레드 ID별로 ``size``칸짜리 누적 배열을 둔다."""
+
+    __slots__ = ("_size", "_shards", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._shards: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> List[float]:
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(ident, [0.0] * self._size)
+        return shard
+
+    def _totals(self) -> List[float]:
+        totals = [0.0] * self._size
+        with self._lock:
+            shards = list(self._shards.values())
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class CounterChild(_Sharded):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class GaugeChild:
+    __slots__ = ("_value", "_function")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """수집할 때마다 ``function()``을 호출해 값을 읽는다."""
+
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:  # pragma: no cover - 소유 객체가 사라진 경우
+                return math.nan
+        return self._value
+
+
+class HistogramChild(_Sharded):
+    """고정 버킷 히스토그램. 샤드는 ``[버킷별 개수..., 합, 개수]``이다."""
+
+    __slots__ = ("_buckets",)
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        super().__init__(len(buckets) + 3)
+        self._buckets = tuple(buckets)
+
+    def observe(self, value: float) -> None:
+        shard = self._shard()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[Tuple[float, float]], float, float]:
+        """``([(le, 누적 개수)...], 합, 개수)``. 마지막 ``le``는 ``+Inf``."""
+
+        totals = self._totals()
+        cumulative: List[Tuple[float, float]] = []
+        running = 0.0
+        for bound, count in zip((*self._buckets, math.inf), totals[:-2]):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative, totals[-2], totals[-1]
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: HistogramChild) -> None:
+        self._child = child
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: str):  # type: ignore[no-untyped-def]
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):  # type: ignore[no-untyped-def]
+        if self.labelnames:
+            raise ValueError(f"{self.name} requires labels {self.labelnames}")
+        return self.labels()
+
+    def children(self) -> List[Tuple[LabelValues, object]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        self._default().set_function(function)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        if list(buckets) != sorted(buckets):
+            raise ValueError("histogram buckets must be sorted")
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, documentation: str, labelnames: Sequence[str], **kwargs: object) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 모든 지표를 출력한다."""
+
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, child in metric.children():
+                if isinstance(child, HistogramChild):
+                    buckets, total, count = child.snapshot()
+                    for bound, cumulative in buckets:
+                        le = _format_value(bound)
+                        labels = _format_labels(metric.labelnames, values, f'le="{le}"')
+                        lines.append(f"{metric.name}_bucket{labels} {_format_value(cumulative)}")
+                    labels = _format_labels(metric.labelnames, values)
+                    lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                    lines.append(f"{metric.name}_count{labels} {_format_value(count)}")
+                else:
+                    labels = _format_labels(metric.labelnames, values)
+                    lines.append(f"{metric.name}{labels} {_format_value(child.value)}")  # type: ignore[attr-defined]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduled and actual wake-up of the loop lag probe.",
+    ("loop",),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+_lag_monitors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task[None]]" = weakref.WeakKeyDictionary()
+
+
+async def _probe_loop_lag(name: str, interval: float) -> None:
+    child = LOOP_LAG.labels(name)
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        child.observe(max(0.0, loop.time() - expected))
+
+
+def ensure_loop_lag_monitor(name: str = "main", interval: float = 0.25) -> None:
+    """현재 이벤트 루프에 지연 측정 태스크가 없으면 하나 띄운다."""
+
+    loop = asyncio.get_running_loop()
+    task = _lag_monitors.get(loop)
+    if task is None or task.done():
+        _lag_monitors[loop] = loop.create_task(_probe_loop_lag(name, interval), name=f"loop-lag-{name}")
@@ -26,6 +26,8 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://redis:6379/0"
     JWT_SECRET: str = "change-me"
     DATA_PROVIDER: str = "KIS"
+    LATENCY_TRACING: bool = True
+    MODEL_REGISTRY_DIR: str = "models"
 
     # 전략 기본값
     TP_CHOICES: List[float] = [0.03, 0.04, 0.05, 0.06, 0.07, 0.08]
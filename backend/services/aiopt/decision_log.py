@@ -0,0 +1,114 @@
+"""밴딧 의사결정 로그.
+
+:class:`PolicyController`가 고른 결정마다 컨텍스트, 선택한 팔, 그 팔을 고른
+확률(propensity)을 적고, 거래가 끝나면 ``compute_reward`` 값을 채운다.
+열 단위 NumPy 버퍼에 쌓으므로 오프폴리시 평가(:mod:`.ope`)가 복사 없이
+그대로 쓸 수 있다. 보상이 아직 없는 행은 ``NaN``이다.
+"""
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass(frozen=True)
+class LoggedDecisions:
+    """보상이 확정된 결정들. ``contexts``는 (n, d), 나머지는 길이 n."""
+
+    contexts: np.ndarray
+    actions: np.ndarray
+    propensities: np.ndarray
+    rewards: np.ndarray
+    n_arms: int
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def save(self, path: PathLike) -> None:
+        with open(path, "wb") as fp:
+            np.savez(
+                fp,
+                contexts=self.contexts,
+                actions=self.actions,
+                propensities=self.propensities,
+                rewards=self.rewards,
+                n_arms=np.array(self.n_arms),
+            )
+
+    @classmethod
+    def load(cls, path: PathLike) -> "LoggedDecisions":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                contexts=data["contexts"],
+                actions=data["actions"],
+                propensities=data["propensities"],
+                rewards=data["rewards"],
+                n_arms=int(data["n_arms"]),
+            )
+
+
+class DecisionLog:
+    """용량이 두 배씩 늘어나는 열 단위 결정 버퍼."""
+
+    def __init__(self, n_features: int, n_arms: int, capacity: int = 1_024) -> None:
+        self.n_features = n_features
+        self.n_arms = n_arms
+        self._size = 0
+        self._contexts = np.zeros((capacity, n_features))
+        self._actions = np.zeros(capacity, dtype=np.int32)
+        self._propensities = np.zeros(capacity)
+        self._rewards = np.full(capacity, np.nan)
+        self._ts = np.zeros(capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        capacity = len(self._actions) * 2
+        for name, fill in (("_contexts", 0.0), ("_actions", 0), ("_propensities", 0.0), ("_rewards", np.nan), ("_ts", 0.0)):
+            old = getattr(self, name)
+            new = np.full((capacity, *old.shape[1:]), fill, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def record(self, context: np.ndarray, action: int, propensity: float, ts: Optional[float] = None) -> int:
+        """결정을 추가하고 나중에 보상을 채울 때 쓸 결정 ID를 반환한다."""
+
+        if not 0.0 < propensity <= 1.0:
+            raise ValueError(f"propensity must be in (0, 1], got {propensity}")
+        if self._size == len(self._actions):
+            self._grow()
+        i = self._size
+        self._contexts[i] = context
+        self._actions[i] = action
+        self._propensities[i] = propensity
+        self._ts[i] = time.time() if ts is None else ts
+        self._size += 1
+        return i
+
+    def set_reward(self, decision_id: int, reward: float) -> None:
+        if not 0 <= decision_id < self._size:
+            raise IndexError(decision_id)
+        self._rewards[decision_id] = reward
+
+    @property
+    def pending(self) -> int:
+        return int(np.isnan(self._rewards[: self._size]).sum())
+
+    def completed(self) -> LoggedDecisions:
+        """보상이 채워진 행만 복사해 반환한다."""
+
+        done = ~np.isnan(self._rewards[: self._size])
+        return LoggedDecisions(
+            contexts=self._contexts[: self._size][done],
+            actions=self._actions[: self._size][done],
+            propensities=self._propensities[: self._size][done],
+            rewards=self._rewards[: self._size][done],
+            n_arms=self.n_arms,
+        )
@@ -1,10 +1,14 @@
 """lifelines를 활용한 해저드 모델링 스캐폴드."""
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 from lifelines import CoxPHFitter
 import pandas as pd
 
+from .model_hazard_table import HazardTable
+
 
 class HazardModel:
     def __init__(self, cph: CoxPHFitter) -> None:
@@ -13,6 +17,35 @@ class HazardModel:
     def predict_partial_hazard(self, df: pd.DataFrame) -> np.ndarray:
         return self._cph.predict_partial_hazard(df).values
 
+    def export_table(self, step: float, horizon: Optional[float] = None) -> HazardTable:
+        return export_hazard_table(self._cph, step, horizon)
+
+
+def export_hazard_table(cph: CoxPHFitter, step: float, horizon: Optional[float] = None) -> HazardTable:
+    """학습된 ``CoxPHFitter``를 ``step`` 간격 격자의 :class:`HazardTable`로 내보낸다.
+
+    ``horizon``을 생략하면 학습 데이터의 최대 지속 시간까지 격자를 만든다.
+    계층(strata) 모델은 지원하지 않는다.
+    """
+
+    if cph.strata:
+        raise ValueError("Stratified Cox models are not supported by HazardTable")
+    if step <= 0:
+        raise ValueError("step must be positive")
+    baseline = cph.baseline_cumulative_hazard_.iloc[:, 0]
+    timeline = baseline.index.values.astype(np.float64)
+    end = float(timeline[-1]) if horizon is None else float(horizon)
+    n_points = max(2, int(np.ceil(end / step)) + 1)
+    grid = np.arange(n_points, dtype=np.float64) * step
+    cum_hazard = np.interp(grid, timeline, baseline.values.astype(np.float64))
+    return HazardTable(
+        columns=tuple(str(name) for name in cph.params_.index),
+        coef=cph.params_.values,
+        mean=cph._norm_mean.values,
+        step=float(step),
+        cum_hazard=cum_hazard,
+    )
+
 
 def train_hazard_model(df: pd.DataFrame, duration_col: str, event_col: str) -> HazardModel:
     cph = CoxPHFitter()
@@ -0,0 +1,112 @@
+"""pandas·lifelines 없이 쓰는 Cox 해저드 조회 테이블.
+
+:func:`~.model_hazard.export_hazard_table`은 학습된 ``CoxPHFitter``에서 계수,
+학습 평균, 그리고 ``step`` 간격의 고정 시간 격자 위 기준 누적 해저드
+``H0``를 꺼낸다. lifelines와 같은 정의를 따르므로::
+
+    H(t | x) = H0(t) · exp((x - mean)·β)
+    S(t | x) = exp(-H(t | x))
+
+이다. ``H0``는 격자 사이를 선형 보간하며(lifelines의 ``times=`` 인자와 같은
+방식) 격자 끝 이후는 마지막 값으로 고정한다. 격자가 균등하므로 조회는
+나눗셈 한 번으로 인덱스를 구하고, 여러 포지션을 한 번에 계산한다.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass(frozen=True)
+class HazardTable:
+    columns: Tuple[str, ...]
+    coef: np.ndarray
+    mean: np.ndarray
+    step: float
+    cum_hazard: np.ndarray
+
+    def __post_init__(self) -> None:
+        if self.step <= 0:
+            raise ValueError("step must be positive")
+        if len(self.cum_hazard) < 2:
+            raise ValueError("cum_hazard needs at least two grid points")
+        object.__setattr__(self, "coef", np.ascontiguousarray(self.coef, dtype=np.float64))
+        object.__setattr__(self, "mean", np.ascontiguousarray(self.mean, dtype=np.float64))
+        object.__setattr__(self, "cum_hazard", np.ascontiguousarray(self.cum_hazard, dtype=np.float64))
+        object.__setattr__(self, "columns", tuple(self.columns))
+
+    @property
+    def horizon(self) -> float:
+        return self.step * (len(self.cum_hazard) - 1)
+
+    def log_partial_hazard(self, features: np.ndarray) -> np.ndarray:
+        """``features``는 :attr:`columns` 순서의 (n, d) 배열."""
+
+        return (np.asarray(features, dtype=np.float64) - self.mean) @ self.coef
+
+    def partial_hazard(self, features: np.ndarray) -> np.ndarray:
+        return np.exp(self.log_partial_hazard(features))
+
+    def baseline(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """격자 선형 보간으로 구한 기준 누적 해저드 ``H0(times)``."""
+
+        table = self.cum_hazard
+        last = len(table) - 1
+        position = np.clip(np.asarray(times, dtype=np.float64) / self.step, 0.0, float(last))
+        index = np.minimum(position.astype(np.intp), last - 1)
+        frac = position - index
+        return table[index] + frac * (table[index + 1] - table[index])
+
+    def cumulative_hazard(self, times: Union[float, np.ndarray], features: np.ndarray) -> np.ndarray:
+        """행마다 ``times[i]``에서의 누적 해저드. ``times``는 스칼라도 된다."""
+
+        return self.baseline(times) * self.partial_hazard(features)
+
+    def survival(self, times: Union[float, np.ndarray], features: np.ndarray) -> np.ndarray:
+        return np.exp(-self.cumulative_hazard(times, features))
+
+    def survival_curves(self, times: Sequence[float], features: np.ndarray) -> np.ndarray:
+        """(len(times), n) 생존 확률 행렬. lifelines ``predict_survival_function``과 같은 모양."""
+
+        base = self.baseline(np.asarray(times, dtype=np.float64))
+        return np.exp(-np.outer(base, self.partial_hazard(features)))
+
+    def conditional_exit(
+        self, elapsed: Union[float, np.ndarray], features: np.ndarray, horizon: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """``elapsed``까지 살아남은 포지션이 다음 ``horizon`` 안에 종료될 확률.
+
+        ``1 - S(elapsed + horizon) / S(elapsed)``
+        ``= 1 - exp(-(H0(elapsed + horizon) - H0(elapsed)) · r(x))``.
+        """
+
+        elapsed = np.asarray(elapsed, dtype=np.float64)
+        delta = self.baseline(elapsed + horizon) - self.baseline(elapsed)
+        return -np.expm1(-delta * self.partial_hazard(features))
+
+    def save(self, path: PathLike) -> None:
+        with open(path, "wb") as fp:
+            np.savez(
+                fp,
+                columns=np.array(self.columns),
+                coef=self.coef,
+                mean=self.mean,
+                step=np.array(self.step),
+                cum_hazard=self.cum_hazard,
+            )
+
+    @classmethod
+    def load(cls, path: PathLike) -> "HazardTable":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                columns=tuple(str(c) for c in data["columns"]),
+                coef=data["coef"],
+                mean=data["mean"],
+                step=float(data["step"]),
+                cum_hazard=data["cum_hazard"],
+            )
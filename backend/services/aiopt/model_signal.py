@@ -9,6 +9,8 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
+from .model_signal_compiled import CompiledSignalModel, fold_standardization
+
 
 @dataclass
 class SignalModel:
@@ -19,6 +21,19 @@ class SignalModel:
         scaled = self.scaler.transform(features)
         return self.model.predict_proba(scaled)
 
+    def compile(self) -> CompiledSignalModel:
+        return compile_signal_model(self)
+
+
+def compile_signal_model(signal_model: SignalModel) -> CompiledSignalModel:
+    """스케일러를 계수에 접어 sklearn 없이 추론하는 모델로 내보낸다."""
+
+    scaler = signal_model.scaler
+    model = signal_model.model
+    mean = scaler.mean_ if scaler.with_mean else None
+    scale = scaler.scale_ if scaler.with_std else None
+    return fold_standardization(model.coef_, model.intercept_, mean, scale, model.classes_)
+
 
 def train_signal_model(X: np.ndarray, y: np.ndarray) -> SignalModel:
     scaler = StandardScaler().fit(X)
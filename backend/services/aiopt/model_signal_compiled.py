@@ -0,0 +1,118 @@
+"""scikit-learn 없이 동작하는 SignalModel 추론 경로.
+
+:func:`~.model_signal.compile_signal_model`이 ``StandardScaler``를 로지스틱
+회귀 계수에 접어 넣어 만든 :class:`CompiledSignalModel`은 NumPy와
+``math``만 사용한다. 표준화 ``z = (x - mean) / scale``을 펼치면::
+
+    w·z + b = (w / scale)·x + (b - Σ w·mean / scale)
+
+이므로 추론은 내적 한 번과 시그모이드(이진) 또는 소프트맥스(다중)로 끝난다.
+이 모듈은 sklearn을 import하지 않는다.
+"""
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Sequence, Union
+
+import numpy as np
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _expit(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+@dataclass(frozen=True)
+class CompiledSignalModel:
+    """접힌 계수 ``weights``(클래스 수×피처 수 또는 1×피처 수)와 절편."""
+
+    weights: np.ndarray
+    intercept: np.ndarray
+    classes: np.ndarray
+
+    def __post_init__(self) -> None:
+        weights = np.ascontiguousarray(self.weights, dtype=np.float64)
+        if weights.ndim != 2:
+            raise ValueError("weights must be 2-D")
+        object.__setattr__(self, "weights", weights)
+        object.__setattr__(self, "intercept", np.ascontiguousarray(self.intercept, dtype=np.float64))
+        # 단일 행 경로는 파이썬 float 튜플로 도는 편이 NumPy 호출보다 빠르다.
+        object.__setattr__(self, "_rows", tuple(tuple(row) for row in weights.tolist()))
+        object.__setattr__(self, "_bias", tuple(self.intercept.tolist()))
+
+    @property
+    def n_features(self) -> int:
+        return self.weights.shape[1]
+
+    @property
+    def binary(self) -> bool:
+        return self.weights.shape[0] == 1
+
+    def decision_function(self, features: np.ndarray) -> np.ndarray:
+        scores = np.asarray(features, dtype=np.float64) @ self.weights.T + self.intercept
+        return scores[:, 0] if self.binary else scores
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """``LogisticRegression.predict_proba``와 같은 모양의 확률 행렬."""
+
+        scores = self.decision_function(features)
+        if self.binary:
+            positive = np.empty_like(scores)
+            np.negative(scores, out=positive)
+            np.exp(positive, out=positive)
+            positive += 1.0
+            np.reciprocal(positive, out=positive)
+            return np.column_stack((1.0 - positive, positive))
+        scores = scores - scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict_one(self, row: Sequence[float]) -> float:
+        """한 행의 양성(마지막 클래스) 확률. NumPy 배열을 만들지 않는다."""
+
+        rows = self._rows  # type: ignore[attr-defined]
+        bias = self._bias  # type: ignore[attr-defined]
+        if len(rows) == 1:
+            z = bias[0]
+            for weight, value in zip(rows[0], row):
+                z += weight * value
+            return _expit(z)
+        scores = []
+        for weights, b in zip(rows, bias):
+            z = b
+            for weight, value in zip(weights, row):
+                z += weight * value
+            scores.append(z)
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        return exps[-1] / sum(exps)
+
+    def save(self, path: PathLike) -> None:
+        with open(path, "wb") as fp:
+            np.savez(fp, weights=self.weights, intercept=self.intercept, classes=self.classes)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "CompiledSignalModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(weights=data["weights"], intercept=data["intercept"], classes=data["classes"])
+
+
+def fold_standardization(
+    coef: np.ndarray, intercept: np.ndarray, mean: Any, scale: Any, classes: np.ndarray
+) -> CompiledSignalModel:
+    """표준화 파라미터를 선형 계수에 접는다. ``mean``/``scale``이 ``None``이면 생략."""
+
+    coef = np.asarray(coef, dtype=np.float64)
+    intercept = np.asarray(intercept, dtype=np.float64).reshape(-1)
+    if scale is not None:
+        coef = coef / np.asarray(scale, dtype=np.float64)
+    if mean is not None:
+        intercept = intercept - coef @ np.asarray(mean, dtype=np.float64)
+    return CompiledSignalModel(weights=coef, intercept=intercept, classes=np.asarray(classes))
@@ -0,0 +1,237 @@
+"""로그된 밴딧 결정에 대한 오프폴리시 평가(OPE).
+
+후보 정책 π마다 로그 정책 μ가 남긴 ``(x, a, μ(a|x), r)``로 가치를 추정한다::
+
+    w   = π(a|x) / μ(a|x)
+    IPS   = Σ w·r / n
+    SNIPS = Σ w·r / Σ w
+    DR    = Σ [Σ_a' π(a'|x)·q̂(x, a') + w·(r - q̂(x, a))] / n
+
+정책은 ``probabilities(contexts) -> (m, K)``를 구현하는 객체다. 행을
+``chunk_size``씩 잘라 정책마다 확률 행렬을 한 번 계산하고, 행별 값
+``[w·r, w, w², dr]``를 (m, P, 4) 배열로 쌓아 합만 남긴다. 따라서 메모리는
+행 수와 무관하다.
+
+신뢰구간은 푸아송 부트스트랩을 쓴다. 각 행에 ``Poisson(1)`` 가중치를 복제본
+B개만큼 뽑으면 복제본 합은 (B, m) @ (m, P·4) 행렬곱 하나로 끝난다. 행을
+샤드로 나눠 :class:`~concurrent.futures.ProcessPoolExecutor`에서 돌리고
+샤드별 합을 더한다. 워커로 보내야 하므로 정책은 pickle 가능해야 한다.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from .decision_log import LoggedDecisions
+
+_WR, _W, _W2, _DR = range(4)
+
+
+class Policy(Protocol):
+    def probabilities(self, contexts: np.ndarray) -> np.ndarray:
+        ...
+
+
+@dataclass(frozen=True)
+class FixedArmPolicy:
+    """항상 ``arm``을 고르고 ``epsilon``만큼 균등 탐색하는 정책."""
+
+    arm: int
+    n_arms: int
+    epsilon: float = 0.0
+
+    def probabilities(self, contexts: np.ndarray) -> np.ndarray:
+        probs = np.full((len(contexts), self.n_arms), self.epsilon / self.n_arms)
+        probs[:, self.arm] += 1.0 - self.epsilon
+        return probs
+
+
+@dataclass(frozen=True)
+class LinearPolicy:
+    """``contexts @ theta.T`` 점수로 고르는 정책.
+
+    ``temperature``가 양수면 소프트맥스, 아니면 argmax에 ``epsilon`` 탐색을 섞는다.
+    :class:`~..exec.linear_bandit.LinearBandit`의 ``theta``를 그대로 넣으면
+    현재 사후 평균에 대한 탐욕 정책이 된다.
+    """
+
+    theta: np.ndarray
+    epsilon: float = 0.0
+    temperature: float = 0.0
+
+    def probabilities(self, contexts: np.ndarray) -> np.ndarray:
+        theta_t = np.asarray(self.theta).T
+        if self.temperature > 0:
+            # 온도를 계수에 미리 곱해 (m, K) 행렬에 대한 연산을 한 번 줄인다.
+            scores = contexts @ (theta_t / self.temperature)
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            scores *= 1.0 / scores.sum(axis=1, keepdims=True)
+            return scores
+        scores = contexts @ theta_t
+        n_arms = scores.shape[1]
+        probs = np.full(scores.shape, self.epsilon / n_arms)
+        probs[np.arange(len(scores)), scores.argmax(axis=1)] += 1.0 - self.epsilon
+        return probs
+
+
+def fit_reward_model(log: LoggedDecisions, ridge: float = 1.0) -> np.ndarray:
+    """DR용 팔별 릿지 회귀 보상 모델 ``q̂(x, a) = x·θₐ``의 (K, d) 계수."""
+
+    d = log.contexts.shape[1]
+    theta = np.zeros((log.n_arms, d))
+    eye = ridge * np.eye(d)
+    for arm in np.unique(log.actions):
+        mask = log.actions == arm
+        X = log.contexts[mask]
+        theta[arm] = np.linalg.solve(eye + X.T @ X, X.T @ log.rewards[mask])
+    return theta
+
+
+@dataclass(frozen=True)
+class OPEEstimate:
+    policy: str
+    ips: float
+    snips: float
+    dr: float
+    # 유효 표본 수 (Σw)² / Σw². 로그 정책과 많이 다를수록 작아진다.
+    ess: float
+    ci: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+
+def _shard_sums(
+    contexts: np.ndarray,
+    actions: np.ndarray,
+    propensities: np.ndarray,
+    rewards: np.ndarray,
+    policies: Sequence[Policy],
+    q_theta: Optional[np.ndarray],
+    max_weight: Optional[float],
+    n_boot: int,
+    seed: Optional[int],
+    chunk_size: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """샤드의 (P, 4) 합, (B, P, 4) 부트스트랩 합, (B,) 부트스트랩 가중치 합."""
+
+    n_policies = len(policies)
+    totals = np.zeros((n_policies, 4))
+    boot = np.zeros((n_boot, n_policies * 4))
+    boot_n = np.zeros(n_boot)
+    rng = np.random.default_rng(seed)
+    for start in range(0, len(actions), chunk_size):
+        stop = start + chunk_size
+        X = contexts[start:stop]
+        a = actions[start:stop]
+        r = rewards[start:stop]
+        rows = np.arange(len(a))
+        inv_mu = 1.0 / propensities[start:stop]
+        q = X @ q_theta.T if q_theta is not None else None
+        q_logged = q[rows, a] if q is not None else 0.0
+        values = np.empty((len(a), n_policies, 4))
+        for j, policy in enumerate(policies):
+            pi = policy.probabilities(X)
+            w = pi[rows, a] * inv_mu
+            if max_weight is not None:
+                np.minimum(w, max_weight, out=w)
+            values[:, j, _WR] = w * r
+            values[:, j, _W] = w
+            values[:, j, _W2] = w * w
+            direct = np.einsum("ij,ij->i", pi, q) if q is not None else 0.0
+            values[:, j, _DR] = direct + w * (r - q_logged)
+        totals += values.sum(axis=0)
+        if n_boot:
+            counts = rng.poisson(1.0, size=(n_boot, len(a))).astype(np.float64)
+            boot += counts @ values.reshape(len(a), -1)
+            boot_n += counts.sum(axis=1)
+    return totals, boot.reshape(n_boot, n_policies, 4), boot_n
+
+
+def _shard_task(args: Tuple) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _shard_sums(*args)
+
+
+def _estimates(sums: np.ndarray, n: np.ndarray) -> Dict[str, np.ndarray]:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "ips": sums[..., _WR] / n,
+            "snips": sums[..., _WR] / sums[..., _W],
+            "dr": sums[..., _DR] / n,
+        }
+
+
+def evaluate(
+    log: LoggedDecisions,
+    policies: Mapping[str, Policy],
+    *,
+    reward_model: Optional[np.ndarray] = None,
+    max_weight: Optional[float] = None,
+    n_boot: int = 0,
+    alpha: float = 0.05,
+    workers: Optional[int] = None,
+    chunk_size: int = 16_384,
+    seed: Optional[int] = None,
+) -> Dict[str, OPEEstimate]:
+    """후보 정책들의 IPS/SNIPS/DR 추정치와 (``n_boot > 0``이면) 부트스트랩 구간.
+
+    ``reward_model``이 없으면 :func:`fit_reward_model`로 로그에서 학습한다.
+    ``max_weight``는 중요도 가중치 클리핑 상한이다. 행을 ``workers``개
+    (기본 CPU 수, 샤드당 최소 ``chunk_size`` 행) 샤드로 나눠 프로세스 풀에서
+    계산하며, 샤드가 하나면 현재 프로세스에서 계산한다.
+    """
+
+    names = list(policies)
+    policy_list = [policies[name] for name in names]
+    q_theta = fit_reward_model(log) if reward_model is None else np.asarray(reward_model, dtype=np.float64)
+    n = len(log)
+    workers = workers or os.cpu_count() or 1
+    n_shards = min(workers, max(1, n // chunk_size))
+    bounds = np.linspace(0, n, n_shards + 1).astype(int)
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    tasks = [
+        (
+            log.contexts[lo:hi],
+            log.actions[lo:hi],
+            log.propensities[lo:hi],
+            log.rewards[lo:hi],
+            policy_list,
+            q_theta,
+            max_weight,
+            n_boot,
+            int(seq.generate_state(1)[0]),
+            chunk_size,
+        )
+        for lo, hi, seq in zip(bounds[:-1], bounds[1:], seeds)
+    ]
+    if n_shards > 1:
+        with ProcessPoolExecutor(max_workers=n_shards) as pool:
+            results: List = list(pool.map(_shard_task, tasks))
+    else:
+        results = [_shard_task(task) for task in tasks]
+
+    totals = sum(result[0] for result in results)
+    point = _estimates(totals, np.float64(n))
+    intervals: Dict[str, np.ndarray] = {}
+    if n_boot:
+        boot = sum(result[1] for result in results)
+        boot_n = sum(result[2] for result in results)
+        replicates = _estimates(boot, boot_n[:, None])
+        for key, values in replicates.items():
+            intervals[key] = np.nanquantile(values, [alpha / 2, 1 - alpha / 2], axis=0)
+
+    estimates: Dict[str, OPEEstimate] = {}
+    for j, name in enumerate(names):
+        ci = {key: (float(bounds_[0, j]), float(bounds_[1, j])) for key, bounds_ in intervals.items()}
+        w_sum, w2_sum = totals[j, _W], totals[j, _W2]
+        estimates[name] = OPEEstimate(
+            policy=name,
+            ips=float(point["ips"][j]),
+            snips=float(point["snips"][j]),
+            dr=float(point["dr"][j]),
+            ess=float(w_sum * w_sum / w2_sum) if w2_sum > 0 else 0.0,
+            ci=ci,
+        )
+    return estimates
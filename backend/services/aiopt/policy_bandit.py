@@ -2,24 +2,85 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Mapping, Optional, Union
+
+import numpy as np
 
 from ..exec.bandit import BanditArm, ContextualBandit
+from ..exec.linear_bandit import CONTEXT_FEATURES, LinearBandit, build_context
+from .decision_log import DecisionLog
+from .reward import TradeOutcome, compute_reward
+
+Bandit = Union[ContextualBandit, LinearBandit]
 
 
 @dataclass
 class PolicyDecision:
     arm: BanditArm
     probability: float
+    context: Optional[np.ndarray] = None
+    decision_id: Optional[int] = None
 
 
 class PolicyController:
-    def __init__(self, bandit: ContextualBandit) -> None:
+    """밴딧 선택 결과를 실제 선택 확률과 함께 돌려준다.
+
+    :class:`LinearBandit`은 ``features``(와 ``ts``)로 컨텍스트를 만들어 팔을
+    고르고, 그 정책이 실제로 사용한 확률을 기록한다. 컨텍스트를 쓰지 않는
+    :class:`ContextualBandit`은 사후분포가 바뀔 때만 몬테카를로로 다시 추정해
+    캐시한 선택 확률 벡터에서 팔을 뽑고 그 확률을 기록한다(0이 되지 않도록
+    보정된다).
+    ``log``를 주면 결정마다 컨텍스트·팔·확률을 적고, :meth:`update`나
+    :meth:`record_outcome`에서 보상을 채운다.
+    """
+
+    def __init__(self, bandit: Bandit, log: Optional[DecisionLog] = None) -> None:
         self._bandit = bandit
+        self._log = log
+
+    @classmethod
+    def with_log(cls, bandit: Bandit, capacity: int = 1_024) -> "PolicyController":
+        return cls(bandit, DecisionLog(len(CONTEXT_FEATURES), len(bandit.arms), capacity))
+
+    @property
+    def bandit(self) -> Bandit:
+        return self._bandit
+
+    @property
+    def log(self) -> Optional[DecisionLog]:
+        return self._log
+
+    def choose(self, features: Optional[Mapping[str, float]] = None, ts: Optional[float] = None) -> PolicyDecision:
+        bandit = self._bandit
+        context = build_context(features or {}, ts)
+        if isinstance(bandit, LinearBandit):
+            selected = bandit.select(context)
+            arm, probability = selected.arm, selected.probability
+        else:
+            arm, probability = bandit.select_logged()
+        decision_id = None
+        if self._log is not None:
+            decision_id = self._log.record(context, arm.index, probability, ts)
+        return PolicyDecision(arm=arm, probability=probability, context=context, decision_id=decision_id)
+
+    def update(self, decision: Union[PolicyDecision, BanditArm], reward: float) -> None:
+        if isinstance(decision, PolicyDecision):
+            arm, context = decision.arm, decision.context
+            if self._log is not None and decision.decision_id is not None:
+                self._log.set_reward(decision.decision_id, reward)
+        else:
+            arm, context = decision, None
+        bandit = self._bandit
+        if isinstance(bandit, LinearBandit):
+            if context is None:
+                raise ValueError("LinearBandit updates need the decision context")
+            bandit.update(arm, reward, context)
+        else:
+            bandit.update(arm, reward)
 
-    def choose(self) -> PolicyDecision:
-        arm = self._bandit.select()
-        return PolicyDecision(arm=arm, probability=1.0)
+    def record_outcome(self, decision: PolicyDecision, outcome: TradeOutcome) -> float:
+        """청산된 거래의 보상을 계산해 밴딧과 로그에 반영하고 반환한다."""
 
-    def update(self, arm: BanditArm, reward: float) -> None:
-        self._bandit.update(arm, reward)
+        reward = compute_reward(outcome)
+        self.update(decision, reward)
+        return reward
@@ -0,0 +1,262 @@
+"""버전 관리되는 파일 기반 모델 레지스트리와 무중단 교체.
+
+아티팩트 레이아웃::
+
+    <root>/<name>/<version>/meta.json      -- 종류, 생성 시각, 메타데이터, 배열별 sha256
+    <root>/<name>/<version>/<array>.npy    -- np.load(mmap_mode="r")로 여는 평면 배열
+    <root>/<name>/ACTIVE                   -- 활성 버전 (원자적 교체)
+    <root>/<name>/history.json             -- 활성화 이력 (롤백용)
+
+버전 디렉터리는 임시 디렉터리에 모두 쓴 뒤 ``os.replace``로 옮기므로 반쯤
+쓰인 버전은 보이지 않는다. :class:`LiveModels`는 새 버전을 스레드에서 읽고
+검증한 다음 슬롯의 ``(버전, 모델)`` 튜플 참조를 한 번에 바꾼다. 틱 처리
+쪽은 이벤트마다 :attr:`ModelSlot.current`를 한 번 읽기만 하므로 교체 중에도
+멈추지 않는다.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .model_hazard_table import HazardTable
+from .model_signal_compiled import CompiledSignalModel
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, "os.PathLike[str]"]
+Model = Union[CompiledSignalModel, HazardTable]
+
+
+class RegistryError(RuntimeError):
+    """아티팩트가 없거나 손상됐을 때 발생하는 예외."""
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w", encoding="utf-8") as fp:
+        fp.write(text)
+    os.replace(tmp, path)
+
+
+def _dump(model: Model) -> Tuple[str, Dict[str, np.ndarray], Dict[str, Any]]:
+    if isinstance(model, CompiledSignalModel):
+        return "signal", {"weights": model.weights, "intercept": model.intercept, "classes": model.classes}, {}
+    if isinstance(model, HazardTable):
+        arrays = {"coef": model.coef, "mean": model.mean, "cum_hazard": model.cum_hazard}
+        return "hazard", arrays, {"columns": list(model.columns), "step": model.step}
+    raise TypeError(f"Unsupported model type: {type(model).__name__}")
+
+
+def _build(kind: str, arrays: Dict[str, np.ndarray], params: Dict[str, Any]) -> Model:
+    if kind == "signal":
+        return CompiledSignalModel(weights=arrays["weights"], intercept=arrays["intercept"], classes=arrays["classes"])
+    if kind == "hazard":
+        return HazardTable(
+            columns=tuple(params["columns"]),
+            coef=arrays["coef"],
+            mean=arrays["mean"],
+            step=float(params["step"]),
+            cum_hazard=arrays["cum_hazard"],
+        )
+    raise RegistryError(f"Unknown model kind: {kind}")
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    name: str
+    version: str
+    kind: str
+    model: Model
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ModelRegistry:
+    """``root`` 아래에 모델 버전을 저장하고 불러온다."""
+
+    def __init__(self, root: PathLike) -> None:
+        self.root = Path(root)
+
+    def _dir(self, name: str) -> Path:
+        if not name or "/" in name or name.startswith("."):
+            raise ValueError(f"Invalid model name: {name!r}")
+        return self.root / name
+
+    def versions(self, name: str) -> List[str]:
+        directory = self._dir(name)
+        if not directory.exists():
+            return []
+        return sorted(p.name for p in directory.iterdir() if p.is_dir() and p.name.startswith("v"))
+
+    def publish(self, name: str, model: Model, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """새 버전을 쓰고 버전 문자열(``v0001`` 형식)을 반환한다. 활성화는 하지 않는다."""
+
+        kind, arrays, params = _dump(model)
+        directory = self._dir(name)
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = self.versions(name)
+        version = f"v{(int(existing[-1][1:]) + 1 if existing else 1):04d}"
+        staging = Path(tempfile.mkdtemp(dir=directory, prefix=".staging-"))
+        try:
+            checksums: Dict[str, str] = {}
+            for key, array in arrays.items():
+                path = staging / f"{key}.npy"
+                np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+                checksums[key] = _sha256(path)
+            meta = {
+                "name": name,
+                "version": version,
+                "kind": kind,
+                "created_at": time.time(),
+                "params": params,
+                "metadata": metadata or {},
+                "sha256": checksums,
+            }
+            (staging / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+            os.replace(staging, directory / version)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        logger.info("Published model %s %s", name, version)
+        return version
+
+    def meta(self, name: str, version: str) -> Dict[str, Any]:
+        path = self._dir(name) / version / "meta.json"
+        if not path.exists():
+            raise RegistryError(f"Model {name} {version} not found")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def load(self, name: str, version: Optional[str] = None, *, verify: bool = True) -> LoadedModel:
+        """버전(생략 시 활성 버전)을 memmap 배열로 연다. ``verify``면 sha256을 검사한다."""
+
+        version = version or self.active(name)
+        if version is None:
+            raise RegistryError(f"No active version for {name}")
+        meta = self.meta(name, version)
+        directory = self._dir(name) / version
+        arrays: Dict[str, np.ndarray] = {}
+        for key, expected in meta["sha256"].items():
+            path = directory / f"{key}.npy"
+            if verify and _sha256(path) != expected:
+                raise RegistryError(f"Checksum mismatch for {name} {version} {key}")
+            arrays[key] = np.load(path, mmap_mode="r", allow_pickle=False)
+        model = _build(meta["kind"], arrays, meta["params"])
+        return LoadedModel(name, version, meta["kind"], model, meta.get("metadata", {}))
+
+    def active(self, name: str) -> Optional[str]:
+        path = self._dir(name) / "ACTIVE"
+        return path.read_text(encoding="utf-8").strip() if path.exists() else None
+
+    def history(self, name: str) -> List[Dict[str, Any]]:
+        path = self._dir(name) / "history.json"
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+    def activate(self, name: str, version: str) -> None:
+        self.meta(name, version)
+        directory = self._dir(name)
+        _write_atomic(directory / "ACTIVE", version)
+        history = self.history(name)
+        history.append({"version": version, "activated_at": time.time()})
+        _write_atomic(directory / "history.json", json.dumps(history, indent=2))
+
+    def previous(self, name: str) -> Optional[str]:
+        """현재 활성 버전 직전에 활성화됐던 다른 버전."""
+
+        current = self.active(name)
+        for entry in reversed(self.history(name)):
+            if entry["version"] != current:
+                return entry["version"]
+        return None
+
+
+class ModelSlot:
+    """``(버전, 모델)``을 하나의 튜플 참조로 보관한다.
+
+    읽는 쪽은 :attr:`current`를 한 번 읽어 같은 이벤트 안에서 버전과 모델이
+    어긋나지 않게 한다. 교체는 참조 대입 한 번이라 잠금이 필요 없다.
+    """
+
+    __slots__ = ("current",)
+
+    def __init__(self, loaded: Optional[LoadedModel] = None) -> None:
+        self.current: Optional[LoadedModel] = loaded
+
+    @property
+    def version(self) -> Optional[str]:
+        current = self.current
+        return current.version if current is not None else None
+
+
+class LiveModels:
+    """레지스트리의 활성 버전을 슬롯에 올리고 무중단으로 교체·롤백한다."""
+
+    def __init__(self, registry: ModelRegistry, *, loader: Optional[Callable[..., LoadedModel]] = None) -> None:
+        self.registry = registry
+        self._slots: Dict[str, ModelSlot] = {}
+        self._loader = loader or registry.load
+
+    def slot(self, name: str) -> ModelSlot:
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = self._slots[name] = ModelSlot()
+            if self.registry.active(name) is not None:
+                slot.current = self._loader(name)
+        return slot
+
+    async def deploy(self, name: str, version: str) -> LoadedModel:
+        """``version``을 스레드에서 읽고 검증한 뒤 활성화하고 슬롯을 교체한다."""
+
+        loaded = await asyncio.to_thread(self._loader, name, version)
+        self.registry.activate(name, version)
+        self.slot(name).current = loaded
+        logger.info("Model %s switched to %s", name, version)
+        return loaded
+
+    async def rollback(self, name: str) -> LoadedModel:
+        previous = self.registry.previous(name)
+        if previous is None:
+            raise RegistryError(f"No previous version to roll back to for {name}")
+        return await self.deploy(name, previous)
+
+    def status(self) -> Dict[str, Any]:
+        names = sorted(p.name for p in self.registry.root.iterdir() if p.is_dir()) if self.registry.root.exists() else []
+        return {
+            name: {
+                "active": self.registry.active(name),
+                "loaded": self._slots[name].version if name in self._slots else None,
+                "versions": self.registry.versions(name),
+            }
+            for name in names
+        }
+
+
+_live_models: Optional[LiveModels] = None
+
+
+def get_live_models() -> LiveModels:
+    """설정의 ``MODEL_REGISTRY_DIR``을 쓰는 프로세스 공용 :class:`LiveModels`."""
+
+    global _live_models
+    if _live_models is None:
+        from ...core.settings import settings
+
+        _live_models = LiveModels(ModelRegistry(settings.MODEL_REGISTRY_DIR))
+    return _live_models
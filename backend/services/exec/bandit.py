@@ -1,43 +1,214 @@
-"""Contextual bandit scaffold for TP/SL/TimeStop selection."""
+"""Contextual bandit scaffold for TP/SL/TimeStop selection.
+
+Arm posteriors live in two NumPy arrays (``successes`` and ``trials``) so a
+Thompson draw over the whole grid is a single ``Generator.beta`` call. The
+:class:`BanditArm` objects handed to the router are views onto one row of
+those arrays; reading or assigning ``arm.successes`` goes straight to the
+bandit state.
+"""
 from __future__ import annotations
 
+import logging
 import random
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def arm_grid(arms: Sequence["BanditArm"]) -> np.ndarray:
+    """(arms, 3) TP/SL/TimeStop table used to check that a checkpoint fits the current grid."""
+
+    return np.array([(arm.tp, arm.sl_atr, arm.tstop_min) for arm in arms], dtype=np.float64).reshape(-1, 3)
+
+
+def grid_matches(arms: Sequence["BanditArm"], state: Mapping[str, np.ndarray], owner: str) -> bool:
+    grid = state.get("grid")
+    if grid is None or not np.array_equal(grid, arm_grid(arms)):
+        logger.warning("%s checkpoint grid does not match the configured arms; starting fresh", owner)
+        return False
+    return True
 
 
-@dataclass
 class BanditArm:
-    tp: float
-    sl_atr: float
-    tstop_min: int
-    successes: float = 1.0
-    trials: float = 2.0
+    __slots__ = ("tp", "sl_atr", "tstop_min", "_successes", "_trials", "_index")
+
+    def __init__(self, tp: float, sl_atr: float, tstop_min: int, successes: float = 1.0, trials: float = 2.0) -> None:
+        self.tp = tp
+        self.sl_atr = sl_atr
+        self.tstop_min = tstop_min
+        # A standalone arm owns a one-element state; bandit arms are rebound via _view.
+        self._successes = np.array([successes], dtype=np.float64)
+        self._trials = np.array([trials], dtype=np.float64)
+        self._index = 0
+
+    @classmethod
+    def _view(
+        cls, tp: float, sl_atr: float, tstop_min: int, successes: np.ndarray, trials: np.ndarray, index: int
+    ) -> "BanditArm":
+        arm = cls.__new__(cls)
+        arm.tp = tp
+        arm.sl_atr = sl_atr
+        arm.tstop_min = tstop_min
+        arm._successes = successes
+        arm._trials = trials
+        arm._index = index
+        return arm
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def successes(self) -> float:
+        return float(self._successes[self._index])
+
+    @successes.setter
+    def successes(self, value: float) -> None:
+        self._successes[self._index] = value
+
+    @property
+    def trials(self) -> float:
+        return float(self._trials[self._index])
+
+    @trials.setter
+    def trials(self, value: float) -> None:
+        self._trials[self._index] = value
 
     def sample(self) -> float:
         return random.betavariate(self.successes, self.trials - self.successes)
 
+    def __repr__(self) -> str:
+        return (
+            f"BanditArm(tp={self.tp!r}, sl_atr={self.sl_atr!r}, tstop_min={self.tstop_min!r}, "
+            f"successes={self.successes!r}, trials={self.trials!r})"
+        )
+
 
 class ContextualBandit:
+    """Beta-Bernoulli Thompson sampling with epsilon exploration over the TP/SL/TimeStop grid.
+
+    ``seed`` fixes the NumPy generator used for both exploration and posterior
+    draws, so backtests replay the same arm sequence.
+    """
+
     def __init__(
         self,
         tp_choices: Sequence[float],
         sl_choices: Sequence[float],
         tstop_choices: Sequence[int],
         epsilon: float = 0.07,
+        *,
+        seed: Optional[int] = None,
     ) -> None:
         self.epsilon = epsilon
+        grid = [(tp, sl, tstop) for tp in tp_choices for sl in sl_choices for tstop in tstop_choices]
+        self._successes = np.ones(len(grid), dtype=np.float64)
+        self._trials = np.full(len(grid), 2.0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
         self.arms: List[BanditArm] = [
-            BanditArm(tp=tp, sl_atr=sl, tstop_min=tstop)
-            for tp in tp_choices
-            for sl in sl_choices
-            for tstop in tstop_choices
+            BanditArm._view(tp, sl, tstop, self._successes, self._trials, index)
+            for index, (tp, sl, tstop) in enumerate(grid)
         ]
+        self._grid = arm_grid(self.arms)
+        # Posterior and epsilon the cached selection probabilities were estimated for.
+        self._prob_cache: Optional[tuple] = None
+
+    @property
+    def alpha(self) -> np.ndarray:
+        """Beta posterior ``alpha`` per arm (a live view of the success counts)."""
+
+        return self._successes
+
+    @property
+    def beta(self) -> np.ndarray:
+        """Beta posterior ``beta`` per arm (``trials - successes``)."""
+
+        return self._trials - self._successes
 
     def select(self) -> BanditArm:
-        if random.random() < self.epsilon:
-            return random.choice(self.arms)
-        return max(self.arms, key=lambda arm: arm.sample())
+        rng = self._rng
+        if rng.random() < self.epsilon:
+            return self.arms[rng.integers(len(self.arms))]
+        samples = rng.beta(self._successes, self._trials - self._successes)
+        return self.arms[int(samples.argmax())]
+
+    def probabilities(self, n_samples: int = 1_000) -> np.ndarray:
+        """Monte Carlo estimate of each arm's probability of being chosen by :meth:`select`."""
+
+        n_arms = len(self.arms)
+        samples = self._rng.beta(self._successes, self._trials - self._successes, size=(n_samples, n_arms))
+        wins = np.bincount(samples.argmax(axis=1), minlength=n_arms) / n_samples
+        return (1.0 - self.epsilon) * wins + self.epsilon / n_arms
+
+    def selection_probabilities(self, n_samples: int = 1_000) -> np.ndarray:
+        """Cached :meth:`probabilities` for logging propensities on the decision path.
+
+        The estimate is redrawn only when the posterior or ``epsilon`` changed,
+        i.e. after an update, so per-decision cost is an array comparison. Win
+        counts are smoothed by half a draw per arm so no arm's probability is 0.
+        """
+
+        cache = self._prob_cache
+        if (
+            cache is not None
+            and cache[0] == self.epsilon
+            and np.array_equal(cache[1], self._successes)
+            and np.array_equal(cache[2], self._trials)
+        ):
+            return cache[3]
+        n_arms = len(self.arms)
+        samples = self._rng.beta(self._successes, self._trials - self._successes, size=(n_samples, n_arms))
+        wins = (np.bincount(samples.argmax(axis=1), minlength=n_arms) + 0.5) / (n_samples + 0.5 * n_arms)
+        probs = (1.0 - self.epsilon) * wins + self.epsilon / n_arms
+        probs.flags.writeable = False
+        self._prob_cache = (self.epsilon, self._successes.copy(), self._trials.copy(), probs)
+        return probs
+
+    def select_logged(self) -> Tuple[BanditArm, float]:
+        """Draw an arm from :meth:`selection_probabilities` and return it with its probability.
+
+        Unlike :meth:`select`, the arm comes from the same cached vector the
+        probability is read from, so the logged propensity is the one used.
+        """
+
+        probs = self.selection_probabilities()
+        cumulative = probs.cumsum()
+        k = min(int((cumulative <= self._rng.random() * cumulative[-1]).sum()), len(self.arms) - 1)
+        return self.arms[k], float(probs[k])
+
+    def select_many(self, n: int) -> List[BanditArm]:
+        """Draw ``n`` independent decisions for simultaneous entries in one batch."""
+
+        if n <= 0:
+            return []
+        rng = self._rng
+        n_arms = len(self.arms)
+        explore = rng.random(n) < self.epsilon
+        samples = rng.beta(self._successes, self._trials - self._successes, size=(n, n_arms))
+        chosen = samples.argmax(axis=1)
+        n_explore = int(explore.sum())
+        if n_explore:
+            chosen[explore] = rng.integers(n_arms, size=n_explore)
+        arms = self.arms
+        return [arms[i] for i in chosen.tolist()]
+
+    def export_state(self) -> Dict[str, np.ndarray]:
+        return {
+            "successes": self._successes,
+            "trials": self._trials,
+            "epsilon": np.array(self.epsilon),
+            "grid": self._grid,
+        }
+
+    def import_state(self, state: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> None:
+        # Overwrite in place so existing BanditArm views stay bound to the live arrays.
+        if not grid_matches(self.arms, state, "ContextualBandit"):
+            return
+        self._successes[:] = state["successes"]
+        self._trials[:] = state["trials"]
+        self.epsilon = float(state["epsilon"])
 
     def update(self, arm: BanditArm, reward: float) -> None:
         success = reward > 0
@@ -0,0 +1,137 @@
+"""전략 루프가 기다리지 않도록 주문 제출을 백그라운드 태스크로 넘기는 디스패처."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ...core.latency import Trace
+from ...core.metrics import REGISTRY
+from .bandit import BanditArm
+from .router import OrderRouter
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = REGISTRY.gauge("orders_in_flight", "Entry orders awaiting a broker response.")
+SKIPPED = REGISTRY.counter("orders_dispatch_skipped_total", "Entry signals not dispatched.", ("reason",))
+
+# 게이지가 인스턴스를 붙잡지 않도록 약한 참조로 모든 살아 있는 디스패처의 합을 보고한다.
+_DISPATCHERS: "weakref.WeakSet[OrderDispatcher]" = weakref.WeakSet()
+IN_FLIGHT.set_function(lambda: sum(len(d._in_flight) for d in list(_DISPATCHERS)))
+
+
+@dataclass
+class OrderOutcome:
+    symbol: str
+    side: str
+    qty: float
+    arm: BanditArm
+    result: Optional[Dict[str, Any]]
+    error: Optional[BaseException]
+    latency: float
+    price: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.result is not None
+
+
+OutcomeCallback = Callable[[OrderOutcome], Union[None, Awaitable[None]]]
+
+
+class OrderDispatcher:
+    """진입 주문을 동시 실행 수가 제한된 태스크로 제출한다.
+
+    종목마다 진행 중인 주문은 하나뿐이다. 같은 종목의 주문이 아직 끝나지
+    않았으면 새 진입 신호는 대기열에 넣지 않고 버려 중복 진입을 막는다.
+    전체 진행 중 주문이 ``max_in_flight``개면 마찬가지로 버린다. 완료·실패
+    결과는 :class:`OrderOutcome`으로 ``on_outcome`` 콜백(동기/비동기)에
+    전달된다.
+    """
+
+    def __init__(
+        self,
+        router: OrderRouter,
+        *,
+        max_in_flight: int = 8,
+        on_outcome: Optional[OutcomeCallback] = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        self._router = router
+        self.max_in_flight = max_in_flight
+        self._on_outcome = on_outcome
+        self._in_flight: Dict[str, "asyncio.Task[None]"] = {}
+        self._skipped_busy = SKIPPED.labels("symbol_in_flight")
+        self._skipped_full = SKIPPED.labels("capacity")
+        _DISPATCHERS.add(self)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def busy(self, symbol: str) -> bool:
+        return symbol in self._in_flight
+
+    def accepts(self, symbol: str) -> bool:
+        """``symbol`` 주문을 지금 제출할 수 있는지 확인하고, 아니면 건너뜀을 기록한다."""
+
+        if symbol in self._in_flight:
+            self._skipped_busy.inc()
+            return False
+        if len(self._in_flight) >= self.max_in_flight:
+            self._skipped_full.inc()
+            return False
+        return True
+
+    def submit(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        arm: BanditArm,
+        *,
+        price: Optional[float] = None,
+        trace: Optional[Trace] = None,
+    ) -> bool:
+        """주문 태스크를 띄우고 즉시 반환한다. 제출하지 못하면 ``False``."""
+
+        if not self.accepts(symbol):
+            return False
+        task = asyncio.create_task(self._run(symbol, side, qty, arm, price, trace), name=f"order-{symbol}")
+        self._in_flight[symbol] = task
+        return True
+
+    async def drain(self) -> None:
+        """진행 중인 주문이 모두 끝날 때까지 기다린다."""
+
+        while self._in_flight:
+            await asyncio.gather(*list(self._in_flight.values()), return_exceptions=True)
+
+    async def _run(
+        self, symbol: str, side: str, qty: float, arm: BanditArm, price: Optional[float], trace: Optional[Trace]
+    ) -> None:
+        start = time.perf_counter()
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+        try:
+            result = await self._router.submit_entry(symbol, side, qty, arm, price=price, trace=trace)
+        except Exception as exc:
+            error = exc
+            logger.error("Order submission for %s failed: %s", symbol, exc)
+        finally:
+            self._in_flight.pop(symbol, None)
+        if result:
+            logger.info("Submitted order %s", result)
+        if self._on_outcome is not None:
+            outcome = OrderOutcome(symbol, side, qty, arm, result, error, time.perf_counter() - start, price)
+            try:
+                maybe = self._on_outcome(outcome)
+                if inspect.isawaitable(maybe):
+                    await maybe
+            except Exception as exc:  # pragma: no cover - 콜백 오류는 기록만 한다
+                logger.error("Order outcome callback failed: %s", exc)
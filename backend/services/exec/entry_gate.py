@@ -0,0 +1,191 @@
+"""종목별 진입 억제 인덱스(진행 중 주문·보유 포지션·쿨다운).
+
+:class:`EntryGate`는 밴딧과 라우터보다 먼저 호출되어, 같은 종목에 대한
+중복 진입 신호를 사전 조회 한 번으로 걸러 낸다. 쿨다운 만료는 종목마다
+태스크를 띄우지 않고 :class:`TimerWheel` 하나로 처리한다.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Callable, DefaultDict, Dict, Hashable, List, Optional, Tuple
+
+from ...core.metrics import REGISTRY
+
+SUPPRESSED = REGISTRY.counter("entry_suppressed_total", "Entry signals suppressed by EntryGate.", ("reason",))
+
+REASONS = ("in_flight", "open_position", "cooldown")
+
+
+class TimerWheel:
+    """해시 타이머 휠. 만료 시각을 ``tick`` 단위로 올림해 슬롯에 넣는다.
+
+    :meth:`advance`는 지난 틱의 슬롯만 훑으므로 비용이 예약 수가 아니라
+    경과 틱 수에 비례한다. 취소는 지원하지 않으며, 호출자가 만료된 키의
+    현재 상태를 확인해 늦게 도착한 타이머를 무시한다.
+    """
+
+    def __init__(self, tick: float = 0.25, slots: int = 512, start: float = 0.0) -> None:
+        if tick <= 0 or slots < 1:
+            raise ValueError("tick and slots must be positive")
+        self._tick = tick
+        self._slots: List[List[Tuple[int, Hashable]]] = [[] for _ in range(slots)]
+        self._current = int(start // tick)
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        target = max(int(math.ceil(deadline / self._tick)), self._current + 1)
+        self._slots[target % len(self._slots)].append((target, key))
+        self._pending += 1
+
+    def advance(self, now: float) -> List[Hashable]:
+        """``now``까지 만료된 키를 반환한다."""
+
+        target = int(now // self._tick)
+        if target <= self._current:
+            return []
+        expired: List[Hashable] = []
+        n_slots = len(self._slots)
+        if self._pending:
+            for step in range(1, min(target - self._current, n_slots) + 1):
+                index = (self._current + step) % n_slots
+                bucket = self._slots[index]
+                if not bucket:
+                    continue
+                keep = [entry for entry in bucket if entry[0] > target]
+                if len(keep) != len(bucket):
+                    expired.extend(key for tick, key in bucket if tick <= target)
+                    self._slots[index] = keep
+        self._pending -= len(expired)
+        self._current = target
+        return expired
+
+
+class _SymbolState:
+    __slots__ = ("in_flight", "open_position", "cooling", "cooldown_until")
+
+    def __init__(self) -> None:
+        self.in_flight = False
+        self.open_position = False
+        self.cooling = False
+        self.cooldown_until = 0.0
+
+    def idle(self) -> bool:
+        return not (self.in_flight or self.open_position or self.cooling)
+
+
+class EntryGate:
+    """종목별 진입 가능 여부를 O(1)로 판정한다.
+
+    진입 주문을 넘기면 :meth:`on_dispatch`, 결과가 오면 :meth:`on_outcome`,
+    포지션이 청산되면 :meth:`on_exit`를 호출한다. 주문 결과와 청산 뒤에는
+    ``cooldown``초 동안 같은 종목 진입을 막는다. 쿨다운은 휠의 ``tick``
+    단위로 올림되어 풀린다.
+    """
+
+    def __init__(
+        self,
+        cooldown: float = 60.0,
+        *,
+        tick: float = 0.25,
+        slots: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if cooldown < 0:
+            raise ValueError("cooldown must be non-negative")
+        self.cooldown = cooldown
+        self._clock = clock
+        self._wheel = TimerWheel(tick, slots, start=clock())
+        self._states: Dict[str, _SymbolState] = {}
+        self._suppressed: DefaultDict[str, Counter] = defaultdict(Counter)
+        self._metrics = {reason: SUPPRESSED.labels(reason) for reason in REASONS}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def allow(self, symbol: str) -> bool:
+        """진입을 막을 상태가 없으면 ``True``. 막으면 사유별로 집계한다."""
+
+        if len(self._wheel):
+            self._expire(self._clock())
+        state = self._states.get(symbol)
+        if state is None:
+            return True
+        if state.in_flight:
+            reason = "in_flight"
+        elif state.open_position:
+            reason = "open_position"
+        elif state.cooling:
+            reason = "cooldown"
+        else:
+            return True
+        self._suppressed[symbol][reason] += 1
+        self._metrics[reason].inc()
+        return False
+
+    def on_dispatch(self, symbol: str) -> None:
+        self._state(symbol).in_flight = True
+
+    def on_outcome(self, symbol: str, filled: bool) -> None:
+        state = self._state(symbol)
+        state.in_flight = False
+        if filled:
+            state.open_position = True
+        self._start_cooldown(symbol, state)
+
+    def mark_open(self, symbol: str) -> None:
+        """재시작 후 복원된 포지션처럼 주문 없이 보유 중인 종목을 표시한다."""
+
+        self._state(symbol).open_position = True
+
+    def on_exit(self, symbol: str) -> None:
+        state = self._state(symbol)
+        state.open_position = False
+        self._start_cooldown(symbol, state)
+
+    def state(self, symbol: str) -> Dict[str, object]:
+        state = self._states.get(symbol)
+        if state is None:
+            return {"in_flight": False, "open_position": False, "cooldown_until": None}
+        return {
+            "in_flight": state.in_flight,
+            "open_position": state.open_position,
+            "cooldown_until": state.cooldown_until if state.cooling else None,
+        }
+
+    def suppressed(self, symbol: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """종목별(또는 한 종목의) 사유별 억제 횟수."""
+
+        if symbol is not None:
+            return {symbol: dict(self._suppressed.get(symbol, {}))}
+        return {sym: dict(counts) for sym, counts in self._suppressed.items()}
+
+    def _state(self, symbol: str) -> _SymbolState:
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = _SymbolState()
+        return state
+
+    def _start_cooldown(self, symbol: str, state: _SymbolState) -> None:
+        if self.cooldown <= 0:
+            if state.idle():
+                del self._states[symbol]
+            return
+        state.cooling = True
+        state.cooldown_until = self._clock() + self.cooldown
+        self._wheel.schedule(symbol, state.cooldown_until)
+
+    def _expire(self, now: float) -> None:
+        states = self._states
+        for symbol in self._wheel.advance(now):
+            state = states.get(symbol)
+            # 쿨다운이 다시 연장됐다면 이전 타이머는 무시한다.
+            if state is None or not state.cooling or state.cooldown_until > now:
+                continue
+            state.cooling = False
+            if state.idle():
+                del states[symbol]
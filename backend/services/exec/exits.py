@@ -0,0 +1,503 @@
+"""TP·SL·타임스톱을 실제로 집행하는 브래킷 청산 관리자.
+
+열린 포지션을 슬롯 배열(진입가, TP 가격, SL 가격, 마감 시각, 최근가)로
+보관한다. 가격 묶음이 들어오면 최근가를 갱신한 뒤 전체 슬롯을 벡터 비교
+한 번으로 평가하므로 포지션마다 코루틴이나 타이머를 두지 않는다. 청산
+주문만 태스크로 라우터에 넘기고, 체결되면 실현 손익을
+:meth:`RiskManager.register_fill`에, ``compute_reward`` 보상을
+:class:`~..aiopt.policy_bandit.PolicyController`를 거쳐 밴딧과 결정 로그에
+반영한다. 진입 때의 :class:`~..aiopt.policy_bandit.PolicyDecision`을 브래킷에
+함께 보관하므로 보상은 그 결정의 컨텍스트·로그 행에 정확히 연결된다.
+
+가격 기준::
+
+    TP = 진입가 · (1 + arm.tp)
+    SL = 진입가 - arm.sl_atr · ATR
+    마감 = 진입 시각 + arm.tstop_min · 60
+
+ATR을 모르면 ``진입가 · default_atr_pct``를 쓴다. 한 종목에는 포지션이 하나뿐이다
+(:class:`~.entry_gate.EntryGate`가 중복 진입을 막는다).
+
+청산 주문이 실패하면 같은 브래킷을 다시 걸되, 슬롯별 재시도 시각
+(``retry_base``부터 두 배씩, 최대 ``retry_max``초)이 지나기 전에는 평가에서
+제외한다. ``max_retries``번 실패하면 더 이상 자동으로 재시도하지 않고
+``stuck``에 남긴 채 경고를 올리며, ``halt_on_stuck``이면 신규 진입도 막는다.
+:meth:`ExitManager.retry`로 수동 재시도할 수 있다.
+
+:class:`~.checkpoint.Checkpointer` 소스로 등록하면 열린 브래킷(가격·마감·팔·진입
+결정의 컨텍스트와 확률)을 스냅숏에 담고, 재시작 때 그대로 다시 건다. 결정
+로그는 메모리에만 있으므로 복원된 결정에는 로그 행 번호가 없다.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set, Union
+
+import numpy as np
+
+from ...core.metrics import REGISTRY
+from ..aiopt.policy_bandit import PolicyController, PolicyDecision
+from ..aiopt.reward import TradeOutcome, compute_reward
+from .bandit import BanditArm, ContextualBandit
+from .linear_bandit import CONTEXT_FEATURES, LinearBandit
+from .risk import RiskManager
+from .router import OrderRouter
+
+logger = logging.getLogger(__name__)
+
+EXITS = REGISTRY.counter("bracket_exits_total", "Positions closed by ExitManager.", ("reason",))
+EXIT_FAILURES = REGISTRY.counter("bracket_exit_failures_total", "Failed exit orders.", ("outcome",))
+OPEN_BRACKETS = REGISTRY.gauge("bracket_open_positions", "Positions tracked by ExitManager.")
+
+# 게이지가 인스턴스를 붙잡지 않도록 약한 참조로 살아 있는 관리자 전체의 합을 보고한다.
+_MANAGERS: "weakref.WeakSet[ExitManager]" = weakref.WeakSet()
+OPEN_BRACKETS.set_function(lambda: sum(len(m._slots) for m in list(_MANAGERS)))
+
+TAKE_PROFIT = "take_profit"
+STOP_LOSS = "stop_loss"
+TIME_STOP = "time_stop"
+
+
+@dataclass
+class ExitSignal:
+    symbol: str
+    qty: float
+    entry_price: float
+    exit_price: float
+    reason: str
+    arm: BanditArm
+    opened_at: float
+    triggered_at: float
+    tp_price: float
+    sl_price: float
+    deadline: float
+    decision: Optional[PolicyDecision] = None
+    # 이 브래킷에서 이미 실패한 청산 주문 수.
+    attempts: int = 0
+
+
+@dataclass
+class ClosedTrade:
+    signal: ExitSignal
+    exit_price: float
+    pnl: float
+    reward: float
+    payload: Optional[Dict[str, Any]]
+
+
+ExitCallback = Callable[[ClosedTrade], Union[None, Awaitable[None]]]
+
+
+class ExitManager:
+    def __init__(
+        self,
+        router: OrderRouter,
+        risk: RiskManager,
+        policy: Optional[Union[PolicyController, ContextualBandit, LinearBandit]] = None,
+        *,
+        capacity: int = 64,
+        default_atr_pct: float = 0.01,
+        fee_per_share: float = 0.0,
+        on_closed: Optional[ExitCallback] = None,
+        retry_base: float = 1.0,
+        retry_max: float = 30.0,
+        max_retries: int = 5,
+        halt_on_stuck: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._router = router
+        self._risk = risk
+        # 밴딧만 주면 결정 로그가 달린 컨트롤러로 감싼다. StrategyLoop가 같은 컨트롤러로 팔을 고른다.
+        if policy is None or isinstance(policy, PolicyController):
+            self._policy = policy
+        else:
+            self._policy = PolicyController.with_log(policy)
+        self.default_atr_pct = default_atr_pct
+        self.fee_per_share = fee_per_share
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_retries = max_retries
+        self.halt_on_stuck = halt_on_stuck
+        self._listeners: List[ExitCallback] = [on_closed] if on_closed is not None else []
+        self._clock = clock
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._symbols: List[Optional[str]] = []
+        self._arms: List[Optional[BanditArm]] = []
+        self._decisions: List[Optional[PolicyDecision]] = []
+        self._active = np.zeros(0, dtype=bool)
+        self._qty = np.zeros(0)
+        self._entry = np.zeros(0)
+        self._tp = np.zeros(0)
+        self._sl = np.zeros(0)
+        self._deadline = np.zeros(0)
+        self._opened = np.zeros(0)
+        self._last = np.zeros(0)
+        # 실패한 청산의 재시도 가능 시각과 연속 실패 횟수.
+        self._retry_at = np.zeros(0)
+        self._attempts = np.zeros(0, dtype=np.int64)
+        self._grow(capacity)
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        _MANAGERS.add(self)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def policy(self) -> Optional[PolicyController]:
+        return self._policy
+
+    def add_listener(self, callback: ExitCallback) -> None:
+        """청산 완료(:class:`ClosedTrade`)를 받을 콜백을 추가한다."""
+
+        self._listeners.append(callback)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._slots
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._slots)
+
+    def _grow(self, capacity: int) -> None:
+        old = len(self._active)
+        for name in ("_active", "_qty", "_entry", "_tp", "_sl", "_deadline", "_opened", "_last", "_retry_at", "_attempts"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._symbols.extend([None] * (capacity - old))
+        self._arms.extend([None] * (capacity - old))
+        self._decisions.extend([None] * (capacity - old))
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def open(
+        self,
+        symbol: str,
+        qty: float,
+        entry_price: float,
+        arm: BanditArm,
+        *,
+        atr: Optional[float] = None,
+        ts: Optional[float] = None,
+        decision: Optional[PolicyDecision] = None,
+    ) -> None:
+        """체결된 진입을 등록하고 브래킷 가격을 계산한다. ``decision``은 보상을 돌려줄 진입 결정이다."""
+
+        ts = self._clock() if ts is None else ts
+        atr = atr if atr and atr > 0 else entry_price * self.default_atr_pct
+        self._insert(
+            symbol,
+            qty,
+            entry_price,
+            arm,
+            tp=entry_price * (1.0 + arm.tp),
+            sl=entry_price - arm.sl_atr * atr,
+            deadline=ts + arm.tstop_min * 60.0,
+            opened=ts,
+            decision=decision,
+        )
+
+    def _insert(
+        self,
+        symbol: str,
+        qty: float,
+        entry_price: float,
+        arm: BanditArm,
+        *,
+        tp: float,
+        sl: float,
+        deadline: float,
+        opened: float,
+        decision: Optional[PolicyDecision],
+    ) -> int:
+        if symbol in self._slots:
+            raise ValueError(f"{symbol} already has an open bracket")
+        if not self._free:
+            self._grow(len(self._active) * 2)
+        slot = self._free.pop()
+        self._slots[symbol] = slot
+        self._symbols[slot] = symbol
+        self._arms[slot] = arm
+        self._decisions[slot] = decision
+        self._qty[slot] = qty
+        self._entry[slot] = entry_price
+        self._tp[slot] = tp
+        self._sl[slot] = sl
+        self._deadline[slot] = deadline
+        self._opened[slot] = opened
+        self._last[slot] = entry_price
+        self._retry_at[slot] = 0.0
+        self._attempts[slot] = 0
+        self._active[slot] = True
+        return slot
+
+    def brackets(self, symbol: str) -> Dict[str, float]:
+        slot = self._slots[symbol]
+        return {
+            "qty": float(self._qty[slot]),
+            "entry": float(self._entry[slot]),
+            "tp": float(self._tp[slot]),
+            "sl": float(self._sl[slot]),
+            "deadline": float(self._deadline[slot]),
+            "last": float(self._last[slot]),
+        }
+
+    def observe(self, symbols: Sequence[str], prices: Sequence[float]) -> None:
+        """추적 중인 종목의 최근가만 갱신한다. 나머지 종목은 무시한다."""
+
+        slots = self._slots
+        if not slots:
+            return
+        idx = [slots.get(symbol, -1) for symbol in symbols]
+        idx_arr = np.fromiter(idx, dtype=np.intp, count=len(idx))
+        keep = idx_arr >= 0
+        if keep.all():
+            self._last[idx_arr] = prices
+        elif keep.any():
+            self._last[idx_arr[keep]] = np.asarray(prices, dtype=np.float64)[keep]
+
+    def evaluate(self, now: Optional[float] = None) -> List[ExitSignal]:
+        """모든 슬롯을 한 번에 평가해 청산할 포지션을 추적 목록에서 떼어 반환한다."""
+
+        if not self._slots:
+            return []
+        now = self._clock() if now is None else now
+        last = self._last
+        active = self._active & (now >= self._retry_at)
+        tp_hit = active & (last >= self._tp)
+        sl_hit = active & (last <= self._sl)
+        timed = active & (now >= self._deadline)
+        triggered = np.flatnonzero(tp_hit | sl_hit | timed)
+        signals: List[ExitSignal] = []
+        for slot in triggered.tolist():
+            # 한 틱에 SL과 TP가 같이 걸릴 수는 없지만, 보수적으로 SL을 먼저 본다.
+            reason = STOP_LOSS if sl_hit[slot] else TAKE_PROFIT if tp_hit[slot] else TIME_STOP
+            signals.append(self._detach(slot, reason, now))
+        return signals
+
+    def _detach(self, slot: int, reason: str, now: float) -> ExitSignal:
+        symbol = self._symbols[slot]
+        signal = ExitSignal(
+            symbol=symbol,
+            qty=float(self._qty[slot]),
+            entry_price=float(self._entry[slot]),
+            exit_price=float(self._last[slot]),
+            reason=reason,
+            arm=self._arms[slot],
+            opened_at=float(self._opened[slot]),
+            triggered_at=now,
+            tp_price=float(self._tp[slot]),
+            sl_price=float(self._sl[slot]),
+            deadline=float(self._deadline[slot]),
+            decision=self._decisions[slot],
+            attempts=int(self._attempts[slot]),
+        )
+        self._active[slot] = False
+        self._symbols[slot] = None
+        self._arms[slot] = None
+        self._decisions[slot] = None
+        del self._slots[symbol]
+        self._free.append(slot)
+        return signal
+
+    def on_prices(self, symbols: Sequence[str], prices: Sequence[float], now: Optional[float] = None) -> List[ExitSignal]:
+        """가격 묶음을 반영·평가하고 청산 주문을 백그라운드 태스크로 보낸다."""
+
+        self.observe(symbols, prices)
+        signals = self.evaluate(now)
+        for signal in signals:
+            task = asyncio.create_task(self.execute(signal), name=f"exit-{signal.symbol}")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return signals
+
+    async def execute(self, signal: ExitSignal) -> Optional[ClosedTrade]:
+        """청산 주문을 내고 손익·보상을 반영한다. 주문이 실패하면 포지션을 다시 추적한다."""
+
+        try:
+            payload = await self._router.submit_close(signal.symbol, signal.qty, reason=signal.reason)
+        except Exception as exc:
+            await self._rearm(signal, exc)
+            return None
+        fill = payload.get("fill_price") if isinstance(payload, dict) else None
+        exit_price = float(fill) if fill is not None else signal.exit_price
+        pnl = (exit_price - signal.entry_price) * signal.qty
+        fees = self.fee_per_share * signal.qty * 2
+        reward = compute_reward(
+            TradeOutcome(
+                realized=pnl, unrealized=0.0, fees=fees, slippage=0.0, holding_time=signal.triggered_at - signal.opened_at
+            )
+        )
+        await self._risk.register_fill(pnl - fees)
+        policy = self._policy
+        if policy is not None and not _arm_of(policy, signal.arm):
+            # 체크포인트 복원 후 그리드가 바뀌어 현재 밴딧에 없는 팔이다.
+            logger.info("Skipping bandit update for %s: arm is not in the current grid", signal.symbol)
+        elif policy is not None:
+            try:
+                policy.update(signal.decision if signal.decision is not None else signal.arm, reward)
+            except ValueError as exc:
+                # LinearBandit은 진입 컨텍스트 없이 갱신할 수 없다.
+                logger.warning("Skipping bandit update for %s: %s", signal.symbol, exc)
+        EXITS.labels(signal.reason).inc()
+        closed = ClosedTrade(signal, exit_price, pnl, reward, payload)
+        for listener in self._listeners:
+            try:
+                maybe = listener(closed)
+                if inspect.isawaitable(maybe):
+                    await maybe
+            except Exception as exc:  # pragma: no cover - 콜백 오류는 기록만 한다
+                logger.error("Exit callback failed: %s", exc)
+        return closed
+
+    async def _rearm(self, signal: ExitSignal, exc: BaseException) -> None:
+        """실패한 청산의 브래킷을 다시 걸고 지수 백오프 후에 재시도하게 한다."""
+
+        if signal.symbol in self._slots:
+            return
+        attempts = signal.attempts + 1
+        slot = self._insert(
+            signal.symbol,
+            signal.qty,
+            signal.entry_price,
+            signal.arm,
+            tp=signal.tp_price,
+            sl=signal.sl_price,
+            deadline=signal.deadline,
+            opened=signal.opened_at,
+            decision=signal.decision,
+        )
+        self._last[slot] = signal.exit_price
+        self._attempts[slot] = attempts
+        if attempts < self.max_retries:
+            delay = min(self.retry_base * 2.0 ** (attempts - 1), self.retry_max)
+            self._retry_at[slot] = self._clock() + delay
+            EXIT_FAILURES.labels("retry").inc()
+            logger.warning(
+                "Exit order for %s failed (attempt %d/%d), retrying in %.1fs: %s",
+                signal.symbol,
+                attempts,
+                self.max_retries,
+                delay,
+                exc,
+            )
+            return
+        self._retry_at[slot] = np.inf
+        EXIT_FAILURES.labels("stuck").inc()
+        logger.critical(
+            "Exit order for %s failed %d times; bracket parked until retry(): %s", signal.symbol, attempts, exc
+        )
+        if self.halt_on_stuck:
+            await self._risk.toggle_trading(False)
+
+    @property
+    def stuck(self) -> List[str]:
+        """재시도 한도를 넘겨 자동 청산이 멈춘 종목."""
+
+        return [symbol for symbol, slot in self._slots.items() if self._attempts[slot] >= self.max_retries]
+
+    def retry(self, symbol: str) -> None:
+        """``symbol`` 브래킷의 실패 횟수와 대기 시각을 초기화해 다음 평가에서 다시 청산을 시도한다."""
+
+        slot = self._slots[symbol]
+        self._attempts[slot] = 0
+        self._retry_at[slot] = 0.0
+
+    async def run(self, interval: float = 1.0) -> None:
+        """새 가격이 없어도 타임스톱이 지나도록 주기적으로 평가한다."""
+
+        while True:
+            await asyncio.sleep(interval)
+            self.on_prices((), ())
+
+    async def drain(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def export_state(self) -> Dict[str, np.ndarray]:
+        """열린 브래킷의 체크포인트 뷰."""
+
+        symbols = list(self._slots)
+        slots = np.array([self._slots[symbol] for symbol in symbols], dtype=np.intp)
+        decisions = [self._decisions[slot] for slot in slots.tolist()]
+        contexts = np.full((len(slots), len(CONTEXT_FEATURES)), np.nan)
+        probabilities = np.full(len(slots), np.nan)
+        for row, decision in enumerate(decisions):
+            if decision is not None:
+                probabilities[row] = decision.probability
+                if decision.context is not None:
+                    contexts[row] = decision.context
+        arms = [self._arms[slot] for slot in slots.tolist()]
+        return {
+            "symbols": np.array(symbols, dtype=str),
+            "qty": self._qty[slots],
+            "entry": self._entry[slots],
+            "tp": self._tp[slots],
+            "sl": self._sl[slots],
+            "deadline": self._deadline[slots],
+            "opened": self._opened[slots],
+            "last": self._last[slots],
+            "retry_at": self._retry_at[slots],
+            "attempts": self._attempts[slots],
+            "arms": np.array([(arm.tp, arm.sl_atr, arm.tstop_min) for arm in arms], dtype=np.float64).reshape(-1, 3),
+            "contexts": contexts,
+            "probabilities": probabilities,
+        }
+
+    def import_state(self, state: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> None:
+        """체크포인트의 브래킷을 다시 건다. 팔은 현재 밴딧에서 같은 TP/SL/타임스톱을 찾는다.
+
+        현재 그리드에 없는 팔이면 독립 :class:`BanditArm`으로 브래킷만 복원하고
+        결정은 ``None``으로 두며, 청산 때 밴딧 갱신을 건너뛴다.
+        """
+
+        known: Dict[tuple, BanditArm] = {}
+        if self._policy is not None:
+            known = {(arm.tp, arm.sl_atr, arm.tstop_min): arm for arm in self._policy.bandit.arms}
+        restored = 0
+        for row, symbol in enumerate(state["symbols"].tolist()):
+            if symbol in self._slots:
+                continue
+            tp, sl_atr, tstop = state["arms"][row].tolist()
+            arm = known.get((tp, sl_atr, tstop))
+            decision = None
+            probability = float(state["probabilities"][row])
+            if arm is None:
+                # 그리드가 바뀌었다. 브래킷만 다시 걸고 결정은 버려 엉뚱한 팔에 보상이 가지 않게 한다.
+                arm = BanditArm(tp, sl_atr, int(tstop))
+            elif not np.isnan(probability):
+                context = state["contexts"][row]
+                decision = PolicyDecision(
+                    arm=arm, probability=probability, context=None if np.isnan(context).any() else context.copy()
+                )
+            slot = self._insert(
+                symbol,
+                float(state["qty"][row]),
+                float(state["entry"][row]),
+                arm,
+                tp=float(state["tp"][row]),
+                sl=float(state["sl"][row]),
+                deadline=float(state["deadline"][row]),
+                opened=float(state["opened"][row]),
+                decision=decision,
+            )
+            self._last[slot] = state["last"][row]
+            self._retry_at[slot] = state["retry_at"][row]
+            self._attempts[slot] = state["attempts"][row]
+            restored += 1
+        logger.info("Restored %d exit brackets", restored)
+
+
+def _arm_of(policy: PolicyController, arm: Optional[BanditArm]) -> bool:
+    """``arm``이 ``policy`` 밴딧의 팔(같은 배열을 보는 뷰)인지."""
+
+    if arm is None:
+        return False
+    arms = policy.bandit.arms
+    return 0 <= arm.index < len(arms) and arms[arm.index] is arm
@@ -0,0 +1,228 @@
+"""Linear contextual bandit (linear Thompson sampling / LinUCB) over the TP/SL/TimeStop grid.
+
+Each arm keeps a ridge-regression posterior over rewards given the context
+vector ``x`` from :func:`build_context`. The posterior is stored as the
+inverse design matrix ``A⁻¹`` and ``b = Σ r·x``. A new observation is
+folded in with the Sherman–Morrison identity::
+
+    A⁻¹ ← A⁻¹ - (A⁻¹x)(A⁻¹x)ᵀ / (1 + xᵀA⁻¹x)
+
+so an update costs O(d²) and no matrix is ever re-inverted. All arm means
+for a context come from one product ``θ @ x``.
+
+Selection probabilities are real propensities. :meth:`LinearBandit.probabilities`
+estimates the chance that each arm wins a Thompson draw (or is the UCB argmax),
+mixes in ``epsilon`` uniform exploration, and :meth:`LinearBandit.select` then
+samples the arm from exactly that distribution. The logged probability is
+therefore the probability the policy actually used.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .bandit import BanditArm, arm_grid, grid_matches
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_FEATURES: Tuple[str, ...] = ("bias", "ret_5s", "ret_15s", "vol_spike", "time_of_day", "atr")
+
+_NEW_YORK = ZoneInfo("America/New_York")
+_SESSION_OPEN_MIN = 9 * 60 + 30
+_SESSION_MINUTES = 390.0
+
+
+def time_of_day(ts: float) -> float:
+    """Fraction of the regular US session elapsed at epoch ``ts``, clipped to [0, 1]."""
+
+    local = dt.datetime.fromtimestamp(ts, _NEW_YORK)
+    minutes = local.hour * 60 + local.minute + local.second / 60.0 - _SESSION_OPEN_MIN
+    return min(max(minutes / _SESSION_MINUTES, 0.0), 1.0)
+
+
+def build_context(features: Mapping[str, float], ts: Optional[float] = None) -> np.ndarray:
+    """Context vector in :data:`CONTEXT_FEATURES` order.
+
+    ``time_of_day`` is taken from ``features`` when present, otherwise derived
+    from ``ts``. The ``atr`` column is ATR relative to price (the ``atr_pct``
+    feature) so it is comparable across symbols. Missing or NaN features
+    become 0.
+    """
+
+    tod = features.get("time_of_day")
+    if tod is None:
+        tod = time_of_day(ts) if ts is not None else 0.0
+    values = (
+        1.0,
+        features.get("ret_5s", 0.0),
+        features.get("ret_15s", 0.0),
+        features.get("vol_spike", 0.0),
+        tod,
+        features.get("atr_pct", 0.0),
+    )
+    x = np.array(values, dtype=np.float64)
+    return np.nan_to_num(x, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+@dataclass
+class LinearDecision:
+    arm: BanditArm
+    index: int
+    probability: float
+    probabilities: np.ndarray
+
+
+class LinearBandit:
+    """Per-arm Bayesian linear regression with Thompson or UCB selection.
+
+    ``method="thompson"`` samples each arm's score from
+    ``N(θₖ·x, v²·xᵀAₖ⁻¹x)``. ``method="ucb"`` scores arms with
+    ``θₖ·x + v·sqrt(xᵀAₖ⁻¹x)``. ``ridge`` is the prior precision ``λ`` in
+    ``A = λI + Σ xxᵀ``. ``n_samples`` sets how many Thompson draws estimate the
+    selection probabilities.
+    """
+
+    def __init__(
+        self,
+        tp_choices: Sequence[float],
+        sl_choices: Sequence[float],
+        tstop_choices: Sequence[int],
+        *,
+        n_features: int = len(CONTEXT_FEATURES),
+        method: str = "thompson",
+        v: float = 1.0,
+        ridge: float = 1.0,
+        epsilon: float = 0.0,
+        n_samples: int = 256,
+        seed: Optional[int] = None,
+    ) -> None:
+        if method not in ("thompson", "ucb"):
+            raise ValueError(f"Unknown method: {method}")
+        if ridge <= 0:
+            raise ValueError("ridge must be positive")
+        grid = [(tp, sl, tstop) for tp in tp_choices for sl in sl_choices for tstop in tstop_choices]
+        n_arms = len(grid)
+        self.method = method
+        self.v = v
+        self.epsilon = epsilon
+        self.n_samples = n_samples
+        self.n_features = n_features
+        self._rng = np.random.default_rng(seed)
+        self._a_inv = np.repeat(np.eye(n_features)[None] / ridge, n_arms, axis=0)
+        self._b = np.zeros((n_arms, n_features))
+        self._theta = np.zeros((n_arms, n_features))
+        self._counts = np.zeros(n_arms)
+        self._successes = np.ones(n_arms)
+        self._trials = np.full(n_arms, 2.0)
+        # BanditArm views keep the router/PolicyController interface; their
+        # Beta counters are informational here.
+        self.arms: List[BanditArm] = [
+            BanditArm._view(tp, sl, tstop, self._successes, self._trials, index)
+            for index, (tp, sl, tstop) in enumerate(grid)
+        ]
+        self._grid = arm_grid(self.arms)
+
+    @property
+    def theta(self) -> np.ndarray:
+        """(arms, d) posterior means."""
+
+        return self._theta
+
+    @property
+    def a_inv(self) -> np.ndarray:
+        """(arms, d, d) inverse design matrices."""
+
+        return self._a_inv
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts
+
+    def _moments(self, contexts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(n, arms) score means and standard deviations for (n, d) contexts."""
+
+        means = contexts @ self._theta.T
+        variances = np.einsum("nd,kde,ne->nk", contexts, self._a_inv, contexts)
+        return means, np.sqrt(np.maximum(variances, 0.0))
+
+    def _greedy_probabilities(self, means: np.ndarray, stds: np.ndarray) -> np.ndarray:
+        n, n_arms = means.shape
+        if self.method == "ucb":
+            winners = (means + self.v * stds).argmax(axis=1)
+            probs = np.zeros((n, n_arms))
+            probs[np.arange(n), winners] = 1.0
+            return probs
+        m = self.n_samples
+        draws = means[:, None, :] + self.v * stds[:, None, :] * self._rng.standard_normal((n, m, n_arms))
+        winners = draws.argmax(axis=2)
+        probs = np.zeros((n, n_arms))
+        np.add.at(probs, (np.repeat(np.arange(n), m), winners.ravel()), 1.0 / m)
+        return probs
+
+    def probabilities_many(self, contexts: np.ndarray) -> np.ndarray:
+        """(n, arms) selection probabilities, including ``epsilon`` exploration."""
+
+        contexts = np.atleast_2d(np.asarray(contexts, dtype=np.float64))
+        means, stds = self._moments(contexts)
+        probs = self._greedy_probabilities(means, stds)
+        if self.epsilon:
+            probs = (1.0 - self.epsilon) * probs + self.epsilon / len(self.arms)
+        return probs
+
+    def probabilities(self, context: np.ndarray) -> np.ndarray:
+        return self.probabilities_many(context)[0]
+
+    def select_many(self, contexts: np.ndarray) -> List[LinearDecision]:
+        probs = self.probabilities_many(contexts)
+        cumulative = probs.cumsum(axis=1)
+        u = self._rng.random(len(probs))[:, None] * cumulative[:, -1:]
+        chosen = np.minimum((cumulative <= u).sum(axis=1), len(self.arms) - 1)
+        return [
+            LinearDecision(self.arms[k], k, float(p[k]), p)
+            for k, p in zip(chosen.tolist(), probs)
+        ]
+
+    def select(self, context: np.ndarray) -> LinearDecision:
+        return self.select_many(context)[0]
+
+    def export_state(self) -> Dict[str, np.ndarray]:
+        return {
+            "a_inv": self._a_inv,
+            "b": self._b,
+            "counts": self._counts,
+            "successes": self._successes,
+            "trials": self._trials,
+            "grid": self._grid,
+        }
+
+    def import_state(self, state: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> None:
+        if not grid_matches(self.arms, state, "LinearBandit"):
+            return
+        if state["a_inv"].shape != self._a_inv.shape:
+            logger.warning("LinearBandit checkpoint has %s features, expected %s; starting fresh", state["a_inv"].shape[-1], self.n_features)
+            return
+        self._a_inv[:] = state["a_inv"]
+        self._b[:] = state["b"]
+        self._counts[:] = state["counts"]
+        self._successes[:] = state["successes"]
+        self._trials[:] = state["trials"]
+        self._theta[:] = np.einsum("kde,ke->kd", self._a_inv, self._b)
+
+    def update(self, arm: BanditArm, reward: float, context: np.ndarray) -> None:
+        """Fold one observed ``reward`` for ``arm`` at ``context`` into its posterior."""
+
+        k = arm.index
+        x = np.asarray(context, dtype=np.float64)
+        a_inv = self._a_inv[k]
+        ax = a_inv @ x
+        a_inv -= np.outer(ax, ax) / (1.0 + x @ ax)
+        self._b[k] += reward * x
+        self._theta[k] = a_inv @ self._b[k]
+        self._counts[k] += 1
+        arm.successes += 1 if reward > 0 else 0.1
+        arm.trials += 1
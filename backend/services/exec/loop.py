@@ -3,43 +3,192 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, AsyncIterator, Dict
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple, Union
 
-from ..signal.surge import SurgeDetector
+from ...core.latency import TRACER
+from ...core.metrics import REGISTRY, ensure_loop_lag_monitor
+from ..aiopt.policy_bandit import PolicyController, PolicyDecision
+from ..aiopt.registry import ModelSlot
+from ..signal.surge import SurgeDetector, SurgeSignal
 from .bandit import ContextualBandit
+from .dispatch import OrderDispatcher, OrderOutcome, OutcomeCallback
+from .entry_gate import EntryGate
+from .exits import ClosedTrade, ExitManager
+from .linear_bandit import LinearBandit
 from .router import OrderRouter
 
 logger = logging.getLogger(__name__)
 
+EVENTS = REGISTRY.counter("strategy_events_total", "Trade events scored by StrategyLoop.")
+ENTRIES = REGISTRY.counter("strategy_entry_signals_total", "Events that passed the surge entry rule.")
+
 
 class StrategyLoop:
+    """신호 스트림을 소비해 진입 주문을 :class:`OrderDispatcher`로 넘긴다.
+
+    주문 제출은 백그라운드 태스크에서 진행되므로 브로커 응답을 기다리는
+    동안에도 틱 소비가 멈추지 않는다. 진입 신호는 밴딧보다 먼저
+    :class:`EntryGate`에서 진행 중 주문·보유 포지션·쿨다운을 확인한다.
+    포지션을 청산하면 :meth:`position_closed`로 알려야 한다.
+
+    ``model``에 :class:`~..aiopt.registry.ModelSlot`을 주면 진입 신호마다
+    슬롯의 현재 모델로 확률을 매기고, 사용한 버전과 점수를 신호와
+    :attr:`signal_log`에 남긴다. ``model_threshold``가 있으면 그 미만은
+    진입하지 않는다. 피처 순서는 ``model_features`` 또는 모델 메타데이터의
+    ``features``를 따른다.
+
+    ``exits``에 :class:`~.exits.ExitManager`를 주면 체결된 진입을 브래킷으로
+    등록하고, 매 체결 이벤트 가격으로 TP·SL·타임스톱을 평가한다. 청산이 끝나면
+    진입 게이트에 자동으로 알린다.
+
+    팔은 :class:`~..aiopt.policy_bandit.PolicyController`로 고르므로 진입마다
+    컨텍스트·팔·선택 확률이 결정 로그(:attr:`policy` ``.log``)에 남고, 청산 때
+    보상이 같은 행에 채워져 오프폴리시 평가에 쓰인다. ``policy``를 주지 않으면
+    ``exits``의 컨트롤러를, 그것도 없으면 ``bandit``에 로그를 단 새 컨트롤러를 쓴다.
+    """
+
     def __init__(
         self,
         signal_stream: AsyncIterator[Dict[str, Any]],
         router: OrderRouter,
-        bandit: ContextualBandit,
+        bandit: Union[ContextualBandit, LinearBandit],
         surge_detector: SurgeDetector,
+        *,
+        max_in_flight: int = 8,
+        on_outcome: Optional[OutcomeCallback] = None,
+        entry_cooldown: float = 60.0,
+        model: Optional[ModelSlot] = None,
+        model_features: Optional[Sequence[str]] = None,
+        model_threshold: Optional[float] = None,
+        signal_log_size: int = 1_000,
+        exits: Optional[ExitManager] = None,
+        policy: Optional[PolicyController] = None,
     ) -> None:
         self._signal_stream = signal_stream
         self._router = router
         self._bandit = bandit
         self._surge = surge_detector
+        self._gate = EntryGate(entry_cooldown)
+        self._on_outcome = on_outcome
+        self._dispatcher = OrderDispatcher(router, max_in_flight=max_in_flight, on_outcome=self._handle_outcome)
+        self._model = model
+        self._model_features = tuple(model_features) if model_features is not None else None
+        self._model_threshold = model_threshold
+        self._signal_log: Deque[Dict[str, Any]] = deque(maxlen=signal_log_size)
+        self._exits = exits
+        if policy is None:
+            policy = exits.policy if exits is not None and exits.policy is not None else PolicyController.with_log(bandit)
+        self._policy = policy
+        # 주문이 진행 중인 종목의 (진입 결정, ATR). 체결되면 브래킷 등록에 쓴다.
+        self._pending_entries: Dict[str, Tuple[PolicyDecision, Optional[float]]] = {}
+        if exits is not None:
+            exits.add_listener(self._handle_closed)
         self._running = False
 
+    @property
+    def dispatcher(self) -> OrderDispatcher:
+        return self._dispatcher
+
+    @property
+    def policy(self) -> PolicyController:
+        return self._policy
+
+    @property
+    def gate(self) -> EntryGate:
+        return self._gate
+
+    @property
+    def signal_log(self) -> List[Dict[str, Any]]:
+        """최근 진입 신호와 그 신호를 채점한 모델 버전."""
+
+        return list(self._signal_log)
+
+    def _score_with_model(self, signal: SurgeSignal) -> bool:
+        # 슬롯을 한 번만 읽어 교체가 끼어들어도 버전과 점수가 어긋나지 않게 한다.
+        loaded = self._model.current if self._model is not None else None
+        if loaded is not None and loaded.kind == "signal":
+            names = self._model_features or loaded.metadata.get("features", ())
+            row = [float(signal.features.get(name, 0.0)) for name in names]
+            signal.model_version = loaded.version
+            signal.model_score = loaded.model.predict_one(row)
+        self._signal_log.append(
+            {
+                "ts": time.time(),
+                "symbol": signal.symbol,
+                "score": signal.score,
+                "model_version": signal.model_version,
+                "model_score": signal.model_score,
+            }
+        )
+        threshold = self._model_threshold
+        return threshold is None or signal.model_score is None or signal.model_score >= threshold
+
+    def _select_arm(self, signal: SurgeSignal, event: Dict[str, Any]) -> PolicyDecision:
+        return self._policy.choose(signal.features, event.get("ts"))
+
+    def position_closed(self, symbol: str) -> None:
+        self._gate.on_exit(symbol)
+
+    def _handle_closed(self, trade: ClosedTrade) -> None:
+        self.position_closed(trade.signal.symbol)
+
+    def _handle_outcome(self, outcome: OrderOutcome) -> Any:
+        self._gate.on_outcome(outcome.symbol, outcome.ok)
+        decision, atr = self._pending_entries.pop(outcome.symbol, (None, None))
+        if self._exits is not None and outcome.ok and outcome.price is not None:
+            fill = outcome.result.get("fill_price") if isinstance(outcome.result, dict) else None
+            entry_price = float(fill) if fill is not None else outcome.price
+            self._exits.open(outcome.symbol, outcome.qty, entry_price, outcome.arm, atr=atr, decision=decision)
+        if self._on_outcome is not None:
+            return self._on_outcome(outcome)
+        return None
+
     async def run(self) -> None:
         self._running = True
+        ensure_loop_lag_monitor("strategy")
+        events_metric = EVENTS.labels()
+        entries_metric = ENTRIES.labels()
+        dispatcher = self._dispatcher
+        if self._exits is not None:
+            # 체크포인트에서 복원된 브래킷은 보유 포지션이므로 같은 종목 재진입을 막는다.
+            for symbol in self._exits.symbols:
+                self._gate.mark_open(symbol)
+        try:
+            await self._consume(events_metric, entries_metric, dispatcher)
+        finally:
+            await dispatcher.drain()
+            if self._exits is not None:
+                await self._exits.drain()
+
+    async def _consume(self, events_metric: Any, entries_metric: Any, dispatcher: OrderDispatcher) -> None:
+        gate = self._gate
+        exits = self._exits
         async for event in self._signal_stream:
             if not self._running:
                 break
             if event.get("type") != "trade":
                 continue
+            events_metric.inc()
+            if exits is not None and len(exits) and event.get("price") is not None:
+                exits.on_prices((event["symbol"],), (event["price"],))
+            trace = event.get("trace")
+            TRACER.mark(trace, "strategy_recv")
             signal = self._surge.score(event["symbol"], event.get("features", {}))
+            TRACER.mark(trace, "score")
             if not self._surge.is_entry(signal):
                 continue
-            arm = self._bandit.select()
-            result = await self._router.submit_entry(signal.symbol, "BUY", 1, arm)
-            if result:
-                logger.info("Submitted order %s", result)
+            entries_metric.inc()
+            if not self._score_with_model(signal):
+                continue
+            if not gate.allow(signal.symbol) or not dispatcher.accepts(signal.symbol):
+                continue
+            decision = self._select_arm(signal, event)
+            if dispatcher.submit(signal.symbol, "BUY", 1, decision.arm, price=event.get("price"), trace=trace):
+                gate.on_dispatch(signal.symbol)
+                if exits is not None:
+                    self._pending_entries[signal.symbol] = (decision, signal.features.get("atr"))
 
     async def stop(self) -> None:
         self._running = False
@@ -1,12 +1,53 @@
-"""Risk guardrails protecting the strategy from runaway losses."""
+"""Risk guardrails protecting the strategy from runaway losses.
+
+Pre-trade checks read an immutable :class:`RiskSnapshot` of the scalar state
+and take no lock. Every mutation builds a new snapshot and swaps it in with a
+single reference assignment. Per-symbol exposure lives in a separate dict so
+a write does not copy every symbol. The writer only ever replaces one value at
+a time, so a reader sees either the old float or the new one. All writers run
+on the strategy's event loop, and none of them awaits between reading and
+publishing, so there is exactly one writer at a time.
+:meth:`RiskManager.try_open` therefore checks and reserves exposure in one
+synchronous step, and no other coroutine can slip in between.
+
+Limits (:class:`RiskLimits`) cover:
+
+- max order size, in quantity and notional
+- per-symbol and gross notional exposure
+- a per-symbol order-rate token bucket
+- buying power against the cached broker cash (:meth:`RiskManager.update_cash`)
+"""
 from __future__ import annotations
 
-import asyncio
 import logging
-from dataclasses import dataclass
+import math
+import time
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from ...core.metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+OPEN_POSITIONS = REGISTRY.gauge("risk_open_positions", "Open positions tracked by RiskManager.")
+DAILY_LOSS = REGISTRY.gauge("risk_daily_loss", "Realised daily loss (non-positive).")
+TRADING_ENABLED = REGISTRY.gauge("risk_trading_enabled", "1 when new entries are allowed.")
+GROSS_NOTIONAL = REGISTRY.gauge("risk_gross_notional", "Gross notional exposure reserved by RiskManager.")
+REJECTS = REGISTRY.counter("risk_rejects_total", "Pre-trade checks rejected by reason.", ("reason",))
+
+TRADING_DISABLED = "trading_disabled"
+DRAWDOWN = "drawdown"
+MAX_POSITIONS = "max_positions"
+ORDER_QTY = "order_qty"
+ORDER_NOTIONAL = "order_notional"
+SYMBOL_NOTIONAL = "symbol_notional"
+GROSS_NOTIONAL_LIMIT = "gross_notional"
+ORDER_RATE = "order_rate"
+BUYING_POWER = "buying_power"
+
 
 @dataclass
 class RiskState:
@@ -15,43 +56,311 @@ class RiskState:
     trading_enabled: bool = True
 
 
+@dataclass(frozen=True)
+class RiskLimits:
+    """Pre-trade limits. ``inf`` (the default) disables a limit.
+
+    ``order_rate`` is the refill rate of each symbol's token bucket in orders
+    per second, and ``order_burst`` is its capacity.
+    """
+
+    max_order_qty: float = math.inf
+    max_order_notional: float = math.inf
+    max_symbol_notional: float = math.inf
+    max_gross_notional: float = math.inf
+    order_rate: float = math.inf
+    order_burst: float = 1.0
+
+
+@dataclass(frozen=True)
+class RiskSnapshot:
+    daily_loss: float = 0.0
+    positions: int = 0
+    trading_enabled: bool = True
+    gross_notional: float = 0.0
+    # Cash reported by the broker (None until first update) and notional of
+    # entries it does not reflect yet: unfilled orders and fills since that report.
+    cash: Optional[float] = None
+    reserved_cash: float = 0.0
+
+
 class RiskManager:
-    def __init__(self, max_drawdown: float, max_positions: int) -> None:
-        self.state = RiskState()
+    # Same-session loss and halt state must survive an outage longer than the checkpoint max_age.
+    restore_stale = True
+
+    def __init__(
+        self,
+        max_drawdown: float,
+        max_positions: int,
+        *,
+        limits: Optional[RiskLimits] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.max_drawdown = max_drawdown
         self.max_positions = max_positions
-        self._lock = asyncio.Lock()
+        self.limits = limits or RiskLimits()
+        self._clock = clock
+        self._snap = RiskSnapshot()
+        self._exposure: Dict[str, float] = {}
+        # symbol -> notional reserved by each open position, so release frees exactly what try_open took.
+        self._reservations: Dict[str, List[float]] = {}
+        # symbol -> notional of entries whose order has not filled; they stay in reserved_cash until filled or released.
+        self._unfilled: Dict[str, List[float]] = {}
+        # Notional filled since the last update_cash; the next cash report already reflects it.
+        self._filled_cash = 0.0
+        # symbol -> [tokens, last refill time]; mutated only by the writer in try_open.
+        self._buckets: Dict[str, List[float]] = {}
+        TRADING_ENABLED.set(1.0)
+
+    @property
+    def current(self) -> RiskSnapshot:
+        return self._snap
+
+    @property
+    def symbol_notional(self) -> Mapping[str, float]:
+        """Read-only view of reserved notional per symbol."""
+
+        return MappingProxyType(self._exposure)
+
+    @property
+    def state(self) -> RiskState:
+        snap = self._snap
+        return RiskState(daily_loss=snap.daily_loss, positions=snap.positions, trading_enabled=snap.trading_enabled)
+
+    def _publish(self, **changes: Any) -> RiskSnapshot:
+        snap = self._snap = replace(self._snap, **changes)
+        return snap
+
+    # -- read path -----------------------------------------------------------------
+
+    def _global_reason(self, snap: RiskSnapshot) -> Optional[str]:
+        if not snap.trading_enabled:
+            return TRADING_DISABLED
+        if -snap.daily_loss >= self.max_drawdown:
+            return DRAWDOWN
+        if snap.positions >= self.max_positions:
+            return MAX_POSITIONS
+        return None
+
+    def check(self, symbol: str, qty: float, price: Optional[float] = None) -> Optional[str]:
+        """Return the first violated limit for a ``qty`` entry in ``symbol``, or ``None``.
+
+        Lock-free and side-effect free. Notional limits apply only when ``price``
+        is known.
+        """
+
+        snap = self._snap
+        reason = self._global_reason(snap)
+        if reason is not None:
+            return reason
+        limits = self.limits
+        if qty > limits.max_order_qty:
+            return ORDER_QTY
+        if price is not None:
+            notional = qty * price
+            if notional > limits.max_order_notional:
+                return ORDER_NOTIONAL
+            if self._exposure.get(symbol, 0.0) + notional > limits.max_symbol_notional:
+                return SYMBOL_NOTIONAL
+            if snap.gross_notional + notional > limits.max_gross_notional:
+                return GROSS_NOTIONAL_LIMIT
+            if snap.cash is not None and notional > snap.cash - snap.reserved_cash:
+                return BUYING_POWER
+        if limits.order_rate != math.inf and self._tokens(symbol, self._clock()) < 1.0:
+            return ORDER_RATE
+        return None
+
+    def _tokens(self, symbol: str, now: float) -> float:
+        bucket = self._buckets.get(symbol)
+        if bucket is None:
+            return self.limits.order_burst
+        return min(self.limits.order_burst, bucket[0] + (now - bucket[1]) * self.limits.order_rate)
+
+    # -- write path (event loop only) -----------------------------------------------
+
+    def try_open(self, symbol: str, qty: float, price: Optional[float] = None) -> Optional[str]:
+        """Check and, if allowed, reserve a position slot, exposure and an order token.
+
+        Returns the rejection reason, or ``None`` once the entry is reserved. Undo
+        a reservation whose order never reached the broker with :meth:`release`.
+        """
+
+        reason = self.check(symbol, qty, price)
+        if reason is not None:
+            REJECTS.labels(reason).inc()
+            return reason
+        if self.limits.order_rate != math.inf:
+            now = self._clock()
+            self._buckets[symbol] = [self._tokens(symbol, now) - 1.0, now]
+        snap = self._snap
+        reservations = self._reservations.get(symbol)
+        if reservations is None:
+            reservations = self._reservations[symbol] = []
+        self._unfilled.setdefault(symbol, []).append(0.0 if price is None else qty * price)
+        if price is None:
+            reservations.append(0.0)
+            self._snap = replace(snap, positions=snap.positions + 1)
+        else:
+            notional = qty * price
+            reservations.append(notional)
+            exposure = self._exposure
+            exposure[symbol] = exposure.get(symbol, 0.0) + notional
+            self._snap = replace(
+                snap,
+                positions=snap.positions + 1,
+                gross_notional=snap.gross_notional + notional,
+                reserved_cash=snap.reserved_cash + notional,
+            )
+            GROSS_NOTIONAL.set(snap.gross_notional + notional)
+        OPEN_POSITIONS.set(snap.positions + 1)
+        return None
+
+    def release(self, symbol: str) -> float:
+        """Free one position slot in ``symbol`` and exactly the notional its entry reserved.
+
+        Used both for exits and for entries whose order never reached the
+        broker or was cancelled. An unfilled entry also frees its reserved
+        cash; a filled one's cash is settled by :meth:`update_cash`. Returns
+        the released notional.
+        """
+
+        snap = self._snap
+        reservations = self._reservations.get(symbol)
+        notional = reservations.pop() if reservations else 0.0
+        if reservations is not None and not reservations:
+            del self._reservations[symbol]
+        unfilled = self._unfilled.get(symbol)
+        cash_freed = unfilled.pop() if unfilled else 0.0
+        if unfilled is not None and not unfilled:
+            del self._unfilled[symbol]
+        if not notional:
+            self._snap = replace(snap, positions=max(0, snap.positions - 1))
+        else:
+            exposure = self._exposure
+            remaining = exposure.get(symbol, 0.0) - notional
+            if remaining > 1e-9:
+                exposure[symbol] = remaining
+            else:
+                exposure.pop(symbol, None)
+            gross = max(0.0, snap.gross_notional - notional)
+            self._snap = replace(
+                snap,
+                positions=max(0, snap.positions - 1),
+                gross_notional=gross,
+                reserved_cash=max(0.0, snap.reserved_cash - cash_freed),
+            )
+            GROSS_NOTIONAL.set(gross)
+        OPEN_POSITIONS.set(self._snap.positions)
+        return notional
+
+    def mark_filled(self, symbol: str) -> float:
+        """Record that the oldest unfilled entry in ``symbol`` filled and return its notional.
+
+        Its cash stays reserved until the next :meth:`update_cash`, whose
+        broker figure already includes the fill.
+        """
+
+        unfilled = self._unfilled.get(symbol)
+        if not unfilled:
+            return 0.0
+        notional = unfilled.pop(0)
+        if not unfilled:
+            del self._unfilled[symbol]
+        self._filled_cash += notional
+        return notional
+
+    def update_cash(self, cash: float) -> None:
+        """Cache the broker's available cash.
+
+        The report already reflects entries filled since the previous one, so
+        only their notional leaves ``reserved_cash``. Orders still in flight
+        stay reserved.
+        """
+
+        reserved = max(0.0, self._snap.reserved_cash - self._filled_cash)
+        self._filled_cash = 0.0
+        self._publish(cash=float(cash), reserved_cash=reserved)
 
     async def register_fill(self, pnl: float) -> None:
-        async with self._lock:
-            self.state.daily_loss = min(0.0, self.state.daily_loss + pnl)
-            logger.debug("Updated daily loss: %s", self.state.daily_loss)
-            if abs(self.state.daily_loss) >= self.max_drawdown:
-                self.state.trading_enabled = False
-                logger.warning("Trading disabled due to drawdown")
+        snap = self._publish(daily_loss=min(0.0, self._snap.daily_loss + pnl))
+        logger.debug("Updated daily loss: %s", snap.daily_loss)
+        DAILY_LOSS.set(snap.daily_loss)
+        if abs(snap.daily_loss) >= self.max_drawdown and snap.trading_enabled:
+            self._publish(trading_enabled=False)
+            TRADING_ENABLED.set(0.0)
+            logger.warning("Trading disabled due to drawdown")
 
     async def register_position_change(self, delta: int) -> None:
-        async with self._lock:
-            self.state.positions += delta
-            logger.debug("Open positions: %s", self.state.positions)
+        snap = self._publish(positions=self._snap.positions + delta)
+        OPEN_POSITIONS.set(snap.positions)
+        logger.debug("Open positions: %s", snap.positions)
 
     async def can_open_new(self) -> bool:
-        async with self._lock:
-            return (
-                self.state.trading_enabled
-                and abs(self.state.daily_loss) < self.max_drawdown
-                and self.state.positions < self.max_positions
-            )
+        return self._global_reason(self._snap) is None
 
     async def toggle_trading(self, enabled: bool) -> None:
-        async with self._lock:
-            self.state.trading_enabled = enabled
-            logger.info("Trading toggled: %s", enabled)
+        self._publish(trading_enabled=enabled)
+        TRADING_ENABLED.set(1.0 if enabled else 0.0)
+        logger.info("Trading toggled: %s", enabled)
 
     async def snapshot(self) -> RiskState:
-        async with self._lock:
-            return RiskState(
-                daily_loss=self.state.daily_loss,
-                positions=self.state.positions,
-                trading_enabled=self.state.trading_enabled,
-            )
+        return self.state
+
+    def export_state(self) -> Dict[str, np.ndarray]:
+        """Checkpoint view of the state, read from the current snapshot."""
+
+        snap = self._snap
+        symbols = sorted(self._exposure)
+        reserved = sorted(self._reservations)
+        return {
+            "daily_loss": np.array(snap.daily_loss),
+            "positions": np.array(snap.positions),
+            "trading_enabled": np.array(snap.trading_enabled),
+            "symbols": np.array(symbols, dtype=str),
+            "symbol_notional": np.array([self._exposure[s] for s in symbols], dtype=np.float64),
+            # One row per open position, so a restore releases exactly what each entry reserved.
+            "reserved_symbols": np.array([s for s in reserved for _ in self._reservations[s]], dtype=str),
+            "reserved_notional": np.array([n for s in reserved for n in self._reservations[s]], dtype=np.float64),
+        }
+
+    def import_state(self, state: Mapping[str, np.ndarray], meta: Mapping[str, Any]) -> None:
+        """Restore a checkpoint at startup.
+
+        Daily loss and a drawdown halt only carry over within the same trading
+        session; a snapshot from a previous session restores positions and
+        exposure only. A stale snapshot (``meta["stale"]``) restores only the
+        same-session loss and halt, since its positions no longer match the
+        exit brackets, which are not restored from it.
+        """
+
+        same_session = meta.get("session") == meta.get("current_session")
+        stale = bool(meta.get("stale", False))
+        changes: Dict[str, Any] = {}
+        if not stale:
+            changes["positions"] = int(state["positions"])
+        if "symbols" in state and not stale:
+            self._exposure = dict(zip(state["symbols"].tolist(), state["symbol_notional"].tolist()))
+            # Restored positions are held, so none of their cash is still waiting on a fill.
+            self._unfilled = {}
+            if "reserved_symbols" in state:
+                self._reservations = {}
+                for symbol, notional in zip(state["reserved_symbols"].tolist(), state["reserved_notional"].tolist()):
+                    self._reservations.setdefault(symbol, []).append(notional)
+            else:
+                self._reservations = {symbol: [notional] for symbol, notional in self._exposure.items()}
+            changes["gross_notional"] = float(sum(self._exposure.values()))
+        if same_session:
+            changes.update(daily_loss=float(state["daily_loss"]), trading_enabled=bool(state["trading_enabled"]))
+        snap = self._publish(**changes)
+        OPEN_POSITIONS.set(snap.positions)
+        DAILY_LOSS.set(snap.daily_loss)
+        GROSS_NOTIONAL.set(snap.gross_notional)
+        TRADING_ENABLED.set(1.0 if snap.trading_enabled else 0.0)
+        logger.info(
+            "Restored risk state: daily_loss=%s positions=%s trading_enabled=%s (same session: %s, stale: %s)",
+            snap.daily_loss,
+            snap.positions,
+            snap.trading_enabled,
+            same_session,
+            stale,
+        )
@@ -6,25 +6,74 @@ import logging
 from typing import Dict, Optional
 
 from ...adapters.broker_base import Broker
+from ...core.latency import TRACER, Trace
+from ...core.metrics import REGISTRY
 from .bandit import BanditArm
 from .risk import RiskManager
 
 logger = logging.getLogger(__name__)
 
+ORDERS = REGISTRY.counter("orders_total", "Order submissions by outcome.", ("side", "result"))
+
 
 class OrderRouter:
     def __init__(self, broker: Broker, risk: RiskManager) -> None:
         self._broker = broker
         self._risk = risk
 
-    async def submit_entry(self, symbol: str, side: str, qty: float, arm: BanditArm) -> Optional[Dict[str, any]]:
-        if not await self._risk.can_open_new():
-            logger.info("Risk prevented new position")
+    async def submit_entry(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        arm: BanditArm,
+        *,
+        price: Optional[float] = None,
+        trace: Optional[Trace] = None,
+    ) -> Optional[Dict[str, any]]:
+        # 검사와 예약이 한 번에 일어나므로 동시에 진행 중인 다른 진입이 같은 한도를 통과하지 못한다.
+        reason = self._risk.try_open(symbol, qty, price)
+        TRACER.mark(trace, "risk")
+        if reason is not None:
+            ORDERS.labels(side, "risk_rejected").inc()
+            logger.info("Risk prevented new position in %s: %s", symbol, reason)
             return None
-        payload = await self._broker.place_order(symbol, side, qty, meta={"tp": arm.tp, "sl_atr": arm.sl_atr, "tstop": arm.tstop_min})
-        await self._risk.register_position_change(1)
+        try:
+            payload = await self._broker.place_order(
+                symbol, side, qty, meta={"tp": arm.tp, "sl_atr": arm.sl_atr, "tstop": arm.tstop_min}
+            )
+        except Exception:
+            self._risk.release(symbol)
+            ORDERS.labels(side, "error").inc()
+            raise
+        if isinstance(payload, dict) and payload.get("status") == "filled":
+            self._risk.mark_filled(symbol)
+        TRACER.mark(trace, "order")
+        TRACER.complete(trace)
+        ORDERS.labels(side, "submitted").inc()
         return payload
 
-    async def submit_exit(self, order_id: str) -> None:
+    def on_order_event(self, event: Dict[str, any]) -> None:
+        """``Broker.stream_orders`` 콜백. 매수 체결을 리스크 관리자에 알려 현금 예약을 정산 대상으로 옮긴다."""
+
+        if event.get("status") == "filled" and str(event.get("side", "")).upper() == "BUY":
+            self._risk.mark_filled(event["symbol"])
+
+    async def submit_close(self, symbol: str, qty: float, *, reason: str = "exit") -> Dict[str, any]:
+        """보유 포지션을 시장가로 청산하고 진입 때 잡은 리스크 예약(포지션 슬롯·명목)을 그대로 해제한다."""
+
+        try:
+            payload = await self._broker.place_order(symbol, "SELL", qty, meta={"reason": reason})
+        except Exception:
+            ORDERS.labels("SELL", "error").inc()
+            raise
+        self._risk.release(symbol)
+        ORDERS.labels("SELL", "submitted").inc()
+        return payload
+
+    async def submit_exit(self, symbol: str, order_id: str) -> None:
+        """체결 전인 ``symbol`` 진입 주문을 취소하고 그 진입이 잡은 리스크 예약을 해제한다."""
+
         await self._broker.cancel(order_id)
-        await self._risk.register_position_change(-1)
+        ORDERS.labels("EXIT", "cancelled").inc()
+        self._risk.release(symbol)
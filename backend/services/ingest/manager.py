@@ -3,17 +3,29 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, Iterable, List
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 
+from ...core.latency import TRACER
+from ...core.metrics import REGISTRY
 from .processors.aggregator import BarAggregator
-from .processors.features import FeatureComputer
+from .processors.features import AtrTracker, FeatureComputer
 from .publishers.redis_pub import RedisPublisher
 
 logger = logging.getLogger(__name__)
 
+TICKS = REGISTRY.counter("ingest_ticks_total", "Trades handled by IngestService.")
+
 
 class IngestService:
-    """원시 체결을 수신해 집계 피처를 발행하는 서비스."""
+    """원시 체결을 수신해 집계 피처를 발행하는 서비스.
+
+    바는 다음 틱이 올 때 닫히므로, 거래가 뜸한 종목의 바도 제때 닫히도록
+    :meth:`run_bar_flusher`를 함께 실행해 주기적으로 :meth:`flush_bars`를 부른다.
+
+    닫힌 ``atr_interval`` 바로 심볼별 ATR을 계산해 틱 피처에 ``atr``(가격 단위,
+    손절폭 계산용)과 ``atr_pct``(가격 대비 비율, 밴딧 컨텍스트용)로 싣는다.
+    """
 
     def __init__(
         self,
@@ -21,19 +33,35 @@ class IngestService:
         *,
         feature_lookbacks: Iterable[int] = (5, 15, 60),
         bar_intervals: Iterable[int] = (1, 60),
+        atr_interval: int = 60,
+        atr_period: int = 14,
     ) -> None:
         self._publisher = redis_publisher
         self._feature_comp = FeatureComputer(feature_lookbacks)
         self._aggregator = BarAggregator(bar_intervals)
+        self._atr = AtrTracker(f"{atr_interval}s", atr_period)
+        self._ticks = TICKS.labels()
 
     async def handle_trade(self, event: Dict[str, Any]) -> None:
+        self._ticks.inc()
         symbol = event.get("symbol", "UNKNOWN")
         price = float(event.get("price", 0.0))
         volume = float(event.get("volume", 0.0))
-        ts = float(event.get("ts", 0.0))
+        ts = float(event.get("ts") or time.time())
+        trace = event.get("trace")
+        if trace is None:
+            trace = TRACER.start(event.get("ts"))
         features = self._feature_comp.update(symbol, price, volume)
-        await self._aggregator.process_trade(symbol, price, volume, ts)
-        bars = await self._aggregator.get_bars()
+        TRACER.mark(trace, "features")
+        self._aggregator.process_trade(symbol, price, volume, ts)
+        bars = self._aggregator.drain_bars()
+        for bar in bars:
+            self._atr.update(bar)
+        atr = self._atr.get(symbol)
+        if atr is not None:
+            features["atr"] = atr
+            if price:
+                features["atr_pct"] = atr / price
         payload = {
             "type": "trade",
             "symbol": symbol,
@@ -43,4 +71,29 @@ class IngestService:
             "features": features,
             "bars": [bar.__dict__ for bar in bars],
         }
+        if trace is not None:
+            payload["trace"] = trace
+            TRACER.mark(trace, "publish")
         await self._publisher.publish(payload)
+
+    async def flush_bars(self, now: Optional[float] = None) -> int:
+        """``now``(기본 현재 시각) 전에 끝난 구간의 바를 닫아 발행하고 그 수를 반환한다."""
+
+        now = time.time() if now is None else now
+        self._aggregator.flush(now)
+        bars = self._aggregator.drain_bars()
+        for bar in bars:
+            self._atr.update(bar)
+        if bars:
+            await self._publisher.publish({"type": "bars", "ts": now, "bars": [bar.__dict__ for bar in bars]})
+        return len(bars)
+
+    async def run_bar_flusher(self, interval: float = 1.0) -> None:
+        """취소될 때까지 ``interval``초마다 :meth:`flush_bars`를 호출한다."""
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_bars()
+            except Exception as exc:  # pragma: no cover - 발행 오류는 기록만 한다
+                logger.error("Bar flush failed: %s", exc)
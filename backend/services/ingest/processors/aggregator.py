@@ -1,12 +1,12 @@
 """Simple in-memory OHLCV aggregation utilities."""
 from __future__ import annotations
 
-import asyncio
-import statistics
-import time
-from collections import defaultdict, deque
+import math
 from dataclasses import dataclass
-from typing import Deque, Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence
+
+FILL_POLICIES = ("gap", "ffill")
+_NO_BARS: Sequence["Bar"] = ()
 
 
 @dataclass
@@ -22,45 +22,137 @@ class Bar:
     vwap: float
 
 
+class _BarState:
+    """진행 중인 한 구간의 누적 OHLCV 상태."""
+
+    __slots__ = ("bucket", "open", "high", "low", "close", "volume", "notional", "empty")
+
+    def __init__(self, bucket: float, price: float, volume: float, *, empty: bool = False) -> None:
+        self.bucket = bucket
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+        self.notional = price * volume
+        # ffill 자리표시자: 첫 실제 틱이 들어오면 시가/고가/저가를 그 가격으로 다시 잡는다.
+        self.empty = empty
+
+    def add(self, price: float, volume: float) -> None:
+        if self.empty:
+            self.open = self.high = self.low = price
+            self.empty = False
+        elif price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.notional += price * volume
+
+    def to_bar(self, symbol: str, label: str) -> Bar:
+        vwap = self.notional / self.volume if self.volume > 0 else self.close
+        return Bar(
+            symbol=symbol,
+            ts=self.bucket,
+            interval=label,
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+            vwap=vwap,
+        )
+
+
 class BarAggregator:
-    """틱 데이터를 다양한 구간의 OHLCV 바로 집계한다."""
+    """틱 데이터를 다양한 구간의 OHLCV 바로 집계한다.
+
+    구간은 벽시계 기준 ``floor(ts / interval) * interval``로 정렬되며 바의
+    ``ts``는 구간 시작 시각이다(TimescaleDB ``time_bucket``과 동일). 틱마다
+    O(1)로 시가·고가·저가·종가·거래량·가격×거래량을 갱신하고, 다음 구간의
+    첫 틱이 들어오거나 :meth:`flush`가 호출되면 바를 닫는다. 체결이 없던
+    구간은 ``fill_policy``에 따라 건너뛰거나(``"gap"``) 직전 종가로 채운
+    거래량 0의 바를 만든다(``"ffill"``). 이미 닫힌 구간에 속한 늦은 틱은
+    버리고 ``late_trades``로 집계한다.
+
+    인제스트는 하나의 이벤트 루프에서 단일 작성자로 동작하므로 락을 두지
+    않는다. 모든 메서드는 동기이며 ``await`` 지점이 없어 루프 안에서 원자적으로
+    실행된다. 여러 태스크가 동시에 쓰는 구성이라면 심볼별로 인스턴스를 나눠야
+    한다.
+    """
 
-    def __init__(self, intervals: Iterable[int]) -> None:
+    def __init__(self, intervals: Iterable[int], *, fill_policy: str = "gap") -> None:
+        if fill_policy not in FILL_POLICIES:
+            raise ValueError(f"Unknown fill policy: {fill_policy}")
         self._intervals = list(intervals)
-        self._buckets: Dict[Tuple[str, int], List[float]] = defaultdict(list)
-        self._volume: Dict[Tuple[str, int], float] = defaultdict(float)
-        self._last_emit: Dict[Tuple[str, int], float] = defaultdict(time.time)
-        self._queue: Deque[Bar] = deque()
-        self._lock = asyncio.Lock()
-
-    async def process_trade(self, symbol: str, price: float, volume: float, ts: float) -> None:
-        async with self._lock:
-            for interval in self._intervals:
-                key = (symbol, interval)
-                self._buckets[key].append(price)
-                self._volume[key] += volume
-                last_emit = self._last_emit[key]
-                if ts - last_emit >= interval:
-                    prices = self._buckets.pop(key, [])
-                    total_volume = self._volume.pop(key, 0.0)
-                    if not prices:
-                        continue
-                    bar = Bar(
-                        symbol=symbol,
-                        ts=ts,
-                        interval=f"{interval}s",
-                        open=prices[0],
-                        high=max(prices),
-                        low=min(prices),
-                        close=prices[-1],
-                        volume=total_volume,
-                        vwap=statistics.fmean(prices),
-                    )
-                    self._queue.append(bar)
-                    self._last_emit[key] = ts
-
-    async def get_bars(self) -> List[Bar]:
-        async with self._lock:
-            bars = list(self._queue)
-            self._queue.clear()
-            return bars
+        self._labels = [f"{interval}s" for interval in self._intervals]
+        self._fill_policy = fill_policy
+        self._states: Dict[str, List[Optional[_BarState]]] = {}
+        # gap 모드에서 flush로 상태를 비운 뒤에도 늦은 틱을 거르도록 슬롯별 마지막으로 닫은 구간 시작을 남긴다.
+        self._closed: Dict[str, List[float]] = {}
+        self._pending: List[Bar] = []
+        self.late_trades = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def process_trade(self, symbol: str, price: float, volume: float, ts: float) -> None:
+        states = self._states.get(symbol)
+        if states is None:
+            states = self._states[symbol] = [None] * len(self._intervals)
+            self._closed[symbol] = [-math.inf] * len(self._intervals)
+        for i, interval in enumerate(self._intervals):
+            bucket = math.floor(ts / interval) * interval
+            state = states[i]
+            if state is None:
+                if bucket <= self._closed[symbol][i]:
+                    self.late_trades += 1
+                else:
+                    states[i] = _BarState(bucket, price, volume)
+            elif bucket == state.bucket:
+                state.add(price, volume)
+            elif bucket > state.bucket:
+                self._close(symbol, i, state, bucket)
+                states[i] = _BarState(bucket, price, volume)
+            else:
+                self.late_trades += 1
+
+    def flush(self, now: float) -> None:
+        """``now`` 이전에 끝난 구간을 새 틱을 기다리지 않고 닫는다."""
+
+        for symbol, states in self._states.items():
+            for i, interval in enumerate(self._intervals):
+                state = states[i]
+                if state is None or state.bucket + interval > now:
+                    continue
+                current = math.floor(now / interval) * interval
+                self._close(symbol, i, state, current)
+                if self._fill_policy == "ffill":
+                    states[i] = _BarState(current, state.close, 0.0, empty=True)
+                else:
+                    states[i] = None
+                    self._closed[symbol][i] = state.bucket
+
+    def drain_bars(self) -> Sequence[Bar]:
+        """직전 호출 이후 닫힌 바를 반환한다. 없으면 공유 빈 튜플을 돌려준다."""
+
+        if not self._pending:
+            return _NO_BARS
+        bars, self._pending = self._pending, []
+        return bars
+
+    def _close(self, symbol: str, index: int, state: _BarState, next_bucket: float) -> None:
+        """``state``의 바를 큐에 넣고 ``next_bucket`` 전까지의 빈 구간을 처리한다."""
+
+        label = self._labels[index]
+        self._pending.append(state.to_bar(symbol, label))
+        if self._fill_policy != "ffill":
+            return
+        interval = self._intervals[index]
+        close = state.close
+        bucket = state.bucket + interval
+        while bucket < next_bucket:
+            self._pending.append(Bar(symbol, bucket, label, close, close, close, close, 0.0, close))
+            bucket += interval
@@ -0,0 +1,391 @@
+"""라이브 피드를 기록하는 추가 전용 세그먼트 틱 저널.
+
+:class:`TickJournalRecorder`는 ``WebSocketIngestor`` 프로세서로 꽂아 쓰며,
+틱을 컬럼 버퍼에 모았다가 블록 단위로 전용 작성 스레드에 넘긴다. 디스크
+쓰기는 모두 그 스레드에서 큰 버퍼로 이루어지므로 이벤트 루프는 디스크 I/O로
+막히지 않는다.
+
+저널 디렉터리 구성::
+
+    symbols.txt          추가 전용 심볼 테이블 (심볼 ID = 줄 번호)
+    seg-<bucket>-<n>.col 세그먼트: magic(8s) 뒤에 블록이 이어진다.
+                         block = rows(I) ts(f8*n) price(f8*n) volume(f8*n) symbol(u4*n)
+    seg-<bucket>-<n>.idx.json
+                         세그먼트를 닫을 때 쓰는 인덱스(행 수, 시간 범위,
+                         심볼별 건수·시간 범위)
+
+세그먼트는 틱 시각 기준 ``roll_seconds``(기본 1시간) 경계나 ``roll_bytes``를
+넘을 때 새로 연다. :func:`compact`는 하루치 세그먼트를 (심볼, 시각) 순으로
+정렬한 :mod:`~backend.adapters.tick_replay` 틱 파일로 합친다.
+
+``python -m backend.services.ingest.processors.recorder <journal> <out.ticks>``로
+압축 도구를 실행할 수 있다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import mmap
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ....adapters.tick_replay import TICK_DTYPE, TickFileWriter
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"ATJSEG01"
+_ROWS = struct.Struct("<I")
+_COLUMNS = (("ts", "<f8"), ("price", "<f8"), ("volume", "<f8"), ("symbol", "<u4"))
+_ROW_BYTES = sum(np.dtype(dtype).itemsize for _, dtype in _COLUMNS)
+_WRITE_BUFFER = 4 * 1024 * 1024
+
+_Block = Tuple[float, List[str], List[float], List[float], List[float], List[int]]
+
+
+class TickJournalRecorder:
+    """틱을 세그먼트 컬럼 저널로 기록하는 인제스트 프로세서."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        roll_seconds: float = 3600.0,
+        roll_bytes: int = 256 * 1024 * 1024,
+        block_rows: int = 65_536,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._roll_seconds = roll_seconds
+        self._block_rows = block_rows
+        self._flush_interval = flush_interval
+        self._symbol_ids: Dict[str, int] = {}
+        symtab = self.directory / "symbols.txt"
+        if symtab.exists():
+            for name in symtab.read_text("utf-8").splitlines():
+                self._symbol_ids[name] = len(self._symbol_ids)
+        self._new_symbols: List[str] = []
+        self._reset_block(None)
+        self._last_handoff = time.monotonic()
+        self._queue: "queue.SimpleQueue[Optional[_Block]]" = queue.SimpleQueue()
+        self._writer = _SegmentWriter(self.directory, roll_bytes)
+        self._thread = threading.Thread(target=self._writer.run, args=(self._queue,), name="tick-journal", daemon=True)
+        self._thread.start()
+        self._closed = False
+        self.recorded = 0
+
+    async def __call__(self, event: Dict[str, Any]) -> None:
+        self.record(event)
+
+    def record(self, event: Dict[str, Any]) -> None:
+        if event.get("type", "trade") != "trade" or self._closed:
+            return
+        symbol = event.get("symbol", "UNKNOWN")
+        ts = float(event.get("ts", 0.0))
+        bucket = math.floor(ts / self._roll_seconds) * self._roll_seconds
+        if bucket != self._bucket and self._ts:
+            self._handoff()
+        self._bucket = bucket
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbol_ids)
+            self._new_symbols.append(symbol)
+        self._ts.append(ts)
+        self._price.append(float(event.get("price", 0.0)))
+        self._volume.append(float(event.get("volume", 0.0)))
+        self._symbol.append(symbol_id)
+        self.recorded += 1
+        if len(self._ts) >= self._block_rows or time.monotonic() - self._last_handoff >= self._flush_interval:
+            self._handoff()
+
+    def flush(self) -> None:
+        """버퍼에 남은 틱을 작성 스레드로 넘긴다."""
+
+        if self._ts:
+            self._handoff()
+
+    def close(self) -> None:
+        """남은 틱을 넘기고 작성 스레드가 세그먼트를 닫을 때까지 기다린다."""
+
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.close)
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self._writer.error
+
+    def _handoff(self) -> None:
+        self._queue.put((self._bucket, self._new_symbols, self._ts, self._price, self._volume, self._symbol))
+        self._new_symbols = []
+        self._reset_block(self._bucket)
+        self._last_handoff = time.monotonic()
+
+    def _reset_block(self, bucket: Optional[float]) -> None:
+        self._bucket = bucket
+        self._ts: List[float] = []
+        self._price: List[float] = []
+        self._volume: List[float] = []
+        self._symbol: List[int] = []
+
+
+class _SegmentWriter:
+    """작성 스레드에서만 접근하는 세그먼트 파일 상태."""
+
+    def __init__(self, directory: Path, roll_bytes: int) -> None:
+        self._directory = directory
+        self._roll_bytes = roll_bytes
+        self._fp: Any = None
+        self._path: Optional[Path] = None
+        self._bucket: Optional[float] = None
+        self._bytes = 0
+        self._rows = 0
+        self._symbols: Dict[int, List[float]] = {}
+        self.error: Optional[BaseException] = None
+
+    def run(self, blocks: "queue.SimpleQueue[Optional[_Block]]") -> None:
+        symtab = open(self._directory / "symbols.txt", "a", encoding="utf-8")
+        try:
+            while True:
+                block = blocks.get()
+                if block is None:
+                    break
+                try:
+                    self._write(symtab, block)
+                except Exception as exc:  # pragma: no cover - 디스크 오류 재현 어려움
+                    self.error = exc
+                    logger.error("Tick journal write failed: %s", exc)
+        finally:
+            self._close_segment()
+            symtab.close()
+
+    def _write(self, symtab: Any, block: _Block) -> None:
+        bucket, new_symbols, ts, price, volume, symbol = block
+        if new_symbols:
+            symtab.write("".join(f"{name}\n" for name in new_symbols))
+            symtab.flush()
+        if self._fp is None or bucket != self._bucket or self._bytes >= self._roll_bytes:
+            self._close_segment()
+            self._open_segment(bucket)
+        ts_arr = np.asarray(ts, dtype="<f8")
+        sym_arr = np.asarray(symbol, dtype="<u4")
+        payload = b"".join(
+            (
+                _ROWS.pack(len(ts_arr)),
+                ts_arr.tobytes(),
+                np.asarray(price, dtype="<f8").tobytes(),
+                np.asarray(volume, dtype="<f8").tobytes(),
+                sym_arr.tobytes(),
+            )
+        )
+        self._fp.write(payload)
+        self._bytes += len(payload)
+        self._rows += len(ts_arr)
+        self._index_block(ts_arr, sym_arr)
+
+    def _index_block(self, ts: np.ndarray, symbols: np.ndarray) -> None:
+        order = np.argsort(symbols, kind="stable")
+        sorted_symbols = symbols[order]
+        sorted_ts = ts[order]
+        ids, starts, counts = np.unique(sorted_symbols, return_index=True, return_counts=True)
+        t_min = np.minimum.reduceat(sorted_ts, starts)
+        t_max = np.maximum.reduceat(sorted_ts, starts)
+        for symbol_id, count, lo, hi in zip(ids.tolist(), counts.tolist(), t_min.tolist(), t_max.tolist()):
+            entry = self._symbols.get(symbol_id)
+            if entry is None:
+                self._symbols[symbol_id] = [count, lo, hi]
+            else:
+                entry[0] += count
+                entry[1] = min(entry[1], lo)
+                entry[2] = max(entry[2], hi)
+
+    def _open_segment(self, bucket: float) -> None:
+        seq = 0
+        while True:
+            path = self._directory / f"seg-{int(bucket):010d}-{seq:03d}.col"
+            if not path.exists():
+                break
+            seq += 1
+        self._path = path
+        self._bucket = bucket
+        self._fp = open(path, "wb", buffering=_WRITE_BUFFER)
+        self._fp.write(SEGMENT_MAGIC)
+        self._bytes = len(SEGMENT_MAGIC)
+        self._rows = 0
+        self._symbols = {}
+
+    def _close_segment(self) -> None:
+        if self._fp is None or self._path is None:
+            return
+        self._fp.close()
+        entries = self._symbols.values()
+        index = {
+            "segment": self._path.name,
+            "rows": self._rows,
+            "bytes": self._bytes,
+            "t_min": min((e[1] for e in entries), default=None),
+            "t_max": max((e[2] for e in entries), default=None),
+            "symbols": {str(k): v for k, v in sorted(self._symbols.items())},
+        }
+        index_path = self._path.with_suffix(".idx.json")
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index), "utf-8")
+        tmp.replace(index_path)
+        self._fp = None
+        self._path = None
+
+
+def read_symbols(directory: Union[str, Path]) -> List[str]:
+    path = Path(directory) / "symbols.txt"
+    return path.read_text("utf-8").splitlines() if path.exists() else []
+
+
+def read_segment(path: Union[str, Path]) -> np.ndarray:
+    """세그먼트 하나를 ``TICK_DTYPE`` 레코드 배열로 읽는다."""
+
+    blocks = list(iter_blocks(path))
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=TICK_DTYPE)
+
+
+def iter_blocks(path: Union[str, Path]) -> Iterator[np.ndarray]:
+    """세그먼트의 블록을 하나씩 ``TICK_DTYPE`` 레코드 배열로 낸다."""
+
+    with open(path, "rb") as fp:
+        size = fp.seek(0, 2)
+        if size <= len(SEGMENT_MAGIC):
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[: len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+                raise ValueError(f"Not a journal segment: {path}")
+            offset = len(SEGMENT_MAGIC)
+            while offset + _ROWS.size <= size:
+                (rows,) = _ROWS.unpack_from(mm, offset)
+                offset += _ROWS.size
+                end = offset + rows * _ROW_BYTES
+                if end > size:  # 기록 도중 끊긴 마지막 블록은 버린다.
+                    break
+                block = np.zeros(rows, dtype=TICK_DTYPE)
+                for name, dtype in _COLUMNS:
+                    block[name] = np.frombuffer(mm, dtype=dtype, count=rows, offset=offset)
+                    offset += np.dtype(dtype).itemsize * rows
+                yield block
+
+
+def _segment_counts(path: Path) -> Dict[int, int]:
+    """세그먼트의 심볼별 행 수. 인덱스가 없으면(쓰는 중인 세그먼트) 블록을 훑는다."""
+
+    index_path = path.with_suffix(".idx.json")
+    if index_path.exists():
+        index = json.loads(index_path.read_text("utf-8"))
+        return {int(k): v[0] for k, v in index["symbols"].items()}
+    counts: Dict[int, int] = {}
+    for block in iter_blocks(path):
+        ids, n = np.unique(block["symbol"], return_counts=True)
+        for symbol_id, count in zip(ids.tolist(), n.tolist()):
+            counts[symbol_id] = counts.get(symbol_id, 0) + count
+    return counts
+
+
+def iter_segments(
+    directory: Union[str, Path], *, start: Optional[float] = None, end: Optional[float] = None
+) -> Iterator[Path]:
+    """인덱스의 시간 범위가 ``[start, end)``와 겹치는 세그먼트를 이름 순으로 낸다."""
+
+    for path in sorted(Path(directory).glob("seg-*.col")):
+        index_path = path.with_suffix(".idx.json")
+        if index_path.exists() and (start is not None or end is not None):
+            index = json.loads(index_path.read_text("utf-8"))
+            if index["t_min"] is None:
+                continue
+            if start is not None and index["t_max"] < start:
+                continue
+            if end is not None and index["t_min"] >= end:
+                continue
+        yield path
+
+
+def compact(
+    directory: Union[str, Path],
+    out_path: Union[str, Path],
+    *,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    symbols: Optional[Sequence[str]] = None,
+    max_rows: int = 4_000_000,
+) -> int:
+    """세그먼트를 (심볼, 시각) 순으로 정렬된 틱 파일 하나로 합치고 행 수를 반환한다.
+
+    하루치를 한 번에 올리지 않는다. 세그먼트 인덱스의 심볼별 건수로 연속한 심볼 ID
+    구간을 대략 ``max_rows`` 행씩 묶고, 구간마다 해당 심볼이 있는 세그먼트만 블록
+    단위로 읽어 정렬한 뒤 바로 파일에 이어 쓴다.
+    """
+
+    names = read_symbols(directory)
+    wanted = None if symbols is None else {i for i, name in enumerate(names) if name in set(symbols)}
+    segments = [(path, _segment_counts(path)) for path in iter_segments(directory, start=start, end=end)]
+    totals: Dict[int, int] = {}
+    for _, counts in segments:
+        for symbol_id, count in counts.items():
+            if wanted is None or symbol_id in wanted:
+                totals[symbol_id] = totals.get(symbol_id, 0) + count
+
+    groups: List[List[int]] = []
+    group_rows = 0
+    for symbol_id in sorted(totals):
+        if not groups or group_rows + totals[symbol_id] > max_rows:
+            groups.append([])
+            group_rows = 0
+        groups[-1].append(symbol_id)
+        group_rows += totals[symbol_id]
+
+    with TickFileWriter(out_path, names, sorted_by_symbol=True) as writer:
+        for group in groups:
+            ids = np.asarray(group, dtype="<u4")
+            parts: List[np.ndarray] = []
+            for path, counts in segments:
+                if not any(symbol_id in counts for symbol_id in group):
+                    continue
+                for block in iter_blocks(path):
+                    mask = np.isin(block["symbol"], ids)
+                    if start is not None:
+                        mask &= block["ts"] >= start
+                    if end is not None:
+                        mask &= block["ts"] < end
+                    if mask.any():
+                        parts.append(block[mask])
+            if not parts:
+                continue
+            records = np.concatenate(parts)
+            writer.append(records[np.lexsort((records["ts"], records["symbol"]))])
+        return writer.rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compact tick journal segments into a per-symbol sorted tick file")
+    parser.add_argument("journal", help="Journal directory")
+    parser.add_argument("output", help="Output tick file")
+    parser.add_argument("--start", type=float, default=None, help="Inclusive start timestamp")
+    parser.add_argument("--end", type=float, default=None, help="Exclusive end timestamp")
+    parser.add_argument("--symbols", nargs="*", default=None)
+    args = parser.parse_args(argv)
+    rows = compact(args.journal, args.output, start=args.start, end=args.end, symbols=args.symbols)
+    print(f"[compact] wrote {rows} ticks to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
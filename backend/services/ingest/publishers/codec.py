@@ -0,0 +1,208 @@
+"""인제스트 페이로드용 와이어 코덱.
+
+``json`` 코덱은 기존 형식을 그대로 유지한다. ``binary`` 코덱은 고정
+``struct`` 레이아웃으로 체결·피처·바 메시지를 인코딩하며, 첫 두 바이트
+매직(``0x00 0xA7``)으로 자신을 식별한다. JSON 문서는 절대 ``0x00``으로
+시작하지 않으므로 구독자는 :func:`decode_message` 하나로 두 형식을 모두
+받아 ``StrategyLoop.run``이 기대하는 사전으로 복원할 수 있다. 바이너리
+코덱이 표현하지 못하는 페이로드(``type != "trade"``)는 JSON으로 폴백한다.
+
+레이아웃 v1 (리틀 엔디언)::
+
+    header   : magic(2s) version(B) kind(B)
+    trade    : price(d) volume(d) ts(d) symbol(B len + utf-8)
+    features : count(B) { key_id(B) [len(B) + utf-8 if key_id == 0xFF] value(d) }*
+    bars     : count(H) { ts(d) o(d) h(d) l(d) c(d) v(d) vwap(d)
+                          symbol(B len + utf-8) interval(B len + utf-8) }*
+    trace    : (kind == 2 only) count(B) { stage_id(B) monotonic_ns(Q) }*
+
+``trace``는 :mod:`backend.core.latency`의 단계 타임스탬프이며, 단계 ID는
+:data:`~backend.core.latency.STAGES`의 순서를 따른다.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple, Union
+
+from ....core.latency import STAGES
+
+MAGIC = b"\x00\xa7"
+VERSION = 1
+KIND_TRADE = 1
+KIND_TRADE_TRACED = 2
+
+# 버전 1의 인터닝 키 테이블. 순서를 바꾸면 버전을 올려야 한다.
+FEATURE_KEYS: Tuple[str, ...] = ("ret_5s", "ret_15s", "ret_60s", "vol_spike", "ret_1s", "ret_30s")
+_FEATURE_IDS = {name: i for i, name in enumerate(FEATURE_KEYS)}
+_INLINE_KEY = 0xFF
+
+_HEADER = struct.Struct("<2sBB")
+_TRADE = struct.Struct("<dddB")
+_COUNT8 = struct.Struct("<B")
+_COUNT16 = struct.Struct("<H")
+_FEATURE = struct.Struct("<Bd")
+_VALUE = struct.Struct("<d")
+_BAR = struct.Struct("<7d")
+_STAMP = struct.Struct("<BQ")
+_TRADE_HEADER = _HEADER.pack(MAGIC, VERSION, KIND_TRADE)
+_TRACED_HEADER = _HEADER.pack(MAGIC, VERSION, KIND_TRADE_TRACED)
+_STAGE_IDS = {name: i for i, name in enumerate(STAGES)}
+
+Raw = Union[bytes, bytearray, memoryview, str]
+
+
+class CodecError(ValueError):
+    """바이너리 메시지를 해석할 수 없을 때 발생하는 예외."""
+
+
+def encode_json(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload)
+
+
+def encode_binary(payload: Dict[str, Any]) -> bytes:
+    if payload.get("type") != "trade":
+        return json.dumps(payload).encode("utf-8")
+    symbol = payload["symbol"].encode("utf-8")
+    features = payload.get("features") or {}
+    bars = payload.get("bars") or ()
+    trace = payload.get("trace")
+    parts: List[bytes] = [
+        _TRACED_HEADER if trace else _TRADE_HEADER,
+        _TRADE.pack(payload["price"], payload["volume"], payload["ts"], len(symbol)),
+        symbol,
+        _COUNT8.pack(len(features)),
+    ]
+    for name, value in features.items():
+        key_id = _FEATURE_IDS.get(name)
+        if key_id is None:
+            raw_name = name.encode("utf-8")
+            parts.append(_COUNT8.pack(_INLINE_KEY))
+            parts.append(_COUNT8.pack(len(raw_name)))
+            parts.append(raw_name)
+            parts.append(_VALUE.pack(value))
+        else:
+            parts.append(_FEATURE.pack(key_id, value))
+    parts.append(_COUNT16.pack(len(bars)))
+    for bar in bars:
+        bar_symbol = bar["symbol"].encode("utf-8")
+        interval = bar["interval"].encode("utf-8")
+        parts.append(
+            _BAR.pack(bar["ts"], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"], bar["vwap"])
+        )
+        parts.append(_COUNT8.pack(len(bar_symbol)))
+        parts.append(bar_symbol)
+        parts.append(_COUNT8.pack(len(interval)))
+        parts.append(interval)
+    if trace:
+        stamps = [(_STAGE_IDS[stage], ns) for stage, ns in trace.items() if stage in _STAGE_IDS]
+        parts.append(_COUNT8.pack(len(stamps)))
+        parts.extend(_STAMP.pack(stage_id, ns) for stage_id, ns in stamps)
+    return b"".join(parts)
+
+
+def decode_message(raw: Raw) -> Dict[str, Any]:
+    """JSON 또는 바이너리 메시지를 ``StrategyLoop``용 사전으로 복원한다."""
+
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if raw[:2] != MAGIC:
+        return json.loads(bytes(raw))
+    return _decode_binary(raw)
+
+
+def _decode_binary(raw: Union[bytes, bytearray, memoryview]) -> Dict[str, Any]:
+    try:
+        _, version, kind = _HEADER.unpack_from(raw, 0)
+        if version != VERSION or kind not in (KIND_TRADE, KIND_TRADE_TRACED):
+            raise CodecError(f"Unsupported binary message version={version} kind={kind}")
+        offset = _HEADER.size
+        price, volume, ts, sym_len = _TRADE.unpack_from(raw, offset)
+        offset += _TRADE.size
+        symbol = bytes(raw[offset : offset + sym_len]).decode("utf-8")
+        offset += sym_len
+
+        (n_features,) = _COUNT8.unpack_from(raw, offset)
+        offset += 1
+        features: Dict[str, float] = {}
+        for _ in range(n_features):
+            key_id = raw[offset]
+            if key_id == _INLINE_KEY:
+                name_len = raw[offset + 1]
+                name = bytes(raw[offset + 2 : offset + 2 + name_len]).decode("utf-8")
+                offset += 2 + name_len
+            else:
+                name = FEATURE_KEYS[key_id]
+                offset += 1
+            (features[name],) = _VALUE.unpack_from(raw, offset)
+            offset += _VALUE.size
+
+        (n_bars,) = _COUNT16.unpack_from(raw, offset)
+        offset += 2
+        bars: List[Dict[str, Any]] = []
+        for _ in range(n_bars):
+            bar_ts, open_, high, low, close, bar_volume, vwap = _BAR.unpack_from(raw, offset)
+            offset += _BAR.size
+            bar_sym_len = raw[offset]
+            bar_symbol = bytes(raw[offset + 1 : offset + 1 + bar_sym_len]).decode("utf-8")
+            offset += 1 + bar_sym_len
+            interval_len = raw[offset]
+            interval = bytes(raw[offset + 1 : offset + 1 + interval_len]).decode("utf-8")
+            offset += 1 + interval_len
+            bars.append(
+                {
+                    "symbol": bar_symbol,
+                    "ts": bar_ts,
+                    "interval": interval,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": bar_volume,
+                    "vwap": vwap,
+                }
+            )
+        trace: Dict[str, int] = {}
+        if kind == KIND_TRADE_TRACED:
+            n_stamps = raw[offset]
+            offset += 1
+            for _ in range(n_stamps):
+                stage_id, ns = _STAMP.unpack_from(raw, offset)
+                trace[STAGES[stage_id]] = ns
+                offset += _STAMP.size
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise CodecError("Truncated or corrupt binary message") from exc
+    if offset != len(raw):
+        raise CodecError("Truncated or corrupt binary message")
+    message = {
+        "type": "trade",
+        "symbol": symbol,
+        "price": price,
+        "volume": volume,
+        "ts": ts,
+        "features": features,
+        "bars": bars,
+    }
+    if kind == KIND_TRADE_TRACED:
+        message["trace"] = trace
+    return message
+
+
+async def decode_stream(messages: AsyncIterator[Raw]) -> AsyncIterator[Dict[str, Any]]:
+    """구독 메시지 스트림을 ``StrategyLoop``의 ``signal_stream``으로 변환한다."""
+
+    async for raw in messages:
+        yield decode_message(raw)
+
+
+CODECS: Dict[str, Callable[[Dict[str, Any]], Union[str, bytes]]] = {
+    "json": encode_json,
+    "binary": encode_binary,
+}
+
+
+def get_encoder(name: str) -> Callable[[Dict[str, Any]], Union[str, bytes]]:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown codec: {name}") from None
@@ -0,0 +1,229 @@
+"""재생과 컨슈머 그룹을 지원하는 Redis Streams 퍼블리셔/컨슈머.
+
+Pub/Sub과 달리 스트림은 메시지를 보관하므로 전략 프로세스가 재시작하거나
+급등 구간에서 뒤처져도 놓친 틱을 따라잡을 수 있다. 심볼은 CRC32 해시로
+``{prefix}:{partition}`` 스트림에 고정 배정되어 같은 심볼의 순서가 유지되고,
+파티션을 워커별로 나눠 여러 전략 워커가 부하를 분담한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aioredis
+
+from .codec import decode_message, get_encoder
+
+logger = logging.getLogger(__name__)
+
+_FIELD = "d"
+_FIELD_BYTES = _FIELD.encode("utf-8")
+
+
+def partition_for(symbol: str, partitions: int) -> int:
+    """프로세스와 무관하게 안정적인 심볼→파티션 배정을 반환한다."""
+
+    return zlib.crc32(symbol.encode("utf-8")) % partitions
+
+
+def stream_key(prefix: str, partition: int) -> str:
+    return f"{prefix}:{partition}"
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+class RedisStreamPublisher:
+    """XADD와 근사 MAXLEN 트리밍으로 파티션 스트림에 이벤트를 추가한다."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str,
+        *,
+        partitions: int = 8,
+        maxlen: int = 100_000,
+        codec: str = "json",
+        client: Optional[aioredis.Redis] = None,
+    ) -> None:
+        if partitions < 1:
+            raise ValueError("partitions must be positive")
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self._partitions = partitions
+        self._maxlen = maxlen
+        self._encode = get_encoder(codec)
+        self._redis: aioredis.Redis | None = client
+        self._keys = [stream_key(prefix, p) for p in range(partitions)]
+
+    async def start(self) -> None:
+        if self._redis is None:
+            self._redis = await aioredis.from_url(self._redis_url, encoding="utf-8", decode_responses=False)
+
+    async def stop(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def key_for(self, symbol: str) -> str:
+        return self._keys[partition_for(symbol, self._partitions)]
+
+    async def publish(self, payload: Dict[str, Any]) -> None:
+        if self._redis is None:
+            await self.start()
+        assert self._redis is not None
+        await self._redis.xadd(
+            self.key_for(payload.get("symbol", "")),
+            {_FIELD: self._encode(payload)},
+            maxlen=self._maxlen,
+            approximate=True,
+        )
+
+    async def publish_many(self, payloads: Iterable[Dict[str, Any]]) -> None:
+        """여러 이벤트를 파이프라인 한 번으로 추가한다."""
+
+        if self._redis is None:
+            await self.start()
+        assert self._redis is not None
+        pipe = self._redis.pipeline(transaction=False)
+        for payload in payloads:
+            pipe.xadd(
+                self.key_for(payload.get("symbol", "")),
+                {_FIELD: self._encode(payload)},
+                maxlen=self._maxlen,
+                approximate=True,
+            )
+        await pipe.execute()
+
+
+class RedisStreamConsumer:
+    """컨슈머 그룹으로 파티션 스트림을 읽어 ``StrategyLoop``용 이벤트를 내보낸다.
+
+    ``worker_index``/``workers``에 따라 ``partition % workers == worker_index``인
+    파티션만 읽으므로 심볼별 순서가 한 워커 안에서 보장된다. 반복을 시작하면
+    먼저 이 컨슈머의 미확인(PEL) 항목을 재전달받고 이어서 새 항목을 읽는다.
+    한 배치의 ACK는 다음 배치를 요청할 때 스트림별 ``XACK`` 한 번으로 묶어
+    보내므로 처리 도중 종료되면 해당 배치가 재전달된다(at-least-once).
+    새로 만든 그룹은 ``$``(생성 이후 들어온 항목)부터 읽으므로 보관 중인 과거
+    항목을 실시간 틱처럼 재생하지 않는다. ``start_id``를 주면(예: ``"0"``) 그룹의
+    마지막 전달 위치를 그 ID로 옮겨 재생한다.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str,
+        group: str,
+        consumer: str,
+        *,
+        partitions: int = 8,
+        worker_index: int = 0,
+        workers: int = 1,
+        batch_size: int = 512,
+        block_ms: int = 1_000,
+        start_id: Optional[str] = None,
+        client: Optional[aioredis.Redis] = None,
+    ) -> None:
+        if not 0 <= worker_index < workers:
+            raise ValueError("worker_index must be in [0, workers)")
+        self._redis_url = redis_url
+        self._group = group
+        self._consumer = consumer
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+        self._start_id = start_id
+        self._redis: aioredis.Redis | None = client
+        self._keys = [stream_key(prefix, p) for p in range(partitions) if p % workers == worker_index]
+        self._unacked: Dict[str, List[Any]] = {}
+        self._running = False
+        self.last_ids: Dict[str, str] = {}
+
+    @property
+    def streams(self) -> Sequence[str]:
+        return tuple(self._keys)
+
+    async def start(self) -> None:
+        if self._redis is None:
+            self._redis = await aioredis.from_url(self._redis_url, encoding="utf-8", decode_responses=False)
+        for key in self._keys:
+            try:
+                await self._redis.xgroup_create(key, self._group, id=self._start_id or "$", mkstream=True)
+            except Exception as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+            if self._start_id is not None:
+                await self._redis.xgroup_setid(key, self._group, self._start_id)
+        self._running = True
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._redis is not None:
+            await self.ack_pending()
+            await self._redis.close()
+            self._redis = None
+
+    async def ack_pending(self) -> int:
+        """지금까지 내보낸 항목을 스트림별 ``XACK`` 한 번으로 확인한다."""
+
+        if not self._unacked or self._redis is None:
+            return 0
+        pending, self._unacked = self._unacked, {}
+        acked = 0
+        for key, ids in pending.items():
+            acked += int(await self._redis.xack(key, self._group, *ids) or 0)
+        return acked
+
+    async def read_batch(self, *, pending: bool = False) -> List[Tuple[str, Any, Dict[str, Any]]]:
+        """``(stream, id, event)`` 목록을 읽는다. ``pending``이면 PEL을 재전달받는다."""
+
+        if self._redis is None:
+            await self.start()
+        assert self._redis is not None
+        cursor = "0" if pending else ">"
+        response = await self._redis.xreadgroup(
+            self._group,
+            self._consumer,
+            {key: cursor for key in self._keys},
+            count=self._batch_size,
+            block=None if pending else self._block_ms,
+        )
+        batch: List[Tuple[str, Any, Dict[str, Any]]] = []
+        for raw_key, entries in response or ():
+            if not entries:
+                continue
+            key = _text(raw_key)
+            ids = self._unacked.setdefault(key, [])
+            for entry_id, fields in entries:
+                ids.append(entry_id)
+                self.last_ids[key] = _text(entry_id)
+                if not fields:  # 트리밍으로 본문이 사라진 PEL 항목
+                    continue
+                raw = fields.get(_FIELD, fields.get(_FIELD_BYTES))
+                batch.append((key, entry_id, decode_message(raw)))
+        return batch
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Dict[str, Any]]:
+        if not self._running:
+            await self.start()
+        replaying = True
+        while self._running:
+            await self.ack_pending()
+            try:
+                batch = await self.read_batch(pending=replaying)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - 네트워크 오류 재현 어려움
+                logger.error("Redis stream read failed: %s", exc)
+                await asyncio.sleep(1)
+                continue
+            if replaying and not batch and not self._unacked:
+                replaying = False
+                continue
+            for _, _, event in batch:
+                yield event
@@ -0,0 +1,145 @@
+"""인제스트 단계 사이에 두는 제한 크기 이벤트 큐.
+
+큐가 가득 찼을 때의 동작은 ``overflow`` 정책으로 고른다.
+
+- ``"block"``: 자리가 날 때까지 생산자를 기다리게 한다.
+- ``"drop"``: 새로 들어온 항목을 버린다.
+- ``"drop_oldest"``: 가장 오래된 항목을 버리고 새 항목을 넣는다.
+- ``"coalesce"``: 같은 키(심볼)의 대기 항목을 제자리에서 최신 값으로
+  교체한다. 대기 중인 항목이 없으면 ``drop_oldest``처럼 동작한다.
+
+큐는 단일 FIFO이므로 키별 순서는 항상 유지된다. 각 항목의 적재 시각을
+함께 보관해 소비 시점의 지연(lag)을 계산한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Hashable, List
+
+OVERFLOW_POLICIES = ("block", "drop", "drop_oldest", "coalesce")
+
+
+@dataclass
+class QueueStats:
+    enqueued: int = 0
+    dequeued: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+
+class OverflowQueue:
+    """오버플로 정책과 지연 통계를 갖춘 asyncio 단일 루프용 큐."""
+
+    def __init__(self, maxsize: int, overflow: str = "block") -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.stats = QueueStats()
+        # 항목은 [key, item, enqueued_at] 리스트라 coalesce 시 제자리에서 교체할 수 있다.
+        self._items: Deque[List[Any]] = deque()
+        self._latest: Dict[Hashable, List[Any]] = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def peek_items(self) -> List[Any]:
+        return [record[1] for record in self._items]
+
+    def oldest_age(self) -> float:
+        """가장 오래 기다린 항목의 대기 시간(초)."""
+
+        if not self._items:
+            return 0.0
+        return time.perf_counter() - self._items[0][2]
+
+    async def put(self, key: Hashable, item: Any) -> bool:
+        """항목을 넣는다. 정책에 따라 버려졌거나 병합되면 ``False``를 반환한다."""
+
+        items = self._items
+        if len(items) >= self.maxsize:
+            policy = self.overflow
+            if policy == "block":
+                while len(items) >= self.maxsize:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+            elif policy == "drop":
+                self.stats.dropped += 1
+                return False
+            elif policy == "coalesce" and key in self._latest:
+                record = self._latest[key]
+                record[1] = item
+                self.stats.coalesced += 1
+                return False
+            else:
+                self._forget(items.popleft())
+                self.stats.dropped += 1
+        record = [key, item, time.perf_counter()]
+        items.append(record)
+        if self.overflow == "coalesce":
+            self._latest[key] = record
+        stats = self.stats
+        stats.enqueued += 1
+        depth = len(items)
+        stats.depth = depth
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        self._not_empty.set()
+        return True
+
+    def pop_many(self, limit: int) -> List[Any]:
+        """최대 ``limit``개 항목을 FIFO 순서로 꺼낸다(대기하지 않음)."""
+
+        items = self._items
+        count = min(limit, len(items))
+        if not count:
+            return []
+        records = [items.popleft() for _ in range(count)]
+        for record in records:
+            self._forget(record)
+        self._record_lag(records[0][2], count)
+        return [record[1] for record in records]
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        record = self._items.popleft()
+        self._forget(record)
+        self._record_lag(record[2], 1)
+        return record[1]
+
+    async def get_many(self, limit: int) -> List[Any]:
+        """항목이 하나 이상 생길 때까지 기다린 뒤 최대 ``limit``개를 꺼낸다."""
+
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.pop_many(limit)
+
+    def _forget(self, record: List[Any]) -> None:
+        key = record[0]
+        if self._latest.get(key) is record:
+            del self._latest[key]
+
+    def _record_lag(self, enqueued_at: float, count: int) -> None:
+        lag = time.perf_counter() - enqueued_at
+        stats = self.stats
+        stats.dequeued += count
+        stats.depth = len(self._items)
+        stats.last_lag = lag
+        if lag > stats.max_lag:
+            stats.max_lag = lag
+        self._not_full.set()
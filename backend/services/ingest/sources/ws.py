@@ -3,35 +3,163 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, Iterable
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from ....core.latency import TRACER
+from ....core.metrics import REGISTRY, ensure_loop_lag_monitor
+from ..queues import OverflowQueue, QueueStats
 
 logger = logging.getLogger(__name__)
 
+Processor = Callable[[Dict[str, Any]], Awaitable[None]]
+
+QUEUE_DEPTH = REGISTRY.gauge("ingest_queue_depth", "Events waiting in a processor queue.", ("processor",))
+QUEUE_LAG = REGISTRY.gauge("ingest_queue_lag_seconds", "Age of the oldest queued event.", ("processor",))
+QUEUE_DROPPED = REGISTRY.gauge("ingest_queue_dropped", "Events dropped by the overflow policy.", ("processor",))
+PROCESSOR_ERRORS = REGISTRY.counter("ingest_processor_errors_total", "Processor exceptions.", ("processor",))
+
+
+class ProcessorChannel:
+    """프로세서 하나를 전용 제한 큐와 워커 태스크 뒤에 둔다.
+
+    워커는 큐를 FIFO로 비우며 이벤트를 하나씩 순서대로 처리하므로 심볼별
+    순서가 보장된다. ``overflow``는 :class:`~..queues.OverflowQueue` 정책
+    (``block``/``drop``/``drop_oldest``/``coalesce``)을 따르며, ``coalesce``는
+    심볼별 최신 이벤트만 남긴다.
+    """
+
+    def __init__(
+        self,
+        processor: Processor,
+        *,
+        maxsize: int = 10_000,
+        overflow: str = "block",
+        name: Optional[str] = None,
+    ) -> None:
+        self.processor = processor
+        self.name = name or getattr(processor, "__qualname__", repr(processor))
+        self.queue = OverflowQueue(maxsize, overflow)
+        self.errors = 0
+        self._busy = False
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._errors_metric = PROCESSOR_ERRORS.labels(self.name)
+        queue_ref = weakref.ref(self.queue)
+        QUEUE_DEPTH.labels(self.name).set_function(lambda: len(queue_ref()))  # type: ignore[arg-type]
+        QUEUE_LAG.labels(self.name).set_function(lambda: queue_ref().oldest_age())  # type: ignore[union-attr]
+        QUEUE_DROPPED.labels(self.name).set_function(lambda: queue_ref().stats.dropped)  # type: ignore[union-attr]
+
+    @property
+    def stats(self) -> QueueStats:
+        return self.queue.stats
+
+    @property
+    def lag(self) -> float:
+        """가장 오래 대기 중인 이벤트의 대기 시간(초)."""
+
+        return self.queue.oldest_age()
+
+    async def submit(self, event: Dict[str, Any]) -> None:
+        await self.queue.put(event.get("symbol"), event)
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name=f"ingest-{self.name}")
+
+    async def stop(self, *, drain: bool = True) -> None:
+        """워커를 멈춘다. ``drain``이면 남은 이벤트를 워커가 모두 처리할 때까지 기다린다."""
+
+        if drain and self._worker is not None:
+            while len(self.queue) or self._busy:
+                await asyncio.sleep(0.001)
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self) -> None:
+        while True:
+            events = await self.queue.get_many(256)
+            self._busy = True
+            for event in events:
+                await self._process(event)
+            self._busy = False
+
+    async def _process(self, event: Dict[str, Any]) -> None:
+        try:
+            await self.processor(event)
+        except Exception as exc:
+            self.errors += 1
+            self._errors_metric.inc()
+            logger.error("Ingest processor %s failed: %s", self.name, exc)
+
 
 class WebSocketIngestor:
-    """:class:`MarketDataFeed`를 감싸 메시지를 프로세서로 전달한다."""
+    """:class:`MarketDataFeed`를 감싸 메시지를 프로세서로 전달한다.
+
+    각 프로세서는 :class:`ProcessorChannel` 뒤에서 독립적으로 실행되므로
+    느린 프로세서(예: Redis 발행 지연)가 WebSocket 읽기 루프를 막지 않는다.
+    피드 콜백은 큐에 넣기만 하고, ``block`` 정책의 큐가 가득 찬 경우에만
+    대기한다.
+    """
 
     def __init__(
         self,
         feed_factory: Callable[[Callable[[Dict[str, Any]], Awaitable[None]]], Awaitable[Any]],
-        processors: Iterable[Callable[[Dict[str, Any]], Awaitable[None]]],
+        processors: Iterable[Union[Processor, ProcessorChannel]],
+        *,
+        queue_size: int = 10_000,
+        overflow: str = "block",
     ) -> None:
         self._feed_factory = feed_factory
-        self._processors = list(processors)
+        self._channels: List[ProcessorChannel] = [
+            p if isinstance(p, ProcessorChannel) else ProcessorChannel(p, maxsize=queue_size, overflow=overflow)
+            for p in processors
+        ]
         self._should_run = True
 
+    @property
+    def channels(self) -> List[ProcessorChannel]:
+        return list(self._channels)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """프로세서별 큐 깊이·지연·드롭 통계."""
+
+        return {
+            channel.name: {**channel.stats.__dict__, "lag": channel.lag, "errors": channel.errors}
+            for channel in self._channels
+        }
+
     async def start(self) -> None:
+        channels = self._channels
+
         async def on_event(event: Dict[str, Any]) -> None:
-            for processor in self._processors:
-                await processor(event)
+            # 큐 대기 시간도 지연에 포함되도록 수신 즉시 trace를 시작한다.
+            if TRACER.enabled and "trace" not in event:
+                event["trace"] = TRACER.start(event.get("ts"))
+            for channel in channels:
+                await channel.submit(event)
 
+        ensure_loop_lag_monitor("ingest")
+        for channel in channels:
+            channel.start()
         feed = await self._feed_factory(on_event)
-        while self._should_run:
-            try:
-                await feed.run()
-            except Exception as exc:  # pragma: no cover
-                logger.error("Ingest feed error: %s", exc)
-                await asyncio.sleep(1)
+        try:
+            while self._should_run:
+                try:
+                    await feed.run()
+                    if getattr(feed, "finite", False):
+                        logger.info("Finite ingest feed exhausted; stopping")
+                        break
+                except Exception as exc:  # pragma: no cover
+                    logger.error("Ingest feed error: %s", exc)
+                    await asyncio.sleep(1)
+        finally:
+            for channel in channels:
+                await channel.stop()
 
     async def stop(self) -> None:
         self._should_run = False
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 
 @dataclass
@@ -10,6 +12,27 @@ class SurgeSignal:
     symbol: str
     score: float
     features: Dict[str, float]
+    model_version: Optional[str] = None
+    model_score: Optional[float] = None
+
+
+@dataclass
+class SurgeBatch:
+    """:meth:`SurgeDetector.score_batch` 결과. ``signals``는 진입 종목만 담는다."""
+
+    scores: np.ndarray
+    entries: np.ndarray
+    signals: List[SurgeSignal]
+
+
+def _py_max0(values: np.ndarray) -> np.ndarray:
+    # 내장 max(0.0, x)는 x > 0.0일 때만 x를 고르므로 NaN·-0.0도 0.0이 된다.
+    return np.where(values > 0.0, values, 0.0)
+
+
+def _py_min1(values: np.ndarray) -> np.ndarray:
+    # 내장 min(1.0, x)와 같이 x < 1.0일 때만 x를 고른다(NaN이면 1.0).
+    return np.where(values < 1.0, values, 1.0)
 
 
 class SurgeDetector:
@@ -28,5 +51,38 @@ class SurgeDetector:
         score = max(0.0, min(1.0, 0.7 * z_ret + 0.3 * z_vol))
         return SurgeSignal(symbol=symbol, score=score, features=features)
 
+    def score_batch(
+        self,
+        symbols: Sequence[str],
+        ret_5s: np.ndarray,
+        ret_15s: np.ndarray,
+        vol_spike: np.ndarray,
+    ) -> SurgeBatch:
+        """정렬된 피처 배열로 여러 종목의 점수와 진입 여부를 한 번에 계산한다.
+
+        연산 순서와 ``min``/``max`` 의미를 :meth:`score`와 똑같이 맞춰 결과가
+        비트 단위로 같다. ``NaN``은 피처가 없는 것으로 보고 스칼라 경로의
+        기본값 ``0.0``으로 바꾼다(:meth:`FeatureComputer.update_many` 출력과 호환).
+        """
+
+        ret_5s = np.nan_to_num(np.asarray(ret_5s, dtype=np.float64), nan=0.0)
+        ret_15s = np.nan_to_num(np.asarray(ret_15s, dtype=np.float64), nan=0.0)
+        vol_spike = np.nan_to_num(np.asarray(vol_spike, dtype=np.float64), nan=0.0)
+        ret_5 = _py_max0(ret_5s)
+        ret_15 = _py_max0(ret_15s)
+        z_ret = _py_min1(ret_5 * 20 + ret_15 * 10)
+        z_vol = _py_max0(_py_min1((vol_spike / max(self.vol_spike_threshold, 1e-9)) - 1.0))
+        scores = _py_max0(_py_min1(0.7 * z_ret + 0.3 * z_vol))
+        entries = (scores >= self.entry_threshold) & (vol_spike >= self.vol_spike_threshold)
+        signals = [
+            SurgeSignal(
+                symbol=symbols[i],
+                score=float(scores[i]),
+                features={"ret_5s": float(ret_5s[i]), "ret_15s": float(ret_15s[i]), "vol_spike": float(vol_spike[i])},
+            )
+            for i in np.flatnonzero(entries).tolist()
+        ]
+        return SurgeBatch(scores=scores, entries=entries, signals=signals)
+
     def is_entry(self, signal: SurgeSignal) -> bool:
         return signal.score >= self.entry_threshold and signal.features.get("vol_spike", 0.0) >= self.vol_spike_threshold
@@ -0,0 +1,52 @@
+"""ContextualBandit 팔 선택 벤치마크.
+
+``python -m benchmarks.bench_bandit``로 실행한다. 설정 기본 격자(72개 팔)와
+더 큰 격자에서 팔마다 ``random.betavariate``를 부르던 기존 방식과
+:meth:`ContextualBandit.select` / :meth:`ContextualBandit.select_many`의
+결정당 시간(us)을 비교한다.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from backend.core.settings import settings
+from backend.services.exec.bandit import ContextualBandit
+
+
+def _us_per_call(fn: Callable[[], object], n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def _scalar_select(bandit: ContextualBandit) -> object:
+    return max(bandit.arms, key=lambda arm: random.betavariate(arm.successes, arm.trials - arm.successes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--batch", type=int, default=16)
+    args = parser.parse_args()
+
+    grids = {
+        "settings": (settings.TP_CHOICES, settings.SL_ATR_CHOICES, settings.TS_CHOICES_MIN),
+        "x4": (settings.TP_CHOICES * 2, settings.SL_ATR_CHOICES * 2, settings.TS_CHOICES_MIN),
+    }
+    for label, (tp, sl, ts) in grids.items():
+        bandit = ContextualBandit(tp, sl, ts, epsilon=0.0, seed=0)
+        scalar = _us_per_call(lambda: _scalar_select(bandit), args.iterations)
+        vector = _us_per_call(bandit.select, args.iterations)
+        batch = _us_per_call(lambda: bandit.select_many(args.batch), args.iterations // 10) / args.batch
+        print(
+            f"{label:<8} arms {len(bandit.arms):4d}  per-arm betavariate {scalar:8.2f} us  "
+            f"select {vector:6.2f} us  select_many({args.batch}) {batch:6.2f} us/decision"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""체크포인트 스냅샷 비용 벤치마크.
+
+``python -m benchmarks.bench_checkpoint``로 실행한다. 팔 수를 늘려 가며
+이벤트 루프에서 치르는 :meth:`Checkpointer.capture` 시간(us)과 스레드에서
+도는 인코딩·원자적 파일 쓰기 시간(ms)을 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from backend.services.exec.bandit import ContextualBandit
+from backend.services.exec.checkpoint import Checkpointer, FileCheckpointStore
+from backend.services.exec.linear_bandit import LinearBandit
+from backend.services.exec.risk import RiskManager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_tp in (6, 60, 600):
+            tp = [0.01 + 0.001 * i for i in range(n_tp)]
+            sources = {
+                "bandit": ContextualBandit(tp, [1.0, 1.25, 1.5, 2.0], [10, 15, 20]),
+                "linear": LinearBandit(tp, [1.0, 1.25, 1.5, 2.0], [10, 15, 20]),
+                "risk": RiskManager(max_drawdown=500.0, max_positions=3),
+            }
+            checkpointer = Checkpointer(FileCheckpointStore(Path(tmp) / f"{n_tp}.npz"), sources)
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                checkpointer.capture()
+            capture_us = (time.perf_counter() - start) / args.iterations * 1e6
+            bandit_only = Checkpointer(FileCheckpointStore(Path(tmp) / "b.npz"), {"bandit": sources["bandit"]})
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                bandit_only.capture()
+            bandit_us = (time.perf_counter() - start) / args.iterations * 1e6
+            writes = max(1, args.iterations // 100)
+            start = time.perf_counter()
+            for _ in range(writes):
+                asyncio.run(checkpointer.checkpoint())
+            write_ms = (time.perf_counter() - start) / writes * 1e3
+            print(
+                f"arms {len(sources['bandit'].arms):6d}  capture bandit {bandit_us:7.2f} us  "
+                f"bandit+linear+risk {capture_us:8.2f} us  encode+write {write_ms:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
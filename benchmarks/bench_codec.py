@@ -0,0 +1,53 @@
+"""인제스트 와이어 코덱 벤치마크.
+
+``python -m benchmarks.bench_codec``로 실행한다. 대표적인 체결 메시지(피처
+4개, 바 0개/2개)에 대해 JSON과 바이너리 코덱의 메시지당 바이트 수와
+인코딩·디코딩 시간(ns)을 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from backend.services.ingest.processors.aggregator import Bar
+from backend.services.ingest.publishers.codec import decode_message, encode_binary, encode_json
+
+
+def make_payload(n_bars: int) -> Dict[str, Any]:
+    bars = [Bar("AAPL", 34_200.0 + i, f"{60 ** i}s", 190.1, 190.4, 189.9, 190.2, 1_250.0, 190.15).__dict__ for i in range(n_bars)]
+    return {
+        "type": "trade",
+        "symbol": "AAPL",
+        "price": 190.23,
+        "volume": 300.0,
+        "ts": 34_201.125,
+        "features": {"ret_5s": 0.0021, "ret_15s": 0.0043, "ret_60s": 0.011, "vol_spike": 3.7},
+        "bars": bars,
+    }
+
+
+def _ns_per_call(fn: Callable[[Any], Any], arg: Any, n: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        fn(arg)
+    return (time.perf_counter_ns() - start) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for n_bars in (0, 2):
+        payload = make_payload(n_bars)
+        for name, encode in (("json", encode_json), ("binary", encode_binary)):
+            message = encode(payload)
+            assert decode_message(message) == payload
+            enc_ns = _ns_per_call(encode, payload, args.iterations)
+            dec_ns = _ns_per_call(decode_message, message, args.iterations)
+            print(f"bars={n_bars} {name:>6}: {len(message):>4} B/msg  encode {enc_ns:>7.0f} ns  decode {dec_ns:>7.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""브래킷 청산 평가 지연 벤치마크.
+
+``python -m benchmarks.bench_exits``로 실행한다. 포지션 수백 개를 연
+:class:`ExitManager`에 가격 묶음을 넣고 :meth:`~ExitManager.observe` +
+:meth:`~ExitManager.evaluate` 한 번의 시간(us)을 출력한다. 아무 조건도
+걸리지 않는 가격만 넣으므로 순수 평가 비용이다. 비교용으로 포지션마다
+파이썬 루프로 TP/SL/마감을 확인하는 방식도 잰다.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.exec.bandit import BanditArm
+from backend.services.exec.exits import ExitManager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    arm = BanditArm(0.05, 1.5, 30)
+    exits = ExitManager(router=None, risk=None, clock=lambda: 0.0)
+    symbols = [f"S{i:04d}" for i in range(args.positions)]
+    for symbol in symbols:
+        exits.open(symbol, 10, 100.0, arm, atr=1.0, ts=0.0)
+    rng = np.random.default_rng(0)
+    batches = [
+        (list(rng.choice(symbols, args.batch, replace=False)), rng.uniform(99.0, 101.0, args.batch))
+        for _ in range(64)
+    ]
+
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        names, prices = batches[i % len(batches)]
+        exits.observe(names, prices)
+        assert not exits.evaluate(1.0)
+    vectorized = (time.perf_counter() - start) / args.iterations * 1e6
+
+    brackets = {symbol: exits.brackets(symbol) for symbol in symbols}
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        names, prices = batches[i % len(batches)]
+        for name, price in zip(names, prices.tolist()):
+            brackets[name]["last"] = price
+        hits = [
+            s for s, b in brackets.items() if b["last"] >= b["tp"] or b["last"] <= b["sl"] or 1.0 >= b["deadline"]
+        ]
+        assert not hits
+    looped = (time.perf_counter() - start) / args.iterations * 1e6
+
+    print(f"{args.positions} open positions, {args.batch} prices per batch")
+    print(f"observe + evaluate (vectorized) {vectorized:8.2f} us")
+    print(f"per-position python loop        {looped:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""인제스트 핫패스 마이크로벤치마크.
+
+``python -m benchmarks.bench_ingest``로 실행한다. 틱마다 ``asyncio.Lock``을
+두 번 잡던 이전 방식(``process_trade`` + ``get_bars``)과 현재의 락 없는
+단일 작성자 방식(``process_trade`` + ``drain_bars``)의 초당 틱 처리량을
+같은 틱 시퀀스로 비교한다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Sequence, Tuple
+
+from backend.services.ingest.processors.aggregator import Bar, BarAggregator
+
+Tick = Tuple[str, float, float, float]
+
+
+class _LockedAggregator:
+    """비교용: 기존처럼 틱과 조회마다 락을 잡는 래퍼."""
+
+    def __init__(self, intervals: Sequence[int]) -> None:
+        self._inner = BarAggregator(intervals)
+        self._lock = asyncio.Lock()
+
+    async def process_trade(self, symbol: str, price: float, volume: float, ts: float) -> None:
+        async with self._lock:
+            self._inner.process_trade(symbol, price, volume, ts)
+
+    async def get_bars(self) -> List[Bar]:
+        async with self._lock:
+            return list(self._inner.drain_bars())
+
+
+def make_ticks(n: int, symbols: int, seed: int = 0) -> List[Tick]:
+    rng = random.Random(seed)
+    names = [f"SYM{i:04d}" for i in range(symbols)]
+    ts = 34_200.0
+    ticks: List[Tick] = []
+    for _ in range(n):
+        ts += rng.expovariate(20_000.0)
+        ticks.append((rng.choice(names), rng.uniform(10, 20), float(rng.randint(1, 500)), ts))
+    return ticks
+
+
+async def _run_locked(ticks: Sequence[Tick]) -> float:
+    agg = _LockedAggregator((1, 60))
+    start = time.perf_counter()
+    for symbol, price, volume, ts in ticks:
+        await agg.process_trade(symbol, price, volume, ts)
+        await agg.get_bars()
+    return time.perf_counter() - start
+
+
+async def _run_lock_free(ticks: Sequence[Tick]) -> float:
+    agg = BarAggregator((1, 60))
+    start = time.perf_counter()
+    for symbol, price, volume, ts in ticks:
+        agg.process_trade(symbol, price, volume, ts)
+        agg.drain_bars()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500_000)
+    parser.add_argument("--symbols", type=int, default=3_000)
+    args = parser.parse_args()
+
+    ticks = make_ticks(args.ticks, args.symbols)
+    for name, runner in (("locked (before)", _run_locked), ("lock-free (after)", _run_lock_free)):
+        elapsed = asyncio.run(runner(ticks))
+        print(f"{name:>18}: {len(ticks) / elapsed:>12,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
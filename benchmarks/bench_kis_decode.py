@@ -0,0 +1,85 @@
+"""KIS 실시간 프레임 디코더 벤치마크.
+
+``python -m benchmarks.bench_kis_decode``로 실행한다. ``--frames``로 줄 단위
+녹화 프레임 파일을 주면 그 프레임을, 없으면 해외 체결가(HDFSCNT0) 프레임을
+합성해 ``decode``/``decode_many``의 프레임당 시간과 초당 프레임 수를 출력한다.
+비교 기준으로 같은 이벤트를 이벤트당 JSON 메시지로 보냈을 때의
+``json.loads`` 총 시간을 프레임 수로 나눈 값도 함께 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import List
+
+from backend.adapters.kis_codec import OVERSEAS_TRADE, KISFrameDecoder
+
+SYMBOLS = ("AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "META", "GOOG", "AMD")
+
+
+def make_frames(n: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    frames = []
+    for i in range(n):
+        count = 1 if rng.random() < 0.8 else rng.randint(2, 4)
+        records = []
+        for j in range(count):
+            values = dict.fromkeys(OVERSEAS_TRADE.fields, "0")
+            symbol = rng.choice(SYMBOLS)
+            clock = 223000 + (i + j) % 3000
+            values.update(
+                {
+                    "RSYM": f"DNAS{symbol}",
+                    "SYMB": symbol,
+                    "KYMD": "20240105",
+                    "KHMS": f"{clock:06d}",
+                    "LAST": f"{rng.uniform(50, 500):.4f}",
+                    "EVOL": str(rng.randint(1, 5_000)),
+                }
+            )
+            records.append("^".join(values[name] for name in OVERSEAS_TRADE.fields))
+        frames.append(f"0|{OVERSEAS_TRADE.tr_id}|{count:03d}|{'^'.join(records)}")
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", help="newline-delimited recorded frames")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    if args.frames:
+        with open(args.frames, encoding="utf-8") as fp:
+            frames = [line.rstrip("\n") for line in fp if line.strip()]
+    else:
+        frames = make_frames(args.count)
+    decoder = KISFrameDecoder()
+    events = [event for frame in frames for event in decoder.decode(frame)]
+    as_json = [json.dumps(event) for event in events]
+
+    def report(name: str, elapsed: float) -> None:
+        per_frame = elapsed / len(frames) * 1e9
+        print(f"{name:>12}: {per_frame:>7.0f} ns/frame  {len(frames) / elapsed:>11,.0f} frames/s")
+
+    start = time.perf_counter()
+    for payload in as_json:
+        json.loads(payload)
+    report("json.loads", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for frame in frames:
+        decoder.decode(frame)
+    report("decode", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(frames), args.batch):
+        decoder.decode_many(frames[i : i + args.batch])
+    report("decode_many", time.perf_counter() - start)
+    print(f"{len(frames):,} frames, {len(events):,} events")
+
+
+if __name__ == "__main__":
+    main()
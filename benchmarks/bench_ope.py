@@ -0,0 +1,60 @@
+"""오프폴리시 평가 처리량 벤치마크.
+
+``python -m benchmarks.bench_ope``로 실행한다. 합성 결정 로그(기본 100만 행,
+설정 격자 72개 팔)에 대해 후보 정책 수십 개의 IPS/SNIPS/DR 점추정과 프로세스
+풀 푸아송 부트스트랩 신뢰구간 계산 시간을 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from backend.services.aiopt.decision_log import LoggedDecisions
+from backend.services.aiopt.ope import FixedArmPolicy, LinearPolicy, evaluate
+from backend.services.exec.linear_bandit import CONTEXT_FEATURES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--arms", type=int, default=72)
+    parser.add_argument("--policies", type=int, default=24)
+    parser.add_argument("--boot", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    d = len(CONTEXT_FEATURES)
+    contexts = np.column_stack((np.ones(args.rows), rng.normal(size=(args.rows, d - 1))))
+    theta = rng.normal(scale=0.1, size=(args.arms, d))
+    actions = rng.integers(args.arms, size=args.rows).astype(np.int32)
+    rewards = (contexts @ theta.T)[np.arange(args.rows), actions] + rng.normal(size=args.rows)
+    log = LoggedDecisions(contexts, actions, np.full(args.rows, 1.0 / args.arms), rewards, args.arms)
+
+    policies = {f"fixed{i}": FixedArmPolicy(i, args.arms, epsilon=0.1) for i in range(args.policies // 2)}
+    for i in range(args.policies - len(policies)):
+        policies[f"linear{i}"] = LinearPolicy(theta + rng.normal(scale=0.05, size=theta.shape), temperature=0.05)
+
+    start = time.perf_counter()
+    evaluate(log, policies, workers=1)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    evaluate(log, policies, workers=args.workers)
+    pooled = time.perf_counter() - start
+    start = time.perf_counter()
+    results = evaluate(log, policies, n_boot=args.boot, workers=args.workers, seed=0)
+    boot = time.perf_counter() - start
+
+    print(f"{args.rows:,} rows x {len(policies)} policies x {args.arms} arms")
+    print(f"point estimates  1 process {single:6.2f} s  {args.workers} workers {pooled:6.2f} s")
+    print(f"with {args.boot} bootstrap replicates ({args.workers} workers) {boot:6.2f} s")
+    best = max(results.values(), key=lambda estimate: estimate.dr)
+    lo, hi = best.ci["dr"]
+    print(f"best by DR: {best.policy} {best.dr:.4f} [{lo:.4f}, {hi:.4f}] ess={best.ess:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""메모리 매핑 틱 재생 처리량 벤치마크.
+
+``python -m benchmarks.bench_replay``로 실행한다. 임시 틱 파일을 만든 뒤
+(1) ``TickFile.iter_batches``로 배치를 읽어 가격·거래량을 집계하는 디코드
+처리량과 (2) ``ReplayMarketDataFeed``가 이벤트 사전을 콜백으로 전달하는
+처리량을 초당 틱 수로 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from backend.adapters.tick_replay import ReplayMarketDataFeed, TickFile, make_records, write_tick_file
+
+
+def build_file(path: Path, n: int, symbols: int) -> None:
+    rng = np.random.default_rng(0)
+    ts = 34_200.0 + np.cumsum(rng.exponential(1 / 20_000, n))
+    records = make_records(ts, rng.integers(0, symbols, n), rng.uniform(10, 20, n), rng.integers(1, 500, n))
+    write_tick_file(path, [f"SYM{i:04d}" for i in range(symbols)], records)
+
+
+def bench_decode(path: Path) -> float:
+    tick_file = TickFile(path)
+    start = time.perf_counter()
+    notional = 0.0
+    for batch in tick_file.iter_batches():
+        notional += float(np.dot(batch["price"], batch["volume"]))
+    return len(tick_file) / (time.perf_counter() - start)
+
+
+def bench_events(path: Path, limit: int) -> float:
+    count = 0
+
+    async def on_event(event):
+        nonlocal count
+        count += 1
+        if count >= limit:
+            await feed.stop()
+
+    feed = ReplayMarketDataFeed(path, on_event, batch_size=8_192)
+    start = time.perf_counter()
+    asyncio.run(feed.run())
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=10_000_000)
+    parser.add_argument("--symbols", type=int, default=3_000)
+    parser.add_argument("--event-ticks", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.ticks"
+        build_file(path, args.ticks, args.symbols)
+        print(f"batch decode : {bench_decode(path):>14,.0f} ticks/s")
+        print(f"event replay : {bench_events(path, args.event_ticks):>14,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""사전 리스크 검사 지연 벤치마크.
+
+``python -m benchmarks.bench_risk``로 실행한다. 모든 한도를 켠
+:class:`RiskManager`에 대해 잠금 없는 :meth:`~RiskManager.check`와
+검사·예약을 함께 하는 :meth:`~RiskManager.try_open` + :meth:`~RiskManager.release`
+왕복의 호출당 시간(us)을 출력한다. 비교용으로 ``asyncio.Lock``을 잡고
+읽던 기존 ``can_open_new`` 방식도 잰다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from backend.services.exec.risk import RiskLimits, RiskManager
+
+
+def _us_per_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def _locked_reads(n: int) -> float:
+    lock = asyncio.Lock()
+    state = {"enabled": True, "loss": 0.0, "positions": 0}
+    start = time.perf_counter()
+    for _ in range(n):
+        async with lock:
+            _ = state["enabled"] and state["loss"] > -500.0 and state["positions"] < 3
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    args = parser.parse_args()
+
+    limits = RiskLimits(
+        max_order_qty=1_000,
+        max_order_notional=50_000,
+        max_symbol_notional=100_000,
+        max_gross_notional=10_000_000,
+        order_rate=1e9,
+        order_burst=1e9,
+    )
+    risk = RiskManager(max_drawdown=500.0, max_positions=10_000, limits=limits)
+    risk.update_cash(1e12)
+    symbols = [f"S{i:04d}" for i in range(args.symbols)]
+    for symbol in symbols:
+        risk.try_open(symbol, 10, 100.0)
+
+    check = _us_per_call(lambda: risk.check("S0042", 10, 100.0), args.iterations)
+
+    def round_trip() -> None:
+        risk.try_open("S0042", 10, 100.0)
+        risk.release("S0042")
+
+    reserve = _us_per_call(round_trip, args.iterations // 10) / 2
+    locked = asyncio.run(_locked_reads(args.iterations))
+    print(f"{args.symbols} symbols with exposure, all limits enabled")
+    print(f"check (lock-free read)          {check:6.2f} us")
+    print(f"try_open/release (per call)     {reserve:6.2f} us")
+    print(f"asyncio.Lock read, uncontended (old path) {locked:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""SignalModel 추론 지연 벤치마크.
+
+``python -m benchmarks.bench_signal_model``로 실행한다. 합성 데이터로 학습한
+sklearn 모델과 :class:`CompiledSignalModel`의 단일 행·배치 추론 시간을
+비교하고 두 경로의 최대 확률 차이를 출력한다.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from backend.services.aiopt.model_signal import train_signal_model
+
+
+def _us_per_call(fn: Callable[[], object], n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=1_024)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(5_000, args.features))
+    y = (X @ rng.normal(size=args.features) + rng.normal(scale=0.5, size=len(X)) > 0).astype(int)
+    model = train_signal_model(X, y)
+    compiled = model.compile()
+
+    row = X[:1]
+    row_list = X[0].tolist()
+    batch = X[: args.batch]
+    diff = np.abs(model.predict_proba(X) - compiled.predict_proba(X)).max()
+
+    single_sklearn = _us_per_call(lambda: model.predict_proba(row), args.iterations)
+    single_numpy = _us_per_call(lambda: compiled.predict_proba(row), args.iterations)
+    single_math = _us_per_call(lambda: compiled.predict_one(row_list), args.iterations)
+    n_batch = max(1, args.iterations // 100)
+    batch_sklearn = _us_per_call(lambda: model.predict_proba(batch), n_batch)
+    batch_numpy = _us_per_call(lambda: compiled.predict_proba(batch), n_batch)
+
+    print(f"single row  sklearn {single_sklearn:8.2f} us  compiled/numpy {single_numpy:8.2f} us  predict_one {single_math:6.2f} us")
+    print(f"batch {args.batch:<5} sklearn {batch_sklearn:8.2f} us  compiled/numpy {batch_numpy:8.2f} us")
+    print(f"max |p_sklearn - p_compiled| = {diff:.3e}")
+
+
+if __name__ == "__main__":
+    main()
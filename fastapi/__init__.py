@@ -13,14 +13,14 @@ class APIRouter:
     def __init__(self) -> None:
         self.routes: Dict[Tuple[str, str], RouteHandler] = {}
 
-    def get(self, path: str) -> Callable[[RouteHandler], RouteHandler]:
+    def get(self, path: str, **_: Any) -> Callable[[RouteHandler], RouteHandler]:
         def decorator(func: RouteHandler) -> RouteHandler:
             self.routes[("GET", path)] = func
             return func
 
         return decorator
 
-    def post(self, path: str) -> Callable[[RouteHandler], RouteHandler]:
+    def post(self, path: str, **_: Any) -> Callable[[RouteHandler], RouteHandler]:
         def decorator(func: RouteHandler) -> RouteHandler:
             self.routes[("POST", path)] = func
             return func
@@ -46,6 +46,13 @@ class _Response:
     def json(self) -> Any:
         return self._json
 
+    @property
+    def text(self) -> str:
+        body = getattr(self._json, "body", None)
+        if body is not None:
+            return body.decode("utf-8")
+        return str(self._json)
+
 
 class HTTPException(Exception):
     """간단한 HTTPException 구현."""
@@ -0,0 +1,16 @@
+"""Minimal response classes for the FastAPI stub."""
+from __future__ import annotations
+
+
+class Response:
+    media_type = "text/plain"
+
+    def __init__(self, content: str = "", status_code: int = 200, media_type: str | None = None) -> None:
+        self.body = content.encode("utf-8")
+        self.status_code = status_code
+        if media_type is not None:
+            self.media_type = media_type
+
+
+class PlainTextResponse(Response):
+    media_type = "text/plain"
@@ -0,0 +1,41 @@
+from backend.services.ingest.processors.aggregator import BarAggregator
+
+
+def test_bars_close_on_aligned_boundaries_with_vwap():
+    agg = BarAggregator([60])
+    agg.process_trade("AAPL", 10.0, 100, 120.5)
+    agg.process_trade("AAPL", 12.0, 300, 150.0)
+    agg.process_trade("AAPL", 9.0, 100, 179.9)
+    assert len(agg.drain_bars()) == 0
+    agg.process_trade("AAPL", 11.0, 50, 180.0)
+    (bar,) = agg.drain_bars()
+    assert (bar.ts, bar.interval) == (120, "60s")
+    assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (10.0, 12.0, 9.0, 9.0, 500)
+    assert bar.vwap == (10.0 * 100 + 12.0 * 300 + 9.0 * 100) / 500
+    assert len(agg.drain_bars()) == 0
+
+
+def test_ffill_policy_emits_flat_bars_for_empty_intervals():
+    agg = BarAggregator([1], fill_policy="ffill")
+    agg.process_trade("AAPL", 10.0, 1, 100.2)
+    agg.process_trade("AAPL", 11.0, 1, 103.7)
+    bars = agg.drain_bars()
+    assert [bar.ts for bar in bars] == [100, 101, 102]
+    assert [bar.volume for bar in bars] == [1, 0.0, 0.0]
+    assert all(bar.close == 10.0 for bar in bars)
+
+    agg.flush(105.0)
+    bars = agg.drain_bars()
+    assert [bar.ts for bar in bars] == [103, 104]
+    assert bars[0].close == 11.0 and bars[1].volume == 0.0
+
+
+def test_gap_flush_rejects_late_ticks_for_closed_bucket():
+    agg = BarAggregator([60])
+    agg.process_trade("AAPL", 10.0, 1, 0.0)
+    agg.flush(61.0)
+    agg.process_trade("AAPL", 9.0, 1, 59.0)
+    agg.process_trade("AAPL", 11.0, 1, 70.0)
+    agg.flush(121.0)
+    assert [bar.ts for bar in agg.drain_bars()] == [0, 60]
+    assert agg.late_trades == 1
@@ -1,3 +1,5 @@
+import numpy as np
+
 from backend.services.exec.bandit import ContextualBandit
 
 
@@ -8,3 +10,53 @@ def test_bandit_prefers_best_arm():
     arm.trials = 11
     choice = bandit.select()
     assert choice is arm
+
+
+def test_arm_views_write_through_to_bandit_state():
+    bandit = ContextualBandit([0.03, 0.05], [1.0, 1.5], [10], seed=1)
+    arm = bandit.arms[3]
+    bandit.update(arm, 1.0)
+    bandit.update(arm, -1.0)
+    assert (arm.successes, arm.trials) == (2.1, 4.0)
+    assert bandit.alpha[3] == 2.1 and bandit.beta[3] == 4.0 - 2.1
+    arm.trials = 10.0
+    assert bandit.beta[3] == 10.0 - 2.1
+
+
+def test_seeded_select_many_is_reproducible_and_prefers_best_arm():
+    def run():
+        bandit = ContextualBandit([0.03, 0.04, 0.05], [1.0, 1.5], [10, 15], epsilon=0.0, seed=7)
+        best = bandit.arms[5]
+        best.successes, best.trials = 200.0, 201.0
+        return bandit, best, bandit.select_many(64)
+
+    bandit, best, picks = run()
+    assert [arm.index for arm in picks] == [arm.index for arm in run()[2]]
+    assert sum(arm is best for arm in picks) >= 60
+    assert bandit.select_many(0) == []
+
+    bandit.epsilon = 1.0
+    explored = {arm.index for arm in bandit.select_many(500)}
+    assert explored == set(range(len(bandit.arms)))
+
+
+def test_selection_probabilities_are_cached_until_posterior_changes_and_never_zero():
+    bandit = ContextualBandit([0.03, 0.05], [1.0], [10], epsilon=0.0, seed=0)
+    bandit.arms[0].successes, bandit.arms[0].trials = 500.0, 501.0
+    probs = bandit.selection_probabilities()
+    assert probs is bandit.selection_probabilities()
+    assert (probs > 0).all() and abs(probs.sum() - 1) < 1e-9
+    bandit.update(bandit.arms[1], 1.0)
+    assert bandit.selection_probabilities() is not probs
+
+
+def test_select_logged_samples_from_the_cached_probability_vector():
+    bandit = ContextualBandit([0.03, 0.05, 0.08], [1.0], [10], epsilon=0.1, seed=3)
+    bandit.arms[0].successes, bandit.arms[0].trials = 30.0, 40.0
+    probs = bandit.selection_probabilities()
+    counts = np.zeros(len(bandit.arms))
+    for _ in range(4_000):
+        arm, probability = bandit.select_logged()
+        assert probability == probs[arm.index]
+        counts[arm.index] += 1
+    np.testing.assert_allclose(counts / counts.sum(), probs, atol=0.03)
@@ -0,0 +1,196 @@
+import asyncio
+
+import numpy as np
+
+from backend.services.exec.bandit import ContextualBandit
+from backend.services.exec.checkpoint import Checkpointer, FileCheckpointStore, RedisCheckpointStore
+from backend.services.exec.exits import ExitManager
+from backend.services.exec.linear_bandit import LinearBandit, build_context
+from backend.services.exec.loop import StrategyLoop
+from backend.services.exec.risk import RiskManager
+from backend.services.exec.router import OrderRouter
+from backend.services.signal.surge import SurgeDetector
+
+# 2024-03-04 10:15 America/New_York
+SESSION_TS = 1_709_565_300.0
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeHashRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+
+def _sources():
+    bandit = ContextualBandit([0.03, 0.05], [1.0, 1.5], [10], seed=0)
+    linear = LinearBandit([0.03, 0.05], [1.0, 1.5], [10], seed=0)
+    return bandit, linear, RiskManager(max_drawdown=100.0, max_positions=3)
+
+
+def test_file_checkpoint_roundtrip_keeps_arm_views_and_same_session_risk(tmp_path):
+    async def scenario():
+        bandit, linear, risk = _sources()
+        bandit.update(bandit.arms[2], 1.0)
+        bandit.epsilon = 0.05
+        x = build_context({"vol_spike": 4.0}, SESSION_TS)
+        linear.update(linear.arms[1], 2.0, x)
+        await risk.register_position_change(2)
+        await risk.register_fill(-150.0)
+
+        clock = FakeClock(SESSION_TS)
+        store = FileCheckpointStore(tmp_path / "state" / "strategy.npz")
+        await Checkpointer(store, {"bandit": bandit, "linear": linear, "risk": risk}, clock=clock).checkpoint()
+        assert [p.name for p in (tmp_path / "state").iterdir()] == ["strategy.npz"]
+
+        fresh_bandit, fresh_linear, fresh_risk = _sources()
+        arm = fresh_bandit.arms[2]
+        clock.now += 60.0
+        restorer = Checkpointer(store, {"bandit": fresh_bandit, "linear": fresh_linear, "risk": fresh_risk}, clock=clock)
+        assert await restorer.restore(max_age=300.0)
+        assert (arm.successes, arm.trials, fresh_bandit.epsilon) == (2.0, 3.0, 0.05)
+        np.testing.assert_allclose(fresh_linear.theta, linear.theta)
+        np.testing.assert_array_equal(fresh_linear.probabilities(x) > 0, linear.probabilities(x) > 0)
+        snapshot = await fresh_risk.snapshot()
+        assert (snapshot.daily_loss, snapshot.positions, snapshot.trading_enabled) == (-150.0, 2, False)
+
+        clock.now += 600.0
+        stale_bandit, stale_linear, stale_risk = _sources()
+        stale = Checkpointer(store, {"bandit": stale_bandit, "linear": stale_linear, "risk": stale_risk}, clock=clock)
+        assert not await stale.restore(max_age=300.0)
+        assert stale_bandit.arms[2].trials == 2.0 and not stale_linear.theta.any()
+        snapshot = await stale_risk.snapshot()
+        assert (snapshot.daily_loss, snapshot.positions, snapshot.trading_enabled) == (-150.0, 0, False)
+
+    asyncio.run(scenario())
+
+
+def test_redis_checkpoint_resets_daily_loss_on_new_session_and_skips_other_grid():
+    async def scenario():
+        bandit, _, risk = _sources()
+        bandit.update(bandit.arms[0], 1.0)
+        await risk.register_position_change(1)
+        await risk.register_fill(-40.0)
+        redis = FakeHashRedis()
+        clock = FakeClock(SESSION_TS)
+        store = RedisCheckpointStore(redis, "ckpt")
+        await Checkpointer(store, {"bandit": bandit, "risk": risk}, clock=clock).checkpoint()
+        assert set(redis.hashes["ckpt"]) == {"blob", "created_at"}
+
+        other_grid = ContextualBandit([0.04], [1.0], [10])
+        fresh_risk = RiskManager(max_drawdown=100.0, max_positions=3)
+        clock.now += 18 * 3600.0  # 다음 거래일 오전 4시 15분
+        await Checkpointer(store, {"bandit": other_grid, "risk": fresh_risk}, clock=clock).restore(max_age=86_400.0)
+        assert other_grid.arms[0].successes == 1.0
+        snapshot = await fresh_risk.snapshot()
+        assert (snapshot.daily_loss, snapshot.positions, snapshot.trading_enabled) == (0.0, 1, True)
+
+    asyncio.run(scenario())
+
+
+def test_periodic_run_writes_until_stopped(tmp_path):
+    async def scenario():
+        bandit, _, risk = _sources()
+        checkpointer = Checkpointer(FileCheckpointStore(tmp_path / "s.npz"), {"bandit": bandit, "risk": risk}, interval=0.01)
+        task = asyncio.create_task(checkpointer.run())
+        await asyncio.sleep(0.05)
+        first = checkpointer.last_written
+        assert first is not None
+        checkpointer.stop()
+        await asyncio.wait_for(task, 1)
+        assert checkpointer.last_written >= first
+
+    asyncio.run(scenario())
+
+
+class SellBroker:
+    def __init__(self):
+        self.orders = []
+
+    async def place_order(self, symbol, side, qty, meta=None, **kwargs):
+        self.orders.append((symbol, side, qty))
+        return {"order_id": str(len(self.orders))}
+
+
+def test_exit_brackets_and_exact_reservations_survive_restart(tmp_path):
+    async def scenario():
+        clock = FakeClock(SESSION_TS)
+        linear = LinearBandit([0.03, 0.05], [1.0], [10], seed=0)
+        risk = RiskManager(max_drawdown=1_000.0, max_positions=3)
+        exits = ExitManager(OrderRouter(SellBroker(), risk), risk, linear, clock=clock)
+        decision = exits.policy.choose({"vol_spike": 4.0}, SESSION_TS)
+        assert risk.try_open("AAPL", 10, 100.0) is None
+        exits.open("AAPL", 10, 99.5, decision.arm, atr=1.0, decision=decision)
+        assert risk.try_open("MSFT", 5, None) is None
+        store = FileCheckpointStore(tmp_path / "strategy.npz")
+        await Checkpointer(store, {"linear": linear, "risk": risk, "exits": exits}, clock=clock).checkpoint()
+
+        fresh_linear = LinearBandit([0.03, 0.05], [1.0], [10], seed=0)
+        fresh_risk = RiskManager(max_drawdown=1_000.0, max_positions=3)
+        broker = SellBroker()
+        router = OrderRouter(broker, fresh_risk)
+        fresh_exits = ExitManager(router, fresh_risk, fresh_linear, clock=clock)
+        clock.now += 60.0
+        sources = {"linear": fresh_linear, "risk": fresh_risk, "exits": fresh_exits}
+        assert await Checkpointer(store, sources, clock=clock).restore()
+        assert fresh_exits.symbols == ["AAPL"]
+        assert fresh_exits.brackets("AAPL") == exits.brackets("AAPL")
+
+        async def no_events():
+            return
+            yield
+
+        loop = StrategyLoop(no_events(), router, fresh_linear, SurgeDetector(), exits=fresh_exits)
+        await loop.run()
+        assert loop.gate.state("AAPL")["open_position"]
+
+        theta = fresh_linear.theta.copy()
+        fresh_exits.on_prices(["AAPL"], [90.0])
+        await fresh_exits.drain()
+        assert broker.orders == [("AAPL", "SELL", 10)]
+        assert not np.array_equal(fresh_linear.theta, theta)
+        assert dict(fresh_risk.symbol_notional) == {} and fresh_risk.current.positions == 1
+        assert fresh_risk.release("MSFT") == 0.0 and fresh_risk.current.positions == 0
+
+    asyncio.run(scenario())
+
+
+def test_bracket_restored_across_grid_change_does_not_credit_another_arm(tmp_path):
+    async def scenario():
+        clock = FakeClock(SESSION_TS)
+        linear = LinearBandit([0.03, 0.05], [1.0], [10], seed=0)
+        risk = RiskManager(max_drawdown=1_000.0, max_positions=3)
+        exits = ExitManager(OrderRouter(SellBroker(), risk), risk, linear, clock=clock)
+        decision = exits.policy.choose({"vol_spike": 4.0}, SESSION_TS)
+        exits.open("AAPL", 10, 100.0, linear.arms[1], atr=1.0, decision=decision)
+        store = FileCheckpointStore(tmp_path / "strategy.npz")
+        await Checkpointer(store, {"exits": exits}, clock=clock).checkpoint()
+
+        regridded = LinearBandit([0.02, 0.04], [1.0], [10], seed=0)
+        broker = SellBroker()
+        fresh_risk = RiskManager(max_drawdown=1_000.0, max_positions=3)
+        fresh_exits = ExitManager(OrderRouter(broker, fresh_risk), fresh_risk, regridded, clock=clock)
+        assert await Checkpointer(store, {"exits": fresh_exits}, clock=clock).restore()
+        assert fresh_exits.brackets("AAPL") == exits.brackets("AAPL")
+
+        theta = regridded.theta.copy()
+        fresh_exits.observe(["AAPL"], [106.0])
+        (signal,) = fresh_exits.evaluate()
+        closed = await fresh_exits.execute(signal)
+        assert broker.orders == [("AAPL", "SELL", 10)]
+        assert closed.signal.decision is None and closed.signal.arm not in regridded.arms
+        np.testing.assert_array_equal(regridded.theta, theta)
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from backend.services.ingest.processors.aggregator import Bar
+from backend.services.ingest.publishers.codec import CodecError, decode_message, encode_binary, encode_json
+
+
+def _payload():
+    bar = Bar("AAPL", 120.0, "60s", 10.0, 12.0, 9.0, 11.0, 500.0, 10.9)
+    return {
+        "type": "trade",
+        "symbol": "AAPL",
+        "price": 11.0,
+        "volume": 50.0,
+        "ts": 180.25,
+        "features": {"ret_5s": 0.01, "vol_spike": 3.5, "custom_z": -1.25},
+        "bars": [bar.__dict__],
+    }
+
+
+def test_binary_round_trip_matches_json_consumer_view():
+    payload = _payload()
+    encoded = encode_binary(payload)
+    assert len(encoded) < len(encode_json(payload))
+    assert decode_message(encoded) == json.loads(encode_json(payload)) == payload
+    assert decode_message(encode_json(payload)) == payload
+
+
+def test_non_trade_payloads_fall_back_to_json_and_corruption_is_reported():
+    heartbeat = {"type": "heartbeat", "ts": 1.0}
+    assert decode_message(encode_binary(heartbeat)) == heartbeat
+    with pytest.raises(CodecError):
+        decode_message(encode_binary(_payload())[:-3])
@@ -0,0 +1,47 @@
+from backend.services.exec.entry_gate import EntryGate, TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_timer_wheel_fires_after_deadline_even_across_full_rotations():
+    wheel = TimerWheel(tick=1.0, slots=8, start=0.0)
+    wheel.schedule("a", 2.5)
+    wheel.schedule("b", 20.0)
+    assert wheel.advance(2.9) == []
+    assert wheel.advance(3.0) == ["a"]
+    assert wheel.advance(19.9) == []
+    assert wheel.advance(100.0) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_gate_suppresses_in_flight_open_and_cooldown_then_expires():
+    clock = FakeClock()
+    gate = EntryGate(cooldown=30.0, tick=0.5, slots=16, clock=clock)
+    assert gate.allow("AAPL")
+    gate.on_dispatch("AAPL")
+    assert not gate.allow("AAPL") and gate.allow("MSFT")
+
+    gate.on_outcome("AAPL", filled=True)
+    assert not gate.allow("AAPL")
+    gate.on_exit("AAPL")
+    clock.now += 29.0
+    assert not gate.allow("AAPL")
+    clock.now += 1.5
+    assert gate.allow("AAPL")
+    assert len(gate) == 0
+
+    # 실패한 주문도 쿨다운을 건다.
+    gate.on_dispatch("TSLA")
+    gate.on_outcome("TSLA", filled=False)
+    assert not gate.allow("TSLA")
+    assert gate.state("TSLA")["cooldown_until"] == clock.now + 30.0
+    assert gate.suppressed() == {
+        "AAPL": {"in_flight": 1, "open_position": 1, "cooldown": 1},
+        "TSLA": {"cooldown": 1},
+    }
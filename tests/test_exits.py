@@ -0,0 +1,162 @@
+import asyncio
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from backend.services.exec.bandit import BanditArm, ContextualBandit
+from backend.services.exec.exits import OPEN_BRACKETS, STOP_LOSS, TAKE_PROFIT, TIME_STOP, ExitManager
+from backend.services.exec.loop import StrategyLoop
+from backend.services.exec.risk import RiskManager
+from backend.services.exec.router import OrderRouter
+from backend.services.signal.surge import SurgeDetector
+
+ENTRY_FEATURES = {"ret_5s": 0.05, "ret_15s": 0.02, "vol_spike": 4.0}
+
+
+class RecordingBroker:
+    def __init__(self, fail_sells=0, buy_fill=None):
+        self.orders = []
+        self.fail_sells = fail_sells
+        self.buy_fill = buy_fill
+
+    async def place_order(self, symbol, side, qty, meta=None, **kwargs):
+        if side == "SELL" and self.fail_sells:
+            self.fail_sells -= 1
+            raise RuntimeError("rejected")
+        self.orders.append((symbol, side, qty, meta))
+        payload = {"order_id": f"{symbol}-{len(self.orders)}"}
+        if side == "BUY" and self.buy_fill is not None:
+            payload["fill_price"] = self.buy_fill
+        return payload
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_vectorized_brackets_close_through_router_and_feed_risk_and_bandit():
+    async def scenario():
+        clock = FakeClock()
+        broker = RecordingBroker()
+        risk = RiskManager(max_drawdown=1_000.0, max_positions=10)
+        bandit = ContextualBandit([0.05], [1.0, 2.0], [10], seed=0)
+        tight, wide = bandit.arms
+        router = OrderRouter(broker, risk)
+        closed = []
+        exits = ExitManager(router, risk, bandit, capacity=2, on_closed=closed.append, clock=clock)
+        for symbol, arm in (("AAPL", tight), ("MSFT", wide), ("TSLA", tight)):
+            assert risk.try_open(symbol, 10, 100.0) is None
+            exits.open(symbol, 10, 100.0, arm, atr=2.0)
+        assert len(exits) == 3
+        assert exits.brackets("MSFT")["sl"] == 96.0 and exits.brackets("AAPL")["tp"] == pytest.approx(105.0)
+
+        # AAPL은 TP, MSFT는 SL 위, TSLA는 SL 아래. 추적하지 않는 종목은 무시한다.
+        signals = exits.on_prices(["AAPL", "MSFT", "TSLA", "NVDA"], np.array([105.5, 97.0, 97.5, 1.0]))
+        assert [(s.symbol, s.reason) for s in signals] == [("AAPL", TAKE_PROFIT), ("TSLA", STOP_LOSS)]
+        await exits.drain()
+        assert [o[:3] for o in broker.orders] == [("AAPL", "SELL", 10), ("TSLA", "SELL", 10)]
+        assert [c.pnl for c in closed] == [pytest.approx(55.0), pytest.approx(-25.0)]
+        assert (await risk.snapshot()).daily_loss == pytest.approx(-25.0)
+        assert (tight.successes, tight.trials) == (pytest.approx(2.1), 4.0)
+        assert risk.current.positions == 1 and dict(risk.symbol_notional) == {"MSFT": 1_000.0}
+
+        clock.now += 10 * 60.0
+        assert [s.reason for s in exits.on_prices([], [])] == [TIME_STOP]
+        await exits.drain()
+        assert closed[-1].signal.symbol == "MSFT" and closed[-1].pnl == pytest.approx(-30.0)
+        assert len(exits) == 0 and risk.current.positions == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_exit_order_rearms_with_backoff_and_parks_after_retry_cap():
+    async def scenario():
+        clock = FakeClock()
+        risk = RiskManager(max_drawdown=1_000.0, max_positions=10)
+        broker = RecordingBroker(fail_sells=3)
+        exits = ExitManager(OrderRouter(broker, risk), risk, retry_base=1.0, max_retries=3, clock=clock)
+        assert risk.try_open("AAPL", 5, 50.0) is None
+        exits.open("AAPL", 5, 50.0, BanditArm(0.04, 1.5, 15), atr=1.0)
+        before = exits.brackets("AAPL")
+        exits.on_prices(["AAPL"], [47.0])
+        await exits.drain()
+        after = exits.brackets("AAPL")
+        assert {k: after[k] for k in ("tp", "sl", "deadline")} == {k: before[k] for k in ("tp", "sl", "deadline")}
+
+        # 가격이 여전히 SL 아래여도 재시도 시각 전에는 다시 보내지 않는다.
+        assert exits.on_prices(["AAPL"], [47.0]) == []
+        clock.now += 1.0
+        assert [s.attempts for s in exits.on_prices(["AAPL"], [47.0])] == [1]
+        await exits.drain()
+        clock.now += 1.0
+        assert exits.on_prices([], []) == []
+        clock.now += 1.0
+        exits.on_prices([], [])
+        await exits.drain()
+
+        # 세 번째 실패에서 멈추고 신규 진입을 막는다.
+        clock.now += 3_600.0
+        assert exits.on_prices(["AAPL"], [47.0]) == [] and exits.stuck == ["AAPL"]
+        assert not risk.current.trading_enabled
+        exits.retry("AAPL")
+        assert [s.reason for s in exits.on_prices([], [])] == [STOP_LOSS]
+        await exits.drain()
+        assert len(exits) == 0 and risk.current.positions == 0
+        assert [o[1] for o in broker.orders] == ["SELL"]
+
+    asyncio.run(scenario())
+
+
+def test_strategy_loop_registers_fills_and_reopens_gate_after_exit():
+    async def scenario():
+        # 진입은 신호 가격(100)이 아니라 99.5에 체결된다. 해제는 예약한 명목만큼만 한다.
+        broker = RecordingBroker(buy_fill=99.5)
+        risk = RiskManager(max_drawdown=1_000.0, max_positions=10)
+        router = OrderRouter(broker, risk)
+        bandit = ContextualBandit([0.05], [1.0], [10], epsilon=0.0, seed=0)
+        exits = ExitManager(router, risk, bandit)
+        events = [
+            {"type": "trade", "symbol": "AAPL", "price": 100.0, "features": ENTRY_FEATURES},
+            {"type": "trade", "symbol": "AAPL", "price": 101.0, "features": {}},
+            {"type": "trade", "symbol": "AAPL", "price": 106.0, "features": {}},
+        ]
+
+        async def stream():
+            for event in events:
+                yield event
+                await asyncio.sleep(0.01)
+
+        loop = StrategyLoop(stream(), router, bandit, SurgeDetector(), exits=exits, entry_cooldown=0.0)
+        await asyncio.wait_for(loop.run(), 1)
+        assert [o[:2] for o in broker.orders] == [("AAPL", "BUY"), ("AAPL", "SELL")]
+        assert broker.orders[1][3] == {"reason": TAKE_PROFIT}
+        assert len(exits) == 0 and risk.current.positions == 0
+        assert dict(risk.symbol_notional) == {} and risk.current.gross_notional == 0.0
+        assert loop.gate.state("AAPL")["open_position"] == 0
+        # 진입 결정과 청산 보상이 같은 결정 로그 행에 남는다.
+        assert loop.policy is exits.policy
+        done = loop.policy.log.completed()
+        assert len(done) == 1 and loop.policy.log.pending == 0
+        assert 0.0 < done.propensities[0] <= 1.0 and done.rewards[0] > 0
+        assert bandit.arms[0].trials == 3.0
+
+    asyncio.run(scenario())
+
+
+def test_open_brackets_gauge_sums_live_managers_without_pinning_them():
+    arm = BanditArm(0.05, 1.0, 10)
+    first, second = ExitManager(None, None), ExitManager(None, None)
+    first.open("AAPL", 1, 10.0, arm)
+    second.open("MSFT", 1, 10.0, arm)
+    second.open("TSLA", 1, 10.0, arm)
+    assert OPEN_BRACKETS.labels().value == 3
+    ref = weakref.ref(second)
+    del second
+    gc.collect()
+    assert ref() is None and OPEN_BRACKETS.labels().value == 1
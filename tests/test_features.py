@@ -0,0 +1,50 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from backend.services.ingest.processors.features import FeatureComputer
+
+
+def _reference_update(state, lookbacks, symbol, price, volume):
+    prices, vols = state.setdefault(symbol, (deque(maxlen=max(lookbacks)), deque(maxlen=120)))
+    prices.append(price)
+    vols.append(volume)
+    features = {}
+    for lookback in lookbacks:
+        if len(prices) >= lookback:
+            ref = prices[-lookback]
+            if ref:
+                features[f"ret_{lookback}s"] = (price - ref) / ref
+    avg_vol = sum(vols) / len(vols)
+    if avg_vol > 0:
+        features["vol_spike"] = volume / avg_vol
+    return features
+
+
+def test_update_matches_deque_reference():
+    rng = random.Random(7)
+    lookbacks = (5, 15, 60)
+    computer = FeatureComputer(lookbacks, capacity=2)
+    state = {}
+    for _ in range(2_000):
+        symbol = rng.choice(["AAPL", "MSFT", "TSLA", "NVDA"])
+        price = rng.choice([0.0, rng.uniform(10, 20)])
+        volume = float(rng.randint(0, 500))
+        expected = _reference_update(state, lookbacks, symbol, price, volume)
+        assert computer.update(symbol, price, volume) == expected
+
+
+def test_update_many_matches_sequential_updates():
+    rng = random.Random(11)
+    scalar = FeatureComputer((5, 15))
+    batched = FeatureComputer((5, 15))
+    for _ in range(50):
+        symbols = [rng.choice("ABCDEFG") for _ in range(rng.randint(1, 40))]
+        prices = [rng.uniform(1, 2) for _ in symbols]
+        volumes = [float(rng.randint(1, 100)) for _ in symbols]
+        result = batched.update_many(symbols, prices, volumes)
+        for i, (symbol, price, volume) in enumerate(zip(symbols, prices, volumes)):
+            expected = scalar.update(symbol, price, volume)
+            row = {name: values[i] for name, values in result.items() if not np.isnan(values[i])}
+            assert row == expected
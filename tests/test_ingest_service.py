@@ -0,0 +1,46 @@
+import asyncio
+
+from backend.services.ingest.manager import IngestService
+
+
+class ListPublisher:
+    def __init__(self):
+        self.payloads = []
+
+    async def publish(self, payload):
+        self.payloads.append(payload)
+
+
+def test_flush_closes_quiet_symbol_bars_without_new_ticks():
+    async def scenario():
+        publisher = ListPublisher()
+        service = IngestService(publisher, bar_intervals=(60,))
+        await service.handle_trade({"symbol": "AAPL", "price": 10.0, "volume": 1.0, "ts": 30.0})
+        assert publisher.payloads[-1]["bars"] == []
+        assert await service.flush_bars(59.0) == 0
+        assert await service.flush_bars(61.0) == 1
+        bars = publisher.payloads[-1]
+        assert bars["type"] == "bars" and [(b["symbol"], b["ts"]) for b in bars["bars"]] == [("AAPL", 0)]
+
+        task = asyncio.create_task(service.run_bar_flusher(0.01))
+        await service.handle_trade({"symbol": "AAPL", "price": 11.0, "volume": 1.0, "ts": 90.0})
+        await asyncio.sleep(0.05)
+        task.cancel()
+        assert publisher.payloads[-1]["type"] == "bars" and publisher.payloads[-1]["bars"][0]["ts"] == 60
+
+    asyncio.run(scenario())
+
+
+def test_atr_from_closed_bars_reaches_trade_features():
+    async def scenario():
+        publisher = ListPublisher()
+        service = IngestService(publisher, bar_intervals=(60,), atr_period=2)
+        # 바 600: 10~12, 바 660: 11~14 (직전 종가 11) → TR 2, 3 → ATR 2.5
+        for price, ts in [(10.0, 600.0), (12.0, 610.0), (11.0, 620.0), (14.0, 660.0), (11.0, 670.0)]:
+            await service.handle_trade({"symbol": "AAPL", "price": price, "volume": 1.0, "ts": ts})
+        assert "atr" not in publisher.payloads[-1]["features"]
+        await service.handle_trade({"symbol": "AAPL", "price": 12.5, "volume": 1.0, "ts": 720.0})
+        features = publisher.payloads[-1]["features"]
+        assert features["atr"] == 2.5 and features["atr_pct"] == 2.5 / 12.5
+
+    asyncio.run(scenario())
@@ -0,0 +1,58 @@
+import base64
+import calendar
+import json
+
+import pytest
+
+from backend.adapters.kis_codec import OVERSEAS_TRADE, KISFrameDecoder
+
+
+def _trade_fields(symbol, last, volume, khms):
+    values = dict.fromkeys(OVERSEAS_TRADE.fields, "0")
+    values.update({"RSYM": f"DNAS{symbol}", "SYMB": symbol, "KYMD": "20240105", "KHMS": khms, "LAST": last, "EVOL": volume})
+    return "^".join(values[name] for name in OVERSEAS_TRADE.fields)
+
+
+def test_delimited_trade_frame_with_multiple_records():
+    decoder = KISFrameDecoder()
+    body = "^".join([_trade_fields("AAPL", "190.25", "300", "233001"), _trade_fields("MSFT", "371.5", "12", "233002")])
+    events = decoder.decode(f"0|HDFSCNT0|002|{body}")
+    midnight_kst = calendar.timegm((2024, 1, 5, 0, 0, 0)) - 9 * 3600
+    assert events == [
+        {"type": "trade", "symbol": "AAPL", "price": 190.25, "volume": 300.0, "ts": midnight_kst + 23 * 3600 + 30 * 60 + 1},
+        {"type": "trade", "symbol": "MSFT", "price": 371.5, "volume": 12.0, "ts": midnight_kst + 23 * 3600 + 30 * 60 + 2},
+    ]
+    assert decoder.decode_many([f"0|HDFSCNT0|002|{body}".encode()]) == events
+
+
+def test_control_unknown_and_malformed_frames():
+    decoder = KISFrameDecoder()
+    ping = json.dumps({"header": {"tr_id": "PINGPONG"}})
+    assert decoder.decode(ping)[0]["tr_id"] == "PINGPONG"
+    assert decoder.decode("0|XXXX0000|001|a^b") == [{"type": "raw", "tr_id": "XXXX0000", "raw": "a^b"}]
+    assert decoder.decode("0|HDFSCNT0|002|AAPL^1")[0]["type"] == "raw"
+    # 키 없이 받은 암호화 프레임은 원문 그대로 넘긴다.
+    assert decoder.decode("1|H0GSCNI0|001|abcd")[0]["type"] == "raw"
+
+
+def test_encrypted_execution_notice_round_trip():
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import padding
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    key, iv = "k" * 32, "i" * 16
+    decoder = KISFrameDecoder()
+    subscribed = {"header": {"tr_id": "H0GSCNI0"}, "body": {"rt_cd": "0", "output": {"key": key, "iv": iv}}}
+    assert decoder.decode(json.dumps(subscribed))[0]["type"] == "control"
+
+    fields = dict.fromkeys(decoder._maps["H0GSCNI0"].fields, "")
+    fields.update({"STCK_SHRN_ISCD": "AAPL", "CNTG_QTY": "5", "CNTG_UNPR": "190.5", "STCK_CNTG_HOUR": "233001", "ODER_NO": "42"})
+    plain = "^".join(fields.values()).encode()
+    padder = padding.PKCS7(128).padder()
+    encryptor = Cipher(algorithms.AES(key.encode()), modes.CBC(iv.encode())).encryptor()
+    cipher_text = encryptor.update(padder.update(plain) + padder.finalize()) + encryptor.finalize()
+    frame = f"1|H0GSCNI0|001|{base64.b64encode(cipher_text).decode()}"
+
+    (event,) = decoder.decode_many([frame])
+    assert event["type"] == "execution" and event["symbol"] == "AAPL"
+    assert event["price"] == 190.5 and event["volume"] == 5.0 and event["oder_no"] == "42"
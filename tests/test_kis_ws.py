@@ -0,0 +1,127 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from backend.adapters.kis_ws import KISSubscriptionManager, KISWebSocketClient
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = asyncio.Event()
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self.closed.wait()
+        raise StopAsyncIteration
+
+
+class FakeConnector:
+    def __init__(self):
+        self.sockets = []
+
+    @asynccontextmanager
+    async def __call__(self, url, extra_headers=None, ping_interval=None):
+        ws = FakeSocket()
+        self.sockets.append(ws)
+        yield ws
+
+
+def _keys(messages, tr_type="1"):
+    return sorted(m["body"]["input"]["tr_key"] for m in messages if m["header"]["tr_type"] == tr_type)
+
+
+def test_manager_shards_universe_and_applies_runtime_diff():
+    async def scenario():
+        connector = FakeConnector()
+        manager = KISSubscriptionManager(
+            "key",
+            ["AAPL", "MSFT", "TSLA", "NVDA", "AMD"],
+            on_message=lambda event: None,
+            tr_id="HDFSCNT0",
+            max_per_connection=2,
+            url="wss://test",
+            connect=connector,
+            min_backoff=0.001,
+        )
+        assert [len(symbols) for symbols in manager.assignments()] == [2, 2, 1]
+        task = asyncio.create_task(manager.run())
+        await asyncio.sleep(0.01)
+        assert sorted(k for ws in connector.sockets for k in _keys(ws.sent)) == sorted(manager.symbols)
+
+        shard = manager.shards[manager.shard_for("AMD")]
+        shard_ws = shard._ws
+        added, removed = await manager.update(["AAPL", "MSFT", "TSLA", "NVDA", "META", "GOOG"])
+        assert added == ["META", "GOOG"] and removed == ["AMD"]
+        assert all(len(symbols) <= 2 for symbols in manager.assignments())
+        assert len(connector.sockets) == 3
+        assert _keys(shard_ws.sent, "2") == ["AMD"]
+        assert {"META", "GOOG"} & set(_keys(shard_ws.sent))
+
+        # 샤드가 재연결되면 자신이 보유한 구독만 다시 등록한다.
+        shard_ws.closed.set()
+        await asyncio.sleep(0.01)
+        assert shard.connects == 2
+        assert _keys(shard._ws.sent) == manager.assignments()[manager.shards.index(shard)]
+
+        await manager.stop()
+        for ws in connector.sockets:
+            ws.closed.set()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
+
+
+def test_manager_opens_new_shard_when_full():
+    async def scenario():
+        connector = FakeConnector()
+        manager = KISSubscriptionManager(
+            "key", ["AAPL"], on_message=lambda event: None, tr_id="T", max_per_connection=1,
+            max_connections=2, url="wss://test", connect=connector,
+        )
+        await manager.add(["MSFT"])
+        assert manager.assignments() == [["AAPL"], ["MSFT"]]
+        try:
+            await manager.add(["TSLA"])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected connection limit error")
+
+    asyncio.run(scenario())
+
+
+def test_backoff_jitter_stays_within_bounds():
+    client = KISWebSocketClient("key", [], on_message=lambda event: None, url="wss://test", jitter=0.5)
+    delays = [client._backoff_delay(8.0) for _ in range(200)]
+    assert all(4.0 <= delay <= 8.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_client_waits_before_reconnecting_after_clean_close():
+    async def scenario():
+        connector = FakeConnector()
+
+        async def on_message(event):
+            pass
+
+        client = KISWebSocketClient(
+            "key", [], on_message=on_message, url="wss://test", connect=connector, min_backoff=0.1, jitter=0.0
+        )
+        task = asyncio.create_task(client.run())
+        await asyncio.sleep(0.01)
+        connector.sockets[0].closed.set()
+        await asyncio.sleep(0.05)
+        assert client.connects == 1
+        await asyncio.sleep(0.1)
+        assert client.connects == 2
+        await client.stop()
+        connector.sockets[-1].closed.set()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
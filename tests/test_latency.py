@@ -0,0 +1,56 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from backend.core.latency import TOTAL, LatencyHistogram, LatencyTracer
+from backend.main import app
+from backend.services.ingest.publishers.codec import decode_message, encode_binary
+
+
+def test_histogram_percentiles_within_relative_error():
+    rng = random.Random(3)
+    values = sorted(rng.randint(1_000, 5_000_000) for _ in range(20_000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    for q in (50, 99, 99.9):
+        exact = values[int(round(q / 100 * len(values))) - 1]
+        assert exact <= histogram.percentile(q) <= exact * 1.016
+    assert histogram.min == values[0] and histogram.max == values[-1]
+
+
+def test_tracer_records_stage_deltas_and_total():
+    tracer = LatencyTracer()
+    trace = tracer.start()
+    for stage in ("features", "publish", "strategy_recv", "score", "risk", "order"):
+        tracer.mark(trace, stage)
+    tracer.complete(trace)
+    snapshot = tracer.snapshot()
+    assert set(snapshot) == {"features", "publish", "strategy_recv", "score", "risk", "order", TOTAL}
+    assert all(summary["count"] == 1 for summary in snapshot.values())
+    assert list(trace) == ["feed_recv", "features", "publish", "strategy_recv", "score", "risk", "order"]
+
+    disabled = LatencyTracer(enabled=False)
+    assert disabled.start() is None
+    disabled.mark(None, "features")
+    assert disabled.snapshot() == {}
+
+
+def test_trace_survives_binary_codec_and_api_reports_it():
+    payload = {
+        "type": "trade",
+        "symbol": "AAPL",
+        "price": 1.0,
+        "volume": 2.0,
+        "ts": 3.0,
+        "features": {},
+        "bars": [],
+        "trace": {"feed_recv": 10, "features": 20, "publish": 35},
+    }
+    assert decode_message(encode_binary(payload)) == payload
+    untraced = {key: value for key, value in payload.items() if key != "trace"}
+    assert "trace" not in decode_message(encode_binary(untraced))
+
+    response = TestClient(app).get("/api/latency")
+    assert response.status_code == 200
+    assert "stages" in response.json()
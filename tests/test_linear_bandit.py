@@ -0,0 +1,67 @@
+import numpy as np
+
+from backend.services.aiopt.policy_bandit import PolicyController
+from backend.services.exec.bandit import ContextualBandit
+from backend.services.exec.linear_bandit import CONTEXT_FEATURES, LinearBandit, build_context, time_of_day
+
+
+def test_build_context_order_and_time_of_day():
+    # 2024-03-04 10:15 America/New_York (EST) = 15:15 UTC.
+    ts = 1_709_565_300.0
+    assert abs(time_of_day(ts) - 45 / 390) < 1e-12
+    x = build_context({"ret_5s": 0.02, "vol_spike": float("nan"), "atr": 0.5, "atr_pct": 0.005}, ts)
+    assert len(x) == len(CONTEXT_FEATURES)
+    np.testing.assert_allclose(x, [1.0, 0.02, 0.0, 0.0, 45 / 390, 0.005])
+
+
+def test_sherman_morrison_matches_direct_ridge_solution():
+    bandit = LinearBandit([0.03, 0.05], [1.0], [10], ridge=2.0, seed=0)
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(40, bandit.n_features))
+    y = rng.normal(size=40)
+    arm = bandit.arms[1]
+    for x, r in zip(X, y):
+        bandit.update(arm, r, x)
+    A = 2.0 * np.eye(bandit.n_features) + X.T @ X
+    np.testing.assert_allclose(bandit.a_inv[1], np.linalg.inv(A), atol=1e-10)
+    np.testing.assert_allclose(bandit.theta[1], np.linalg.solve(A, X.T @ y), atol=1e-10)
+    np.testing.assert_array_equal(bandit.theta[0], 0.0)
+    assert bandit.counts.tolist() == [0, 40]
+
+
+def test_policy_learns_context_dependent_arm_with_real_probabilities():
+    bandit = LinearBandit([0.03, 0.08], [1.0], [10], v=0.3, epsilon=0.05, seed=3)
+    rng = np.random.default_rng(4)
+    for _ in range(400):
+        x = build_context({"vol_spike": rng.uniform(0, 6)}, None)
+        decision = bandit.select(x)
+        # 거래량 급증이 크면 넓은 TP(arm 1)가, 작으면 좁은 TP(arm 0)가 낫다.
+        best = 1 if x[3] > 3 else 0
+        bandit.update(decision.arm, (1.0 if decision.index == best else -1.0) + rng.normal(scale=0.1), x)
+
+    low, high = build_context({"vol_spike": 0.5}), build_context({"vol_spike": 5.5})
+    p_low, p_high = bandit.probabilities(low), bandit.probabilities(high)
+    assert abs(p_low.sum() - 1) < 1e-9 and abs(p_high.sum() - 1) < 1e-9
+    assert p_low[0] > 0.9 and p_high[1] > 0.9
+    assert p_low.min() >= 0.05 / 2
+
+    decisions = bandit.select_many(np.stack([low, high]))
+    assert [d.index for d in decisions] in ([0, 1], [0, 0], [1, 1], [1, 0])
+    assert all(d.probability == d.probabilities[d.index] for d in decisions)
+
+    ucb = LinearBandit([0.03, 0.08], [1.0], [10], method="ucb", seed=0)
+    ucb.update(ucb.arms[0], 1.0, low)
+    assert ucb.probabilities(low).tolist() == [1.0, 0.0]
+
+
+def test_policy_controller_reports_selection_probability():
+    linear = PolicyController(LinearBandit([0.03, 0.05, 0.08], [1.0], [10], seed=0))
+    decision = linear.choose({"ret_5s": 0.03, "vol_spike": 4.0}, ts=1_709_565_300.0)
+    assert 0.0 < decision.probability < 1.0 and decision.context is not None
+    linear.update(decision, 1.0)
+
+    beta = ContextualBandit([0.03, 0.05], [1.0], [10], epsilon=0.1, seed=0)
+    beta.arms[0].successes, beta.arms[0].trials = 50.0, 51.0
+    decision = PolicyController(beta).choose()
+    assert 0.0 < decision.probability <= 0.95 + 1e-9
+    assert abs(beta.probabilities().sum() - 1) < 1e-9
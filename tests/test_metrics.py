@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend.core.metrics import LOOP_LAG, MetricsRegistry, ensure_loop_lag_monitor
+from backend.main import app
+from backend.services.exec.risk import RiskManager
+
+
+def test_sharded_counter_and_histogram_render_as_prometheus_text():
+    registry = MetricsRegistry()
+    ticks = registry.counter("ticks_total", "Ticks.", ("source",)).labels("ws")
+    latency = registry.histogram("call_seconds", "Calls.", buckets=(0.1, 1.0))
+    depth = registry.gauge("depth", "Depth.")
+    items = [1, 2, 3]
+    depth.set_function(lambda: len(items))
+
+    def worker():
+        for _ in range(1_000):
+            ticks.inc()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    assert ticks.value == 4_000
+    text = registry.render()
+    assert 'ticks_total{source="ws"} 4000' in text
+    assert 'call_seconds_bucket{le="0.1"} 1' in text
+    assert 'call_seconds_bucket{le="1"} 2' in text
+    assert 'call_seconds_bucket{le="+Inf"} 3' in text
+    assert "call_seconds_count 3" in text and "call_seconds_sum 5.55" in text
+    assert "# TYPE depth gauge\ndepth 3" in text
+    assert registry.counter("ticks_total", "Ticks.", ("source",)) is registry.counter("ticks_total", "", ("source",))
+
+
+def test_metrics_endpoint_reports_loop_lag_and_risk_gauges():
+    async def scenario():
+        risk = RiskManager(max_drawdown=100.0, max_positions=3)
+        await risk.register_position_change(2)
+        ensure_loop_lag_monitor("test", interval=0.001)
+        await asyncio.sleep(0.02)
+
+    asyncio.run(scenario())
+    assert LOOP_LAG.labels("test").snapshot()[2] > 0
+    response = TestClient(app).get("/api/metrics")
+    assert response.status_code == 200
+    assert "risk_open_positions 2" in response.text
+    assert 'event_loop_lag_seconds_count{loop="test"}' in response.text
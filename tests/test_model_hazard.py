@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from backend.services.aiopt.model_hazard import train_hazard_model
+from backend.services.aiopt.model_hazard_table import HazardTable
+
+
+def _fit():
+    rng = np.random.default_rng(8)
+    n = 400
+    X = pd.DataFrame({"vol_spike": rng.gamma(2.0, 1.5, n), "ret_5s": rng.normal(0.0, 0.02, n)})
+    rate = 0.05 * np.exp(0.3 * X["vol_spike"] + 10 * X["ret_5s"])
+    durations = np.ceil(rng.exponential(1 / rate)).clip(1, 120)
+    df = X.assign(duration=durations, event=(rng.random(n) < 0.8).astype(int))
+    return train_hazard_model(df, "duration", "event"), X
+
+
+def test_table_matches_lifelines_on_grid_and_between(tmp_path):
+    model, X = _fit()
+    cph = model._cph
+    table = model.export_table(step=1.0)
+    features = X[list(table.columns)].to_numpy()
+
+    np.testing.assert_allclose(table.partial_hazard(features), model.predict_partial_hazard(X), rtol=1e-12)
+    times = [0.0, 3.0, 10.0, 25.0, 60.0, 200.0]
+    expected = cph.predict_survival_function(X, times=times).to_numpy()
+    np.testing.assert_allclose(table.survival_curves(times, features), expected, rtol=1e-10, atol=1e-12)
+
+    # 격자 사이 값은 선형 보간 근사이므로 fine grid에서 근접해야 한다.
+    fine = model.export_table(step=0.25)
+    between = [2.6, 17.3, 44.9]
+    np.testing.assert_allclose(
+        fine.survival_curves(between, features),
+        cph.predict_survival_function(X, times=between).to_numpy(),
+        atol=5e-3,
+    )
+
+    elapsed = np.full(len(X), 10.0)
+    conditional = table.conditional_exit(elapsed, features, 5.0)
+    survival = cph.predict_survival_function(X, times=[10.0, 15.0]).to_numpy()
+    np.testing.assert_allclose(conditional, 1 - survival[1] / survival[0], rtol=1e-9)
+
+    path = tmp_path / "hazard.npz"
+    table.save(path)
+    loaded = HazardTable.load(path)
+    assert loaded.columns == table.columns
+    np.testing.assert_array_equal(loaded.survival(elapsed, features), table.survival(elapsed, features))
+
+
+def test_table_module_needs_neither_pandas_nor_lifelines():
+    code = (
+        "import sys\n"
+        "import backend.services.aiopt.model_hazard_table\n"
+        "assert not any(name.split('.')[0] in ('pandas', 'lifelines') for name in sys.modules)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,120 @@
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.aiopt import registry as registry_module
+from backend.services.aiopt.model_hazard_table import HazardTable
+from backend.services.aiopt.model_signal_compiled import CompiledSignalModel
+from backend.services.aiopt.registry import LiveModels, ModelRegistry, RegistryError
+from backend.services.exec.bandit import ContextualBandit
+from backend.services.exec.loop import StrategyLoop
+from backend.services.exec.risk import RiskManager
+from backend.services.exec.router import OrderRouter
+from backend.services.signal.surge import SurgeDetector
+
+FEATURES = ["ret_5s", "ret_15s", "vol_spike"]
+ENTRY_FEATURES = {"ret_5s": 0.05, "ret_15s": 0.02, "vol_spike": 4.0}
+
+
+def _signal_model(bias):
+    return CompiledSignalModel(weights=np.array([[1.0, 2.0, 0.1]]), intercept=np.array([bias]), classes=np.array([0, 1]))
+
+
+def test_publish_load_mmap_roundtrip_and_checksum(tmp_path):
+    reg = ModelRegistry(tmp_path)
+    v1 = reg.publish("surge", _signal_model(0.0), {"features": FEATURES})
+    table = HazardTable(("a", "b"), np.array([0.5, -0.2]), np.array([1.0, 2.0]), 1.0, np.linspace(0.0, 2.0, 11))
+    h1 = reg.publish("exit", table)
+    assert (v1, h1, reg.publish("surge", _signal_model(1.0))) == ("v0001", "v0001", "v0002")
+    assert reg.versions("surge") == ["v0001", "v0002"]
+
+    loaded = reg.load("surge", "v0001")
+    assert isinstance(loaded.model.weights, np.memmap) or isinstance(loaded.model.weights.base, np.memmap)
+    assert loaded.metadata["features"] == FEATURES
+    row = [0.1, 0.2, 3.0]
+    assert loaded.model.predict_one(row) == _signal_model(0.0).predict_one(row)
+
+    hazard = reg.load("exit", "v0001").model
+    x = np.array([[1.5, 1.0]])
+    np.testing.assert_array_equal(hazard.survival(3.3, x), table.survival(3.3, x))
+
+    with pytest.raises(RegistryError):
+        reg.load("surge")  # 아직 활성 버전이 없다.
+    with open(tmp_path / "surge" / "v0002" / "intercept.npy", "r+b") as fp:
+        fp.seek(-1, 2)
+        fp.write(b"\x01")
+    with pytest.raises(RegistryError):
+        reg.load("surge", "v0002")
+
+
+def test_hot_swap_and_rollback_are_recorded_on_signals(tmp_path):
+    reg = ModelRegistry(tmp_path)
+    reg.publish("surge", _signal_model(-10.0), {"features": FEATURES})
+    reg.publish("surge", _signal_model(10.0), {"features": FEATURES})
+    reg.activate("surge", "v0001")
+    live = LiveModels(reg)
+    slot = live.slot("surge")
+    assert slot.version == "v0001"
+
+    class Broker:
+        async def place_order(self, symbol, side, qty, meta=None, **kwargs):
+            return {"order_id": symbol}
+
+    async def scenario():
+        queue = asyncio.Queue()
+
+        async def stream():
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+
+        loop = StrategyLoop(
+            stream(),
+            OrderRouter(Broker(), RiskManager(max_drawdown=1_000.0, max_positions=10)),
+            ContextualBandit([0.05], [1.0], [10]),
+            SurgeDetector(),
+            model=slot,
+            model_threshold=0.5,
+        )
+        task = asyncio.create_task(loop.run())
+        await queue.put({"type": "trade", "symbol": "AAPL", "features": ENTRY_FEATURES})
+        await asyncio.sleep(0)
+        await live.deploy("surge", "v0002")
+        await queue.put({"type": "trade", "symbol": "MSFT", "features": ENTRY_FEATURES})
+        await asyncio.sleep(0)
+        await queue.put(None)
+        await asyncio.wait_for(task, 1)
+        return loop
+
+    loop = asyncio.run(scenario())
+    log = loop.signal_log
+    assert [(r["symbol"], r["model_version"]) for r in log] == [("AAPL", "v0001"), ("MSFT", "v0002")]
+    assert log[0]["model_score"] < 0.5 < log[1]["model_score"]
+    # 임계값 미만인 AAPL은 진입하지 않았다.
+    assert loop.gate.allow("AAPL") and not loop.gate.allow("MSFT")
+
+    assert reg.active("surge") == "v0002"
+    assert asyncio.run(live.rollback("surge")).version == "v0001"
+    assert slot.version == "v0001" and reg.active("surge") == "v0001"
+
+
+def test_admin_routes_activate_and_rollback(tmp_path, monkeypatch):
+    reg = ModelRegistry(tmp_path)
+    reg.publish("surge", _signal_model(0.0))
+    reg.publish("surge", _signal_model(1.0))
+    monkeypatch.setattr(registry_module, "_live_models", LiveModels(reg))
+    client = TestClient(app)
+
+    assert client.post("/api/admin/models/activate", json={"name": "surge", "version": "v0001"}).status_code == 200
+    response = client.post("/api/admin/models/activate", json={"name": "surge", "version": "v0002"})
+    assert response.json() == {"name": "surge", "version": "v0002"}
+    status = client.get("/api/admin/models").json()
+    assert status["surge"] == {"active": "v0002", "loaded": "v0002", "versions": ["v0001", "v0002"]}
+
+    assert client.post("/api/admin/models/rollback", json={"name": "surge"}).json()["version"] == "v0001"
+    assert client.post("/api/admin/models/activate", json={"name": "surge", "version": "v0009"}).status_code == 404
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from backend.services.aiopt.model_signal import train_signal_model
+from backend.services.aiopt.model_signal_compiled import CompiledSignalModel
+
+
+def _data(n_classes, seed=5):
+    rng = np.random.default_rng(seed)
+    X = rng.normal([0.01, 2.0, 300.0, -1.0], [0.02, 1.5, 80.0, 0.5], size=(2_000, 4))
+    logits = X[:, 0] * 40 + X[:, 1] - X[:, 2] / 100
+    y = np.digitize(logits + rng.normal(0, 0.5, len(X)), np.quantile(logits, np.linspace(0, 1, n_classes + 1)[1:-1]))
+    return X, y
+
+
+def test_compiled_model_matches_sklearn(tmp_path):
+    for n_classes in (2, 3):
+        X, y = _data(n_classes)
+        model = train_signal_model(X, y)
+        compiled = model.compile()
+        expected = model.predict_proba(X)
+        np.testing.assert_allclose(compiled.predict_proba(X), expected, rtol=1e-9, atol=1e-12)
+        singles = [compiled.predict_one(row) for row in X[:200].tolist()]
+        np.testing.assert_allclose(singles, expected[:200, -1], rtol=1e-9, atol=1e-12)
+
+        path = tmp_path / f"signal-{n_classes}.npz"
+        compiled.save(path)
+        loaded = CompiledSignalModel.load(path)
+        np.testing.assert_array_equal(loaded.predict_proba(X), compiled.predict_proba(X))
+
+
+def test_compiled_module_does_not_import_sklearn():
+    code = (
+        "import sys\n"
+        "import backend.services.aiopt.model_signal_compiled\n"
+        "assert not any(name.startswith('sklearn') for name in sys.modules)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+from backend.adapters.tick_replay import TickFile
+from backend.services.ingest.processors.recorder import TickJournalRecorder, compact, read_segment
+
+
+def test_journal_rolls_hourly_indexes_and_compacts_per_symbol(tmp_path):
+    journal = tmp_path / "journal"
+    events = [
+        {"type": "trade", "symbol": sym, "price": 10.0 + i, "volume": 1.0, "ts": 3_590.0 + i * 5}
+        for i, sym in enumerate(["MSFT", "AAPL", "MSFT", "AAPL", "TSLA"])
+    ]
+
+    async def scenario():
+        recorder = TickJournalRecorder(journal, block_rows=2)
+        for event in events:
+            await recorder(event)
+        await recorder.aclose()
+        assert recorder.error is None
+
+    asyncio.run(scenario())
+
+    segments = sorted(journal.glob("seg-*.col"))
+    assert [p.name for p in segments] == ["seg-0000000000-000.col", "seg-0000003600-000.col"]
+    assert len(read_segment(segments[0])) == 2 and len(read_segment(segments[1])) == 3
+    index = json.loads(segments[1].with_suffix(".idx.json").read_text())
+    assert (index["rows"], index["t_min"], index["t_max"]) == (3, 3_600.0, 3_610.0)
+
+    out = tmp_path / "day.ticks"
+    assert compact(journal, out) == 5
+    tick_file = TickFile(out)
+    assert tick_file.sorted_by_symbol
+    ordered = [(tick_file.symbols[s], t) for s, t in zip(tick_file.records["symbol"], tick_file.records["ts"])]
+    assert ordered == [("MSFT", 3_590.0), ("MSFT", 3_600.0), ("AAPL", 3_595.0), ("AAPL", 3_605.0), ("TSLA", 3_610.0)]
+    (aapl,) = list(tick_file.iter_batches(symbols=["AAPL"]))
+    assert aapl["price"].tolist() == [11.0, 13.0]
+
+    # 심볼 구간을 나눠 스트리밍해도 결과는 같다.
+    streamed = tmp_path / "streamed.ticks"
+    assert compact(journal, streamed, max_rows=1) == 5
+    assert streamed.read_bytes() == out.read_bytes()
+    assert compact(journal, tmp_path / "subset.ticks", start=3_595.0, symbols=["AAPL", "TSLA"], max_rows=2) == 3
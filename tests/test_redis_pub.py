@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+from backend.services.ingest.publishers.redis_pub import BatchConfig, RedisPublisher
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._messages = []
+
+    def publish(self, channel, message):
+        self._messages.append((channel, message))
+        return self
+
+    async def execute(self):
+        self._redis.executions.append(list(self._messages))
+        return [1] * len(self._messages)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.executions = []
+        self.closed = False
+
+    async def publish(self, channel, message):
+        self.executions.append([(channel, message)])
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_batched_publisher_flushes_by_size_and_deadline():
+    async def scenario():
+        redis = FakeRedis()
+        publisher = RedisPublisher("redis://test", "ticks", batch=BatchConfig(max_batch=4, max_delay=0.01), client=redis)
+        for i in range(6):
+            await publisher.publish({"symbol": "AAPL", "seq": i})
+        await asyncio.sleep(0)
+        assert [len(batch) for batch in redis.executions] == [4]
+        await asyncio.sleep(0.05)
+        assert [len(batch) for batch in redis.executions] == [4, 2]
+        seqs = [json.loads(msg)["seq"] for batch in redis.executions for _, msg in batch]
+        assert seqs == list(range(6))
+        assert publisher.stats.batches == 2 and publisher.queue_stats.depth == 0
+        await publisher.stop()
+        assert redis.closed
+
+    asyncio.run(scenario())
+
+
+def test_overflow_policies_drop_oldest_and_coalesce():
+    async def scenario():
+        redis = FakeRedis()
+        config = BatchConfig(max_batch=2, max_delay=10.0, max_queue=2, overflow="drop_oldest")
+        publisher = RedisPublisher("redis://test", "ticks", batch=config, client=redis)
+        await publisher.start()
+        publisher._flusher.cancel()
+        publisher._flusher = None
+        for i in range(3):
+            await publisher._enqueue({"symbol": "AAPL", "seq": i})
+        assert [payload["seq"] for payload in publisher._queue.peek_items()] == [1, 2]
+        assert publisher.queue_stats.dropped == 1
+
+        config = BatchConfig(max_batch=2, max_delay=10.0, max_queue=2, overflow="coalesce")
+        publisher = RedisPublisher("redis://test", "ticks", batch=config, client=redis)
+        for payload in ({"symbol": "AAPL", "seq": 0}, {"symbol": "MSFT", "seq": 1}, {"symbol": "AAPL", "seq": 2}):
+            await publisher._enqueue(payload)
+        assert publisher._queue.peek_items() == [{"symbol": "AAPL", "seq": 2}, {"symbol": "MSFT", "seq": 1}]
+        assert publisher.queue_stats.coalesced == 1
+
+    asyncio.run(scenario())
+
+
+class FlakyRedis(FakeRedis):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def pipeline(self, transaction=True):
+        pipe = FakePipeline(self)
+        if self.failures:
+            self.failures -= 1
+
+            async def fail():
+                raise ConnectionError("reset")
+
+            pipe.execute = fail
+        return pipe
+
+
+def test_failed_flush_is_retried_once_then_counted_as_dropped():
+    async def scenario():
+        config = BatchConfig(max_batch=2, max_delay=0.001, max_queue=10)
+        redis = FlakyRedis(failures=1)
+        publisher = RedisPublisher("redis://test", "ticks", batch=config, client=redis)
+        for i in range(2):
+            await publisher._enqueue({"symbol": "AAPL", "seq": i})
+        await publisher.flush()
+        assert [len(batch) for batch in redis.executions] == [2]
+        assert (publisher.stats.errors, publisher.stats.dropped) == (1, 0)
+
+        redis.failures = 2
+        await publisher._enqueue({"symbol": "AAPL", "seq": 2})
+        await publisher.flush()
+        assert len(redis.executions) == 1
+        assert (publisher.stats.errors, publisher.stats.dropped) == (3, 1)
+
+    asyncio.run(scenario())
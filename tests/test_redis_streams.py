@@ -0,0 +1,115 @@
+import asyncio
+
+from backend.services.ingest.publishers.redis_streams import (
+    RedisStreamConsumer,
+    RedisStreamPublisher,
+    partition_for,
+)
+
+
+class FakeStreamRedis:
+    """XADD/XREADGROUP/XACK 의미론만 흉내 내는 인메모리 가짜 Redis."""
+
+    def __init__(self):
+        self.streams = {}
+        self.groups = {}
+        self.seq = 0
+
+    async def xadd(self, name, fields, id="*", maxlen=None, approximate=True):
+        self.seq += 1
+        entry_id = f"{self.seq}-0"
+        self.streams.setdefault(name, []).append((entry_id, dict(fields)))
+        return entry_id
+
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if (name, groupname) in self.groups:
+            raise RuntimeError("BUSYGROUP Consumer Group name already exists")
+        self.streams.setdefault(name, [])
+        last = self.seq if id == "$" else int(id.split("-")[0])
+        self.groups[(name, groupname)] = {"last": last, "pel": {}}
+
+    async def xgroup_setid(self, name, groupname, id):
+        self.groups[(name, groupname)]["last"] = int(id.split("-")[0])
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None, noack=False):
+        response = []
+        for name, cursor in streams.items():
+            group = self.groups[(name, groupname)]
+            pel = group["pel"].setdefault(consumername, [])
+            if cursor == ">":
+                entries = [e for e in self.streams[name] if int(e[0].split("-")[0]) > group["last"]][:count]
+                if entries:
+                    group["last"] = int(entries[-1][0].split("-")[0])
+                pel.extend(entry_id for entry_id, _ in entries)
+            else:
+                by_id = dict(self.streams[name])
+                entries = [(entry_id, by_id[entry_id]) for entry_id in pel[:count]]
+            response.append([name, entries])
+        return response
+
+    async def xack(self, name, groupname, *ids):
+        acked = 0
+        for pel in self.groups[(name, groupname)]["pel"].values():
+            for entry_id in ids:
+                if entry_id in pel:
+                    pel.remove(entry_id)
+                    acked += 1
+        return acked
+
+    async def close(self):
+        return None
+
+
+def test_stream_consumer_reads_partitions_and_replays_unacked_after_restart():
+    async def scenario():
+        redis = FakeStreamRedis()
+        publisher = RedisStreamPublisher("redis://test", "ticks", partitions=4, codec="binary", client=redis)
+        for i in range(6):
+            await publisher.publish({"type": "trade", "symbol": "AAPL", "price": 1.0 + i, "volume": 1.0, "ts": float(i)})
+        assert publisher.key_for("AAPL") == f"ticks:{partition_for('AAPL', 4)}"
+
+        workers = [
+            RedisStreamConsumer(
+                "redis://test", "ticks", "strategy", f"w{i}", partitions=4, worker_index=i, workers=2, batch_size=4,
+                start_id="0", client=redis,
+            )
+            for i in range(2)
+        ]
+        owner = next(w for w in workers if publisher.key_for("AAPL") in w.streams)
+        await owner.start()
+        first = await owner.read_batch()
+        assert [event["price"] for _, _, event in first] == [1.0, 2.0, 3.0, 4.0]
+
+        # 재시작: 확인하지 않은 배치가 PEL에서 다시 전달된 뒤 새 항목이 이어진다.
+        restarted = RedisStreamConsumer(
+            "redis://test", "ticks", "strategy", owner._consumer, partitions=4,
+            worker_index=workers.index(owner), workers=2, batch_size=4, block_ms=0, client=redis,
+        )
+        seen = []
+        async for event in restarted:
+            seen.append(event["price"])
+            if len(seen) == 6:
+                break
+        assert seen == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        await restarted.ack_pending()
+        assert all(not pel for group in redis.groups.values() for pel in group["pel"].values())
+
+    asyncio.run(scenario())
+
+
+def test_new_group_starts_at_tail_unless_replay_is_requested():
+    async def scenario():
+        redis = FakeStreamRedis()
+        publisher = RedisStreamPublisher("redis://test", "ticks", partitions=1, client=redis)
+        await publisher.publish({"type": "trade", "symbol": "AAPL", "price": 1.0, "volume": 1.0, "ts": 0.0})
+        live = RedisStreamConsumer("redis://test", "ticks", "live", "w0", partitions=1, block_ms=0, client=redis)
+        await live.start()
+        assert await live.read_batch() == []
+        await publisher.publish({"type": "trade", "symbol": "AAPL", "price": 2.0, "volume": 1.0, "ts": 1.0})
+        assert [event["price"] for _, _, event in await live.read_batch()] == [2.0]
+
+        replay = RedisStreamConsumer("redis://test", "ticks", "replay", "w0", partitions=1, start_id="0", client=redis)
+        await replay.start()
+        assert [event["price"] for _, _, event in await replay.read_batch()] == [1.0, 2.0]
+
+    asyncio.run(scenario())
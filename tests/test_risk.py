@@ -11,3 +11,125 @@ def test_risk_drawdown_blocks():
         assert not await risk.can_open_new()
 
     asyncio.run(scenario())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_pre_trade_limits_reserve_and_release_exposure():
+    from backend.services.exec import risk as risk_module
+    from backend.services.exec.risk import RiskLimits
+
+    limits = RiskLimits(max_order_qty=100, max_order_notional=5_000, max_symbol_notional=6_000, max_gross_notional=9_000)
+    risk = RiskManager(max_drawdown=100, max_positions=5, limits=limits)
+    assert risk.try_open("AAPL", 200, 10.0) == risk_module.ORDER_QTY
+    assert risk.try_open("AAPL", 30, 200.0) == risk_module.ORDER_NOTIONAL
+    assert risk.try_open("AAPL", 20, 200.0) is None
+    assert risk.check("AAPL", 20, 200.0) == risk_module.SYMBOL_NOTIONAL
+    assert risk.try_open("MSFT", 20, 200.0) is None
+    assert risk.try_open("TSLA", 10, 200.0) == risk_module.GROSS_NOTIONAL_LIMIT
+    # 가격을 모르면 명목 한도는 건너뛴다.
+    assert risk.check("TSLA", 10) is None
+
+    snap = risk.current
+    assert (snap.positions, snap.gross_notional, dict(risk.symbol_notional)) == (2, 8_000.0, {"AAPL": 4_000.0, "MSFT": 4_000.0})
+    assert risk.release("AAPL") == 4_000.0
+    assert dict(risk.symbol_notional) == {"MSFT": 4_000.0}
+    assert (risk.current.positions, risk.current.gross_notional) == (1, 4_000.0)
+    # 이전 스냅샷은 바뀌지 않는다.
+    assert (snap.positions, snap.gross_notional) == (2, 8_000.0)
+
+    # 가격 없이 잡은 진입을 풀어도 다른 종목의 명목은 건드리지 않는다.
+    assert risk.try_open("TSLA", 10) is None
+    assert risk.release("TSLA") == 0.0
+    assert (risk.current.positions, risk.current.gross_notional, dict(risk.symbol_notional)) == (1, 4_000.0, {"MSFT": 4_000.0})
+
+
+def test_order_rate_bucket_and_buying_power():
+    from backend.services.exec import risk as risk_module
+    from backend.services.exec.risk import RiskLimits
+
+    clock = FakeClock()
+    risk = RiskManager(max_drawdown=100, max_positions=50, limits=RiskLimits(order_rate=0.5, order_burst=2), clock=clock)
+    assert risk.try_open("AAPL", 1) is None
+    assert risk.try_open("AAPL", 1) is None
+    assert risk.try_open("AAPL", 1) == risk_module.ORDER_RATE
+    assert risk.try_open("MSFT", 1) is None
+    clock.now += 2.0
+    assert risk.try_open("AAPL", 1) is None
+    assert risk.check("AAPL", 1) == risk_module.ORDER_RATE
+
+    risk = RiskManager(max_drawdown=100, max_positions=50)
+    risk.update_cash(1_000.0)
+    assert risk.try_open("AAPL", 6, 100.0) is None
+    assert risk.try_open("MSFT", 5, 100.0) == risk_module.BUYING_POWER
+    assert risk.try_open("TSLA", 2, 100.0) is None
+    # 체결된 AAPL만 새 현금 보고에 반영되고, 아직 체결 전인 TSLA 200은 계속 잡혀 있다.
+    assert risk.mark_filled("AAPL") == 600.0
+    risk.update_cash(400.0)
+    assert risk.current.reserved_cash == 200.0
+    assert risk.try_open("MSFT", 3, 100.0) == risk_module.BUYING_POWER
+    assert risk.release("TSLA") == 200.0 and risk.current.reserved_cash == 0.0
+    assert risk.try_open("MSFT", 4, 100.0) is None
+    # 이미 정산된 AAPL을 청산해도 다른 진입의 현금 예약은 건드리지 않는다.
+    assert risk.release("AAPL") == 600.0 and risk.current.reserved_cash == 400.0
+
+
+def test_router_releases_reservation_when_broker_fails():
+    from backend.services.exec.bandit import BanditArm
+    from backend.services.exec.router import OrderRouter
+
+    class FailingBroker:
+        async def place_order(self, *args, **kwargs):
+            raise RuntimeError("down")
+
+    async def scenario():
+        risk = RiskManager(max_drawdown=100, max_positions=3)
+        router = OrderRouter(FailingBroker(), risk)
+        try:
+            await router.submit_entry("AAPL", "BUY", 10, BanditArm(0.05, 1.0, 10), price=50.0)
+        except RuntimeError:
+            pass
+        snap = risk.current
+        assert (snap.positions, snap.gross_notional, dict(risk.symbol_notional)) == (0, 0.0, {})
+
+    asyncio.run(scenario())
+
+
+def test_router_settles_fills_and_releases_cancelled_entries():
+    from backend.services.exec.bandit import BanditArm
+    from backend.services.exec.router import OrderRouter
+
+    class AcceptingBroker:
+        def __init__(self):
+            self.cancelled = []
+
+        async def place_order(self, symbol, side, qty, meta=None, **kwargs):
+            return {"order_id": symbol, "status": "accepted"}
+
+        async def cancel(self, order_id):
+            self.cancelled.append(order_id)
+
+    async def scenario():
+        risk = RiskManager(max_drawdown=100, max_positions=3)
+        risk.update_cash(1_000.0)
+        broker = AcceptingBroker()
+        router = OrderRouter(broker, risk)
+        arm = BanditArm(0.05, 1.0, 10)
+        await router.submit_entry("AAPL", "BUY", 4, arm, price=100.0)
+        await router.submit_entry("MSFT", "BUY", 3, arm, price=100.0)
+        router.on_order_event({"symbol": "AAPL", "side": "BUY", "status": "filled"})
+        risk.update_cash(600.0)
+        assert risk.current.reserved_cash == 300.0
+
+        await router.submit_exit("MSFT", "MSFT")
+        snap = risk.current
+        assert broker.cancelled == ["MSFT"]
+        assert (snap.positions, snap.reserved_cash, dict(risk.symbol_notional)) == (1, 0.0, {"AAPL": 400.0})
+
+    asyncio.run(scenario())
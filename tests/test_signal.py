@@ -1,5 +1,6 @@
 import asyncio
 
+import numpy as np
 import pytest
 
 from backend.services.signal.surge import SurgeDetector
@@ -10,3 +11,28 @@ def test_surge_detector_entry():
     features = {"ret_5s": 0.05, "ret_15s": 0.02, "vol_spike": 4.0}
     signal = detector.score("AAPL", features)
     assert detector.is_entry(signal)
+
+
+def test_score_batch_matches_scalar_path_bit_for_bit():
+    rng = np.random.default_rng(11)
+    n = 5_000
+    ret_5s = rng.normal(0.0, 0.03, n)
+    ret_15s = rng.normal(0.0, 0.03, n)
+    vol_spike = rng.gamma(2.0, 2.0, n)
+    ret_5s[:6] = [np.nan, -0.0, 0.0, 1.0, 0.05, 0.0]
+    vol_spike[:6] = [4.0, np.nan, 3.0, 3.0, 6.0, 0.0]
+    symbols = [f"S{i}" for i in range(n)]
+    detector = SurgeDetector(entry_threshold=0.6, vol_spike_threshold=3.0)
+
+    batch = detector.score_batch(symbols, ret_5s, ret_15s, vol_spike)
+    expected_entries = []
+    for i in range(n):
+        features = {"ret_5s": ret_5s[i].item(), "ret_15s": ret_15s[i].item(), "vol_spike": vol_spike[i].item()}
+        features = {key: value for key, value in features.items() if value == value}
+        signal = detector.score(symbols[i], features)
+        assert batch.scores[i].item().hex() == signal.score.hex()
+        assert bool(batch.entries[i]) == detector.is_entry(signal)
+        if detector.is_entry(signal):
+            expected_entries.append(symbols[i])
+    assert [signal.symbol for signal in batch.signals] == expected_entries
+    assert expected_entries
@@ -0,0 +1,89 @@
+import asyncio
+import gc
+import weakref
+
+from backend.services.exec.bandit import ContextualBandit
+from backend.services.exec.dispatch import IN_FLIGHT, OrderDispatcher
+from backend.services.exec.loop import StrategyLoop
+from backend.services.exec.risk import RiskManager
+from backend.services.exec.router import OrderRouter
+from backend.services.signal.surge import SurgeDetector
+
+ENTRY_FEATURES = {"ret_5s": 0.05, "ret_15s": 0.02, "vol_spike": 4.0}
+
+
+class GatedBroker:
+    def __init__(self, fail_symbols=()):
+        self.release = asyncio.Event()
+        self.placed = []
+        self.fail_symbols = set(fail_symbols)
+
+    async def place_order(self, symbol, side, qty, meta=None, **kwargs):
+        self.placed.append(symbol)
+        await self.release.wait()
+        if symbol in self.fail_symbols:
+            raise RuntimeError("rejected")
+        return {"order_id": f"{symbol}-{len(self.placed)}"}
+
+
+async def _stream(events, consumed):
+    for event in events:
+        consumed.append(event["symbol"])
+        yield event
+
+
+def test_ticks_keep_flowing_while_orders_are_in_flight():
+    async def scenario():
+        broker = GatedBroker(fail_symbols={"TSLA"})
+        risk = RiskManager(max_drawdown=1_000.0, max_positions=10)
+        outcomes = []
+        symbols = ["AAPL", "MSFT", "TSLA", "NVDA"]
+        events = [{"type": "trade", "symbol": sym, "features": ENTRY_FEATURES} for _ in range(50) for sym in symbols]
+        consumed = []
+        loop = StrategyLoop(
+            _stream(events, consumed),
+            OrderRouter(broker, risk),
+            ContextualBandit([0.05], [1.0], [10]),
+            SurgeDetector(),
+            max_in_flight=3,
+            on_outcome=outcomes.append,
+        )
+        task = asyncio.create_task(loop.run())
+        await asyncio.sleep(0.01)
+        # 브로커 응답이 막혀 있어도 스트림은 끝까지 소비된다.
+        assert len(consumed) == len(events)
+        assert broker.placed == ["AAPL", "MSFT", "TSLA"]
+        assert loop.dispatcher.in_flight == 3 and not task.done()
+        assert IN_FLIGHT.labels().value == 3
+
+        broker.release.set()
+        await asyncio.wait_for(task, 1)
+        assert sorted(outcome.symbol for outcome in outcomes) == ["AAPL", "MSFT", "TSLA"]
+        failed = [outcome for outcome in outcomes if not outcome.ok]
+        assert [outcome.symbol for outcome in failed] == ["TSLA"]
+        assert isinstance(failed[0].error, RuntimeError)
+        assert (await risk.snapshot()).positions == 2
+
+    asyncio.run(scenario())
+
+
+def test_in_flight_gauge_sums_live_dispatchers_without_pinning_them():
+    async def scenario():
+        broker = GatedBroker()
+        router = OrderRouter(broker, RiskManager(max_drawdown=1_000.0, max_positions=10))
+        arm = ContextualBandit([0.05], [1.0], [10]).arms[0]
+        first, second = OrderDispatcher(router), OrderDispatcher(router)
+        first.submit("AAPL", "BUY", 1, arm)
+        second.submit("MSFT", "BUY", 1, arm)
+        await asyncio.sleep(0)
+        assert IN_FLIGHT.labels().value == 2
+        broker.release.set()
+        await first.drain()
+        await second.drain()
+        ref = weakref.ref(first)
+        del first
+        gc.collect()
+        assert ref() is None
+        assert IN_FLIGHT.labels().value == 0
+
+    asyncio.run(scenario())
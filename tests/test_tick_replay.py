@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+
+from backend.adapters.tick_replay import ReplayMarketDataFeed, TickFile, make_records, write_tick_file
+from backend.services.ingest.sources.ws import WebSocketIngestor
+
+
+def _write(path):
+    ts = 100.0 + np.arange(6) * 0.02
+    records = make_records(ts, [0, 1, 0, 2, 1, 0], [10.0, 20.0, 10.5, 30.0, 20.5, 11.0], [1, 2, 3, 4, 5, 6])
+    write_tick_file(path, ["AAPL", "MSFT", "TSLA"], records)
+
+
+def test_tick_file_batches_and_symbol_filter(tmp_path):
+    path = tmp_path / "day.ticks"
+    _write(path)
+    tick_file = TickFile(path)
+    assert len(tick_file) == 6 and tick_file.symbols == ["AAPL", "MSFT", "TSLA"]
+    assert [len(b) for b in tick_file.iter_batches(4)] == [4, 2]
+    filtered = np.concatenate(list(tick_file.iter_batches(4, symbols=["MSFT"])))
+    assert filtered["price"].tolist() == [20.0, 20.5]
+
+
+def test_replay_feed_emits_trade_events_with_pacing(tmp_path):
+    path = tmp_path / "day.ticks"
+    _write(path)
+    events = []
+
+    async def on_event(event):
+        events.append(event)
+
+    async def scenario():
+        feed = ReplayMarketDataFeed(path, on_event, speed=2.0, symbols=["AAPL", "TSLA"], batch_size=3)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await feed.run()
+        return loop.time() - start
+
+    elapsed = asyncio.run(scenario())
+    assert [e["symbol"] for e in events] == ["AAPL", "AAPL", "TSLA", "AAPL"]
+    assert events[0] == {"type": "trade", "symbol": "AAPL", "price": 10.0, "volume": 1.0, "ts": 100.0}
+    assert elapsed >= 0.1 / 2.0 * 0.9
+
+
+def test_ingestor_stops_after_finite_replay_feed(tmp_path):
+    path = tmp_path / "day.ticks"
+    _write(path)
+    events = []
+
+    async def on_event(event):
+        events.append(event)
+
+    async def factory(callback):
+        return ReplayMarketDataFeed(path, callback)
+
+    async def scenario():
+        await asyncio.wait_for(WebSocketIngestor(factory, [on_event]).start(), 1)
+
+    asyncio.run(scenario())
+    assert len(events) == 6
+
+
+def test_paced_replay_merges_symbol_sorted_file_by_time(tmp_path):
+    path = tmp_path / "compacted.ticks"
+    records = make_records([100.0, 100.02, 100.04, 100.01, 100.03], [0, 0, 0, 1, 1], [1, 2, 3, 4, 5], [1] * 5)
+    write_tick_file(path, ["AAPL", "MSFT"], records, sorted_by_symbol=True)
+    events = []
+
+    async def on_event(event):
+        events.append(event)
+
+    asyncio.run(ReplayMarketDataFeed(path, on_event, speed=10.0, batch_size=2).run())
+    assert [e["ts"] for e in events] == sorted(e["ts"] for e in events)
+    merged = np.concatenate(list(TickFile(path).iter_batches(2, ["MSFT", "AAPL"], chronological=True)))
+    assert merged["price"].tolist() == [1, 4, 2, 5, 3]
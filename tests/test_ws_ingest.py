@@ -0,0 +1,51 @@
+import asyncio
+
+from backend.services.ingest.sources.ws import ProcessorChannel, WebSocketIngestor
+
+
+class ListFeed:
+    def __init__(self, callback, events, ingestor):
+        self._callback = callback
+        self._events = events
+        self._ingestor = ingestor
+
+    async def run(self):
+        for event in self._events:
+            await self._callback(event)
+        await self._ingestor.stop()
+
+
+def test_slow_processor_does_not_block_feed_and_keeps_symbol_order():
+    async def scenario():
+        fast_seen, slow_seen = [], []
+        release = asyncio.Event()
+
+        async def fast(event):
+            fast_seen.append((event["symbol"], event["seq"]))
+
+        async def slow(event):
+            await release.wait()
+            slow_seen.append((event["symbol"], event["seq"]))
+
+        events = [{"symbol": sym, "seq": i} for i in range(50) for sym in ("AAPL", "MSFT")]
+        coalescing = ProcessorChannel(slow, maxsize=4, overflow="coalesce", name="slow")
+        holder = {}
+
+        async def factory(callback):
+            return ListFeed(callback, events, holder["ingestor"])
+
+        ingestor = WebSocketIngestor(factory, [fast, coalescing])
+        holder["ingestor"] = ingestor
+        task = asyncio.create_task(ingestor.start())
+        await asyncio.sleep(0.01)
+        stats = ingestor.stats()
+        assert stats["slow"]["coalesced"] > 0
+        release.set()
+        await task
+
+        assert fast_seen == [(e["symbol"], e["seq"]) for e in events]
+        for sym in ("AAPL", "MSFT"):
+            seqs = [seq for s, seq in slow_seen if s == sym]
+            assert seqs == sorted(seqs) and seqs[-1] == 49
+
+    asyncio.run(scenario())